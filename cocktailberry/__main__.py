@@ -21,6 +21,11 @@ def entry_point(
     typer.echo("  > uv run --extra api -m cocktailberry.api")
     typer.secho("- Run the User Interface:", fg=colors.BLUE)
     typer.echo("  > uv run --extra gui --extra nfc -m cocktailberry.gui")
+    typer.secho("- Rebuild the sales statistics from the payment log:", fg=colors.BLUE)
+    typer.echo("  > uv run --extra api -m cocktailberry.stats")
+    typer.secho("- Profile the import time of an entry point, or check all against their budgets:", fg=colors.BLUE)
+    typer.echo("  > uv run --extra api --extra gui -m cocktailberry.startup profile gui")
+    typer.echo("  > uv run --extra api --extra gui -m cocktailberry.startup check")
 
     if shutil.which("uv") is None:
         typer.secho("\n'uv' is not installed.", fg=colors.RED)
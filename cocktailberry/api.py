@@ -1,3 +1,4 @@
+import multiprocessing
 import sys
 from pathlib import Path
 
@@ -8,4 +9,9 @@ sys.path.insert(0, str(SRC))
 
 from src.backend.main import run_with_uvicorn
 
-run_with_uvicorn()
+# Guarded: with WORKERS > 1 every worker process re-imports this module (as __mp_main__).
+if __name__ == "__main__":
+    # In a frozen (PyInstaller) build the workers are started by running the executable
+    # again; this turns such a run into the worker instead of another server.
+    multiprocessing.freeze_support()
+    run_with_uvicorn()
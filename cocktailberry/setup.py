@@ -29,6 +29,7 @@ CONFIG_VARIABLES: dict[str, list[ConfigItem]] = {
         ConfigItem("DEFAULT_BALANCE", "Default balance for new users", default="10.0"),
         ConfigItem("NFC_TIMEOUT", "NFC operation timeout in seconds", default="10.0"),
         ConfigItem("CAN_CHANGE_SETTINGS", "Allow changing settings in the GUI", default="true"),
+        ConfigItem("OFFLINE_OUTBOX", "Keep top-ups made while the backend is down, send later", default="false"),
     ],
     "backend": [
         ConfigItem("API_KEY", "API key for backend service", default="CocktailBerry-Secret-Change-Me"),
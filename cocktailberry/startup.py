@@ -0,0 +1,51 @@
+import sys
+from pathlib import Path
+
+import typer
+from typer import colors
+
+ROOT = Path(__file__).resolve().parent.parent
+SRC = ROOT / "src"
+
+sys.path.insert(0, str(SRC))
+
+from src.shared.import_time import STARTUP_BUDGETS_MS, EntryPoint, median_import_ms, profile_imports
+
+APP = typer.Typer()
+
+
+@APP.command()
+def profile(
+    entry_point: EntryPoint = typer.Argument(EntryPoint.GUI, help="Entry point to import."),
+    min_ms: float = typer.Option(5.0, help="Hide imports cheaper than this (cumulative)."),
+    depth: int = typer.Option(4, min=1, help="Levels of the import tree to show."),
+) -> None:
+    """Show the import cost tree of an entry point, costliest imports first."""
+    root = profile_imports(entry_point)
+    typer.secho(f"{'cumulative':>12} {'self':>10}  module", bold=True)
+    for level, node in root.walk():
+        if level <= depth and node.cumulative_us / 1000 >= min_ms:
+            cumulative, own = node.cumulative_us / 1000, node.self_us / 1000
+            typer.echo(f"{cumulative:9.1f} ms {own:7.1f} ms  {'  ' * level}{node.module}")
+
+
+@APP.command()
+def check(
+    runs: int = typer.Option(3, min=1, help="Fresh imports per entry point; their median is compared."),
+) -> None:
+    """Fail if an entry point takes longer to import than its startup budget."""
+    over_budget = False
+    for entry_point, budget_ms in STARTUP_BUDGETS_MS.items():
+        took_ms = median_import_ms(entry_point, runs)
+        within = took_ms <= budget_ms
+        over_budget |= not within
+        typer.secho(
+            f"{'✅' if within else '❌'} {entry_point}: {took_ms:.0f} ms (budget {budget_ms:.0f} ms)",
+            fg=colors.GREEN if within else colors.RED,
+        )
+    if over_budget:
+        raise typer.Exit(1)
+
+
+if __name__ == "__main__":
+    APP()
@@ -0,0 +1,32 @@
+import sys
+from pathlib import Path
+
+import typer
+from sqlmodel import Session
+from typer import colors
+
+ROOT = Path(__file__).resolve().parent.parent
+SRC = ROOT / "src"
+
+sys.path.insert(0, str(SRC))
+
+from src.backend.db.database import engine, run_db_migrations
+from src.backend.service.stats_service import StatsService
+
+APP = typer.Typer()
+
+
+@APP.command()
+def rebuild() -> None:
+    """Recompute the sales rollups from the payment log."""
+    run_db_migrations()
+    with Session(engine) as session:
+        result = StatsService(session).rebuild()
+    typer.secho(
+        f"✅ Rebuilt {result.cocktail_hours} cocktail hours and {result.accounts} account totals.",
+        fg=colors.GREEN,
+    )
+
+
+if __name__ == "__main__":
+    APP()
@@ -0,0 +1,97 @@
+"""Benchmark response compression: bytes on the wire and the CPU it costs, per payload and encoding.
+
+Against a running backend (start the API first, it reads the same `.env`):
+
+    uv run --extra api -m cocktailberry.api
+    uv run --extra api --extra gui -m scripts.bench_compression --cards 500 --history 300
+
+Benchmark cards (`BENCH00000`, ...) are created, one of them topped up
+`--history` times, and deleted at the end. Then the full user list, that card's
+full history and a single top-up response are each fetched uncompressed and
+with every encoding this process can produce. The wire bytes are what the
+backend sent. The CPU time is that of compressing the body here with the
+middleware's codec, so run it on the Pi to get the Pi's cost.
+"""
+
+import asyncio
+import statistics
+import time
+
+import httpx
+import typer
+from typer import colors
+
+from src.backend.core.compression import CODECS, compress
+from src.frontend.core.config import config as cfg
+
+APP = typer.Typer()
+
+HISTORY_CARD = "BENCH00000"
+
+
+def _card(number: int) -> str:
+    return f"BENCH{number:05d}"
+
+
+async def _setup(client: httpx.AsyncClient, cards: int, history: int) -> None:
+    for number in range(cards):
+        await client.post("/users", json={"nfc_id": _card(number), "is_adult": True, "balance": 0})
+    for _ in range(history):
+        (await client.post(f"/users/{HISTORY_CARD}/balance/top-up", json={"amount": 1})).raise_for_status()
+
+
+async def _fetch(client: httpx.AsyncClient, method: str, path: str, encoding: str) -> tuple[int, bytes]:
+    """Send the request accepting only `encoding`; return the bytes received and the decoded body."""
+    payload = {"amount": 0.5} if method == "POST" else None
+    async with client.stream(method, path, headers={"Accept-Encoding": encoding}, json=payload) as resp:
+        resp.raise_for_status()
+        body = await resp.aread()
+        return resp.num_bytes_downloaded, body
+
+
+def _cpu_us(encoding: str, body: bytes, runs: int) -> float:
+    """Median CPU time to compress `body`, in µs."""
+    samples = []
+    for _ in range(runs):
+        started = time.process_time()
+        compress(encoding, body)
+        samples.append(time.process_time() - started)
+    return statistics.median(samples) * 1e6
+
+
+async def _run(cards: int, history: int, runs: int) -> None:
+    payloads = {
+        "user list": ("GET", "/users"),
+        "full history": ("GET", f"/users/{HISTORY_CARD}/history"),
+        "top-up": ("POST", f"/users/{HISTORY_CARD}/balance/top-up"),
+    }
+    async with httpx.AsyncClient(base_url=cfg.api_url, headers={"x-api-key": cfg.api_key}, timeout=30) as client:
+        try:
+            await _setup(client, cards, history)
+            for name, (method, path) in payloads.items():
+                raw, body = await _fetch(client, method, path, "identity")
+                typer.secho(f"{name}: {raw} bytes uncompressed", bold=True)
+                for encoding in CODECS:
+                    wire, _ = await _fetch(client, method, path, encoding)
+                    typer.echo(
+                        f"  {encoding:>5}: {wire:8d} bytes on the wire ({wire / raw:6.1%}), "
+                        f"{_cpu_us(encoding, body, runs):8.0f} µs CPU to compress"
+                    )
+        finally:
+            for number in range(cards):
+                await client.delete(f"/users/{_card(number)}")
+
+
+@APP.command()
+def run(
+    cards: int = typer.Option(500, min=1, help="Accounts created for the user list."),
+    history: int = typer.Option(300, min=0, help="Top-ups booked on one card for its history."),
+    runs: int = typer.Option(50, min=1, help="Compressions timed per payload and encoding."),
+) -> None:
+    """Report wire bytes and compression CPU per payload and encoding."""
+    typer.secho(f"Against {cfg.api_url}; encodings available here: {', '.join(CODECS)}", fg=colors.BLUE)
+    asyncio.run(_run(cards, history, runs))
+
+
+if __name__ == "__main__":
+    APP()
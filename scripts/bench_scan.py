@@ -0,0 +1,100 @@
+"""Benchmark the scan-to-balance path: tap → UID → account lookup → committed top-up.
+
+Cards are tapped on a simulated reader (`SimulatedBackend`) and go through the
+real `NFCScanner`; the lookup and the top-up go to a running backend through
+the GUI's `PaymentApi` (so start the API first, it reads the same `.env`):
+
+    uv run --extra api -m cocktailberry.api
+    uv run --extra gui -m scripts.bench_scan --taps 200 --apdu-ms 50
+
+The top-up returns once the backend has committed it. Per stage the latency
+percentiles are printed; the benchmark cards (`BENCH0000`, ...) are created
+first and deleted at the end.
+"""
+
+import asyncio
+import statistics
+import time
+
+import typer
+from typer import colors
+
+from src.frontend.core.config import config as cfg
+from src.frontend.core.nfc import NFCScanner
+from src.frontend.core.payment_api import PaymentApi, is_err
+from src.frontend.core.sim_reader import SimulatedBackend
+from src.frontend.core.transport import build_client
+
+APP = typer.Typer()
+
+STAGES = ("scan", "lookup", "top-up", "total")
+
+
+def _card(number: int) -> str:
+    return f"BENCH{number:04d}"
+
+
+def _percentiles(samples: list[float]) -> str:
+    ms = sorted(sample * 1000 for sample in samples)
+    p50, p95, p99 = (statistics.quantiles(ms, n=100, method="inclusive")[i - 1] for i in (50, 95, 99))
+    return f"p50 {p50:8.1f}  p95 {p95:8.1f}  p99 {p99:8.1f}  max {ms[-1]:8.1f}"
+
+
+async def _run(taps: int, cards: int, apdu_seconds: float, amount: float) -> dict[str, list[float]]:
+    api = PaymentApi(build_client(cfg))
+    backend = SimulatedBackend(apdu_seconds=apdu_seconds, hold_seconds=None)
+    scanner = NFCScanner(backend)
+    timings: dict[str, list[float]] = {stage: [] for stage in STAGES}
+    try:
+        for number in range(cards):
+            # An existing benchmark card (e.g. from an aborted run) is fine: creating it fails.
+            await api.create_nfc(_card(number), is_adult=True, balance=0.0)
+        for tap in range(taps):
+            nfc_id = _card(tap % cards)
+            # The card goes on the reader as the scan waits, like an operator tapping it.
+            started = time.perf_counter()
+            asyncio.get_running_loop().call_soon(backend.insert, nfc_id)
+            scan = await scanner.scan(timeout=5)
+            scanned = time.perf_counter()
+            if scan is None:
+                raise RuntimeError("The simulated card was not read")
+            account = await api.get_nfc(scan.nfc_id)
+            looked_up = time.perf_counter()
+            top_up = await api.update_balance(scan.nfc_id, amount)
+            committed = time.perf_counter()
+            for result in (account, top_up):
+                if is_err(result):
+                    raise RuntimeError(result.error)
+            for card in backend.cards:
+                backend.remove(card)
+            timings["scan"].append(scanned - started)
+            timings["lookup"].append(looked_up - scanned)
+            timings["top-up"].append(committed - looked_up)
+            timings["total"].append(committed - started)
+    finally:
+        scanner.close()
+        for number in range(cards):
+            await api.delete_nfc(_card(number))
+        await api.aclose()
+    return timings
+
+
+@APP.command()
+def run(
+    taps: int = typer.Option(100, min=2, help="Cards tapped, one after the other."),
+    cards: int = typer.Option(10, min=1, help="Distinct benchmark cards the taps cycle through."),
+    apdu_ms: float = typer.Option(50.0, min=0, help="Simulated UID read (APDU exchange) latency in ms."),
+    amount: float = typer.Option(1.0, help="Top-up amount per tap."),
+) -> None:
+    """Tap simulated cards and report the latency of each stage to the committed top-up."""
+    typer.secho(f"{taps} taps against {cfg.api_url}, {apdu_ms:.0f} ms APDU latency", fg=colors.BLUE)
+    start = time.perf_counter()
+    timings = asyncio.run(_run(taps, cards, apdu_ms / 1000, amount))
+    elapsed = time.perf_counter() - start
+    for stage in STAGES:
+        typer.echo(f"{stage:>7} ms: {_percentiles(timings[stage])}")
+    typer.secho(f"{taps / elapsed:.1f} taps/s (including setup and cleanup)", fg=colors.GREEN)
+
+
+if __name__ == "__main__":
+    APP()
@@ -2,25 +2,30 @@ from typing import Annotated
 
 from fastapi import APIRouter, Depends, status
 
+from src.backend.api.headers import IdempotencyKey
+from src.backend.core.admission import write_admission_dependency
 from src.backend.models.schemas import BalanceUpdateRequest, BookCocktailRequest
+from src.backend.models.types import NfcId
 from src.backend.models.user import User
-from src.backend.service.user_service import UserService, get_user_service
+from src.backend.service.write_actor import WriteActor, get_write_actor
 
 router = APIRouter(tags=["balance"])
 
 
-@router.post("/users/{nfc_id}/balance/top-up")
-def update_balance(
-    nfc_id: str,
+@router.post("/users/{nfc_id}/balance/top-up", dependencies=[Depends(write_admission_dependency)])
+async def update_balance(
+    nfc_id: NfcId,
     balance_request: BalanceUpdateRequest,
-    user_service: Annotated[UserService, Depends(get_user_service)],
+    writer: Annotated[WriteActor, Depends(get_write_actor)],
+    idempotency_key: IdempotencyKey = None,
 ) -> User:
     """Top up user balance (add or subtract). nfc_id is provided in the URL path."""
-    return user_service.update_balance(nfc_id, balance_request.amount)
+    return await writer.submit(lambda service: service.update_balance(nfc_id, balance_request.amount, idempotency_key))
 
 
 @router.post(
     "/users/{nfc_id}/cocktails/book",
+    dependencies=[Depends(write_admission_dependency)],
     responses={
         status.HTTP_404_NOT_FOUND: {
             "description": "User not found",
@@ -40,14 +45,16 @@ def update_balance(
         },
     },
 )
-def book_cocktail(
-    nfc_id: str,
+async def book_cocktail(
+    nfc_id: NfcId,
     booking: BookCocktailRequest,
-    user_service: Annotated[UserService, Depends(get_user_service)],
+    writer: Annotated[WriteActor, Depends(get_write_actor)],
 ) -> User:
     """Book a cocktail (subtract amount from balance with age verification).
 
     Deducts the specified amount from the user's balance for a cocktail purchase.
     Performs age verification if the cocktail is alcoholic.
     """
-    return user_service.book_cocktail(nfc_id, booking.price, booking.is_alcoholic, booking.name)
+    return await writer.submit(
+        lambda service: service.book_cocktail(nfc_id, booking.price, booking.is_alcoholic, booking.name)
+    )
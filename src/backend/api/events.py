@@ -0,0 +1,41 @@
+import asyncio
+from collections.abc import AsyncGenerator
+
+from fastapi import APIRouter, Request
+from fastapi.responses import StreamingResponse
+
+from src.backend.service.change_feed import change_feed
+
+router = APIRouter(tags=["events"])
+
+# Idle streams get a comment line this often, so proxies keep the connection open
+# and the server notices disconnected clients.
+KEEPALIVE_SECONDS = 15.0
+
+
+async def _event_stream(request: Request) -> AsyncGenerator[str]:
+    async with change_feed.subscribe() as queue:
+        yield ": connected\n\n"
+        while not await request.is_disconnected():
+            try:
+                event = await asyncio.wait_for(queue.get(), timeout=KEEPALIVE_SECONDS)
+            except TimeoutError:
+                yield ": keepalive\n\n"
+                continue
+            if event is None:
+                return  # cut off for lagging: the client reconnects and reloads
+            yield f"event: change\ndata: {event.model_dump_json()}\n\n"
+
+
+@router.get("/events", response_class=StreamingResponse)
+async def stream_events(request: Request) -> StreamingResponse:
+    """Stream committed account changes as Server-Sent Events.
+
+    Each ``change`` event carries the NFC ID, the account state after the change
+    (or ``deleted``) and the ledger entry that was written.
+    """
+    return StreamingResponse(
+        _event_stream(request),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
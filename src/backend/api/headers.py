@@ -0,0 +1,11 @@
+from typing import Annotated
+
+from fastapi import Header
+
+IdempotencyKey = Annotated[
+    str | None,
+    Header(
+        max_length=64,
+        description="Client-chosen unique key; a retried request with the same key is not applied twice",
+    ),
+]
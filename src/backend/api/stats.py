@@ -0,0 +1,41 @@
+from datetime import datetime
+from typing import Annotated
+
+from fastapi import APIRouter, Depends, Query
+
+from src.backend.core.admission import write_admission_dependency
+from src.backend.models.stats import CocktailStat, HourlyStat, RollupRebuild
+from src.backend.service.stats_service import StatsService, get_read_stats_service
+from src.backend.service.write_actor import WriteActor, get_write_actor
+
+router = APIRouter(prefix="/stats", tags=["stats"])
+
+SinceQuery = Annotated[datetime | None, Query(description="Start of the range (inclusive, hour resolution)")]
+UntilQuery = Annotated[datetime | None, Query(description="End of the range (exclusive, hour resolution)")]
+
+
+@router.get("/cocktails")
+def get_cocktail_stats(
+    stats_service: Annotated[StatsService, Depends(get_read_stats_service)],
+    since: SinceQuery = None,
+    until: UntilQuery = None,
+    limit: Annotated[int, Query(ge=1, le=1000)] = 100,
+) -> list[CocktailStat]:
+    """Bookings and revenue per cocktail, best sellers first."""
+    return stats_service.get_cocktail_stats(since=since, until=until, limit=limit)
+
+
+@router.get("/hourly")
+def get_hourly_stats(
+    stats_service: Annotated[StatsService, Depends(get_read_stats_service)],
+    since: SinceQuery = None,
+    until: UntilQuery = None,
+) -> list[HourlyStat]:
+    """Bookings and revenue per hour (UTC), oldest first."""
+    return stats_service.get_hourly_stats(since=since, until=until)
+
+
+@router.post("/rebuild", dependencies=[Depends(write_admission_dependency)])
+async def rebuild_stats(writer: Annotated[WriteActor, Depends(get_write_actor)]) -> RollupRebuild:
+    """Recompute all rollups from the payment log."""
+    return await writer.submit(lambda service: StatsService(service.db).rebuild())
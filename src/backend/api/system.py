@@ -0,0 +1,21 @@
+from typing import Annotated
+
+from fastapi import APIRouter, Depends
+
+from src.backend.core import admission
+from src.backend.models.schemas import AdmissionStats, WriterStats
+from src.backend.service.write_actor import WriteActor, get_write_actor
+
+router = APIRouter(prefix="/system", tags=["system"])
+
+
+@router.get("/admission")
+def get_admission_stats() -> AdmissionStats:
+    """Concurrency, queue depth and rejections of the write endpoints (this worker)."""
+    return admission.write_admission.stats
+
+
+@router.get("/writer")
+def get_writer_stats(writer: Annotated[WriteActor, Depends(get_write_actor)]) -> WriterStats:
+    """Queue depth, throughput and latency of the single-writer actor (this worker)."""
+    return writer.stats
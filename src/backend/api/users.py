@@ -1,17 +1,22 @@
 from typing import Annotated
 
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Query, status
 
+from src.backend.api.headers import IdempotencyKey
+from src.backend.core.admission import write_admission_dependency
 from src.backend.core.errors import UserNotFound
+from src.backend.models.schemas import UserChanges, UserPage, UserSort
+from src.backend.models.types import NfcId
 from src.backend.models.user import PaymentLog, User, UserCreate, UserUpdate
-from src.backend.service.user_service import UserService, get_user_service
+from src.backend.service.user_service import UserService, get_read_user_service
+from src.backend.service.write_actor import WriteActor, get_write_actor
 
 router = APIRouter(prefix="/users", tags=["users"])
 
 
 @router.get("")
 def list_users(
-    user_service: Annotated[UserService, Depends(get_user_service)],
+    user_service: Annotated[UserService, Depends(get_read_user_service)],
     skip: int = 0,
     limit: int = 1000,
 ) -> list[User]:
@@ -19,8 +24,31 @@ def list_users(
     return user_service.get_users(skip=skip, limit=limit)
 
 
+@router.get("/changes")
+def list_user_changes(
+    user_service: Annotated[UserService, Depends(get_read_user_service)],
+    since: Annotated[int, Query(ge=0, description="Last revision the client has seen (0 for everything)")] = 0,
+) -> UserChanges:
+    """List accounts created, updated or deleted after a revision, for delta sync."""
+    return user_service.get_changes(since)
+
+
+@router.get("/page")
+def list_user_page(
+    user_service: Annotated[UserService, Depends(get_read_user_service)],
+    *,
+    q: Annotated[str, Query(max_length=64, description="Only accounts whose NFC ID starts with this")] = "",
+    sort: UserSort = UserSort.NFC_ID,
+    descending: bool = False,
+    offset: Annotated[int, Query(ge=0)] = 0,
+    limit: Annotated[int, Query(ge=1, le=200)] = 50,
+) -> UserPage:
+    """List one page of accounts, searched by NFC ID prefix and sorted, for paged tables."""
+    return user_service.get_user_page(q, sort, descending=descending, offset=offset, limit=limit)
+
+
 @router.get("/{nfc_id}")
-def get_user(nfc_id: str, user_service: Annotated[UserService, Depends(get_user_service)]) -> User:
+def get_user(nfc_id: NfcId, user_service: Annotated[UserService, Depends(get_read_user_service)]) -> User:
     """Get a user by NFC ID."""
     user = user_service.get_user_by_nfc(nfc_id)
     if not user:
@@ -28,32 +56,41 @@ def get_user(nfc_id: str, user_service: Annotated[UserService, Depends(get_user_
     return user
 
 
-@router.post("", status_code=status.HTTP_201_CREATED)
-def create_user(user: UserCreate, user_service: Annotated[UserService, Depends(get_user_service)]) -> User:
+@router.post("", status_code=status.HTTP_201_CREATED, dependencies=[Depends(write_admission_dependency)])
+async def create_user(
+    user: UserCreate,
+    writer: Annotated[WriteActor, Depends(get_write_actor)],
+    idempotency_key: IdempotencyKey = None,
+) -> User:
     """Create a new user."""
-    return user_service.create_user(user)
+    return await writer.submit(lambda service: service.create_user(user, idempotency_key))
 
 
-@router.put("/{nfc_id}")
-def update_user(
-    nfc_id: str,
+@router.put("/{nfc_id}", dependencies=[Depends(write_admission_dependency)])
+async def update_user(
+    nfc_id: NfcId,
     user_update: UserUpdate,
-    user_service: Annotated[UserService, Depends(get_user_service)],
+    writer: Annotated[WriteActor, Depends(get_write_actor)],
 ) -> User:
     """Update a user by NFC ID."""
-    return user_service.update_user(nfc_id, user_update)
+    return await writer.submit(lambda service: service.update_user(nfc_id, user_update))
 
 
-@router.delete("/{nfc_id}", status_code=status.HTTP_204_NO_CONTENT)
-def delete_user(nfc_id: str, user_service: Annotated[UserService, Depends(get_user_service)]) -> None:
+@router.delete("/{nfc_id}", status_code=status.HTTP_204_NO_CONTENT, dependencies=[Depends(write_admission_dependency)])
+async def delete_user(nfc_id: NfcId, writer: Annotated[WriteActor, Depends(get_write_actor)]) -> None:
     """Delete a user by NFC ID."""
-    user_service.delete_user(nfc_id)
+    await writer.submit(lambda service: service.delete_user(nfc_id))
 
 
 @router.get("/{nfc_id}/history", tags=["history"])
-def get_user_history(nfc_id: str, user_service: Annotated[UserService, Depends(get_user_service)]) -> list[PaymentLog]:
-    """Get transaction history for a user by NFC ID."""
-    logs = user_service.get_payment_logs(nfc_id)
-    if not logs:
+def get_user_history(
+    nfc_id: NfcId,
+    user_service: Annotated[UserService, Depends(get_read_user_service)],
+    before: Annotated[int | None, Query(ge=1, description="Only entries older than this ledger id (cursor)")] = None,
+    limit: Annotated[int | None, Query(ge=1, le=500, description="Return at most this many entries")] = None,
+) -> list[PaymentLog]:
+    """Get transaction history for a user by NFC ID, newest first; page it with `before` and `limit`."""
+    logs = user_service.get_payment_logs(nfc_id, before=before, limit=limit)
+    if not logs and before is None:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=f"No logs for {nfc_id} found")
     return logs
@@ -0,0 +1,90 @@
+"""Admission control for the write endpoints.
+
+Every write ends up waiting for SQLite's single write lock, so letting a burst of
+bookings into the threadpool at once only makes all of them slow. At most
+``write_concurrency`` writes run at a time, at most ``write_queue_size`` more wait
+(for up to ``QUEUE_TIMEOUT_SECONDS``), and anything beyond that is turned away at
+once with ``503`` and ``Retry-After``, which the client can act on.
+"""
+
+import asyncio
+from collections.abc import AsyncGenerator
+
+from fastapi import HTTPException, status
+
+from src.backend.core.config import config as cfg
+from src.backend.models.schemas import AdmissionStats
+
+QUEUE_TIMEOUT_SECONDS = 2.0
+RETRY_AFTER_SECONDS = 1
+
+
+class AdmissionRejected(Exception):
+    """Raised when neither a slot nor a place in the wait queue is free."""
+
+
+class AdmissionControl:
+    """Concurrency limit with a bounded wait queue, counting what it admits and rejects."""
+
+    def __init__(self, limit: int, queue_size: int, queue_timeout: float = QUEUE_TIMEOUT_SECONDS) -> None:
+        self.limit = limit
+        self.queue_size = queue_size
+        self.queue_timeout = queue_timeout
+        self._semaphore = asyncio.Semaphore(limit)
+        self._active = 0
+        self._waiting = 0
+        self._admitted = 0
+        self._rejected = 0
+
+    @property
+    def stats(self) -> AdmissionStats:
+        return AdmissionStats(
+            limit=self.limit,
+            queue_size=self.queue_size,
+            active=self._active,
+            waiting=self._waiting,
+            admitted=self._admitted,
+            rejected=self._rejected,
+        )
+
+    async def acquire(self) -> None:
+        """Take a slot, waiting in the queue if needed; raise AdmissionRejected if full or timed out."""
+        if self._semaphore.locked():
+            if self._waiting >= self.queue_size:
+                self._rejected += 1
+                raise AdmissionRejected
+            self._waiting += 1
+            try:
+                await asyncio.wait_for(self._semaphore.acquire(), timeout=self.queue_timeout)
+            except TimeoutError:
+                self._rejected += 1
+                raise AdmissionRejected from None
+            finally:
+                self._waiting -= 1
+        else:
+            await self._semaphore.acquire()
+        self._active += 1
+        self._admitted += 1
+
+    def release(self) -> None:
+        self._active -= 1
+        self._semaphore.release()
+
+
+# Singleton shared by all write routes of this process.
+write_admission = AdmissionControl(cfg.write_concurrency, cfg.write_queue_size)
+
+
+async def write_admission_dependency() -> AsyncGenerator[None]:
+    try:
+        await write_admission.acquire()
+    except AdmissionRejected:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Server busy, retry shortly",
+            headers={"Retry-After": str(RETRY_AFTER_SECONDS)},
+        ) from None
+    try:
+        yield
+    finally:
+        write_admission.release()
@@ -0,0 +1,122 @@
+"""Response compression, negotiated from the request's ``Accept-Encoding``.
+
+`CompressionMiddleware` compresses response bodies of at least ``minimum_size``
+bytes with the first of the configured encodings the client accepts and this
+process can produce: ``gzip`` always, ``br`` and ``zstd`` if the ``brotli`` or
+``zstandard`` package is installed. Small bodies (booking responses, errors)
+go out as they are: compressing them saves no airtime and costs CPU. The
+change feed's ``text/event-stream`` is never compressed, so events are not held
+back in a compressor's buffer; responses that already carry a
+``Content-Encoding`` are passed through.
+
+It builds on Starlette's GZip responders, which handle the size threshold,
+streaming bodies and the excluded content types; only the codec differs.
+"""
+
+import zlib
+from collections.abc import Callable, Sequence
+from typing import Protocol
+
+from starlette.datastructures import Headers
+from starlette.middleware.gzip import IdentityResponder
+from starlette.types import ASGIApp, Receive, Scope, Send
+
+# Levels for speed over ratio: JSON compresses well at low levels, and a Pi pays for every response.
+GZIP_LEVEL = 6
+BROTLI_QUALITY = 4
+ZSTD_LEVEL = 3
+
+
+class Compressor(Protocol):
+    def compress(self, data: bytes) -> bytes: ...
+
+    def flush(self) -> bytes: ...
+
+
+def _gzip() -> Compressor:
+    return zlib.compressobj(GZIP_LEVEL, zlib.DEFLATED, 31)  # wbits 31: gzip container
+
+
+# Encoding name -> factory of a fresh compressor for one response.
+CODECS: dict[str, Callable[[], Compressor]] = {"gzip": _gzip}
+
+try:
+    import brotli
+
+    class _Brotli:
+        def __init__(self) -> None:
+            self._compressor = brotli.Compressor(quality=BROTLI_QUALITY)
+
+        def compress(self, data: bytes) -> bytes:
+            return self._compressor.process(data)
+
+        def flush(self) -> bytes:
+            return self._compressor.finish()
+
+    CODECS["br"] = _Brotli
+except ImportError:
+    pass
+
+try:
+    import zstandard
+
+    CODECS["zstd"] = lambda: zstandard.ZstdCompressor(level=ZSTD_LEVEL).compressobj()
+except ImportError:
+    pass
+
+
+def compress(encoding: str, body: bytes) -> bytes:
+    """Compress a whole body with the encoding's codec, as the middleware would."""
+    compressor = CODECS[encoding]()
+    return compressor.compress(body) + compressor.flush()
+
+
+def negotiate(accept_encoding: str, encodings: Sequence[str]) -> str | None:
+    """Return the first of `encodings` that is available and accepted by `accept_encoding`, if any."""
+    accepted: dict[str, float] = {}
+    for item in accept_encoding.split(","):
+        name, *params = (part.strip() for part in item.split(";"))
+        quality = 1.0
+        for param in params:
+            key, _, value = param.partition("=")
+            if key.strip() == "q":
+                try:
+                    quality = float(value)
+                except ValueError:
+                    quality = 0.0
+        if name:
+            accepted[name.lower()] = quality
+    for encoding in encodings:
+        if encoding in CODECS and accepted.get(encoding, accepted.get("*", 0.0)) > 0:
+            return encoding
+    return None
+
+
+class _CompressingResponder(IdentityResponder):
+    def __init__(self, app: ASGIApp, minimum_size: int, encoding: str) -> None:
+        super().__init__(app, minimum_size)
+        self.content_encoding = encoding
+        self._compressor = CODECS[encoding]()
+
+    def apply_compression(self, body: bytes, *, more_body: bool) -> bytes:
+        data = self._compressor.compress(body)
+        return data if more_body else data + self._compressor.flush()
+
+
+class CompressionMiddleware:
+    """Compress large responses with the best of `encodings` (in preference order) the client accepts."""
+
+    def __init__(self, app: ASGIApp, encodings: Sequence[str] = ("gzip",), minimum_size: int = 1000) -> None:
+        self.app = app
+        self.encodings = list(encodings)
+        self.minimum_size = minimum_size
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        encoding = negotiate(Headers(scope=scope).get("accept-encoding", ""), self.encodings)
+        if encoding is None:
+            await self.app(scope, receive, send)
+            return
+        await _CompressingResponder(self.app, self.minimum_size, encoding)(scope, receive, send)
@@ -3,6 +3,7 @@ from typing import Any
 from dotenv import load_dotenv
 from pydantic_settings import BaseSettings
 
+from src.backend.models.types import normalize_nfc_id
 from src.shared import DEFAULT_API_KEY, DEFAULT_BACKEND_PORT, DEFAULT_DATABASE_PATH, DEFAULT_MASTER_KEYS, ENV_PATH
 
 load_dotenv(ENV_PATH)
@@ -14,9 +15,22 @@ class Config(BaseSettings):
     database_path: str = str(DEFAULT_DATABASE_PATH)
     language: str = "en"
     master_keys: list[str] = []
+    # API worker processes; more than one lets read traffic use several CPU cores.
+    workers: int = 1
+    # Connections per worker in the read-only pool serving GET routes.
+    read_pool_size: int = 5
+    # Writes running at once per worker, and how many more may wait for a turn.
+    write_concurrency: int = 4
+    write_queue_size: int = 16
+    # Response compression, in order of preference; "br" and "zstd" need the brotli or
+    # zstandard package and are skipped without it. Empty turns compression off.
+    compression_encodings: list[str] = ["zstd", "br", "gzip"]
+    # Response bodies smaller than this many bytes are sent uncompressed.
+    compression_min_size: int = 1000
 
     def model_post_init(self, _context: Any, /) -> None:
         self.master_keys.extend(DEFAULT_MASTER_KEYS)
+        self.master_keys = [normalize_nfc_id(key) for key in self.master_keys]
 
 
 config = Config()  # type: ignore[assignment]
@@ -3,13 +3,13 @@
 These carry domain data only — never an HTTP status. The single mapping from a
 domain error to an HTTP response lives at the seam in ``core.exception_handlers``.
 Each error's ``str()`` is the user-facing detail message, rendered in the
-configured language via the backend ``translations`` singleton (so both the API
+configured language via ``get_translations()`` (so both the API
 detail and the logs follow ``LANGUAGE``).
 """
 
 from decimal import Decimal
 
-from src.backend.i18n.translator import translations as t
+from src.backend.i18n.translator import get_translations
 
 
 class DomainError(Exception):
@@ -21,7 +21,7 @@ class UserNotFound(DomainError):
 
     def __init__(self, nfc_id: str) -> None:
         self.nfc_id = nfc_id
-        super().__init__(t.err_user_not_found)
+        super().__init__(get_translations().err_user_not_found)
 
 
 class DuplicateNfc(DomainError):
@@ -29,7 +29,7 @@ class DuplicateNfc(DomainError):
 
     def __init__(self, nfc_id: str) -> None:
         self.nfc_id = nfc_id
-        super().__init__(t.err_duplicate_nfc.format(nfc_id=nfc_id))
+        super().__init__(get_translations().err_duplicate_nfc.format(nfc_id=nfc_id))
 
 
 class BalanceBelowMinimum(DomainError):
@@ -38,7 +38,9 @@ class BalanceBelowMinimum(DomainError):
     def __init__(self, current: Decimal, requested: Decimal) -> None:
         self.current = current
         self.requested = requested
-        super().__init__(t.err_balance_below_minimum.format(current=f"{current:.2f}", requested=f"{requested:.2f}"))
+        super().__init__(
+            get_translations().err_balance_below_minimum.format(current=f"{current:.2f}", requested=f"{requested:.2f}")
+        )
 
 
 class UnderageBooking(DomainError):
@@ -46,7 +48,7 @@ class UnderageBooking(DomainError):
 
     def __init__(self, nfc_id: str) -> None:
         self.nfc_id = nfc_id
-        super().__init__(t.err_underage_booking)
+        super().__init__(get_translations().err_underage_booking)
 
 
 class InsufficientBalance(DomainError):
@@ -55,4 +57,6 @@ class InsufficientBalance(DomainError):
     def __init__(self, current: Decimal, required: Decimal) -> None:
         self.current = current
         self.required = required
-        super().__init__(t.err_insufficient_balance.format(current=f"{current:.2f}", required=f"{required:.2f}"))
+        super().__init__(
+            get_translations().err_insufficient_balance.format(current=f"{current:.2f}", required=f"{required:.2f}")
+        )
@@ -5,10 +5,13 @@ from collections.abc import Generator
 from contextlib import closing
 from datetime import datetime
 from pathlib import Path
+from typing import Any
 
+from sqlalchemy import Connection, Engine, event
 from sqlmodel import Session, SQLModel, create_engine
 
 from src.backend.core.config import config as cfg
+from src.backend.db.locking import FileLock
 
 _logger = logging.getLogger(__name__)
 
@@ -21,7 +24,79 @@ DATABASE_URL = f"sqlite:///{DATABASE_PATH}"
 BACKUP_INTERVAL_SECONDS = 12 * 60 * 60  # every 12 hours
 BACKUP_RETENTION = 14  # keep the 14 newest backups (~7 days at a 12h interval)
 
-engine = create_engine(DATABASE_URL, connect_args={"check_same_thread": False})
+BUSY_TIMEOUT_SECONDS = 10.0
+# Execution option naming the BEGIN mode of a transaction; writers use "IMMEDIATE".
+SQLITE_BEGIN = "sqlite_begin"
+
+# Cross-process locks for running several API workers on the same database file:
+# startup (migrations, master keys) runs under STARTUP_LOCK one worker at a time,
+# and only the worker holding LEADER_LOCK takes backups.
+STARTUP_LOCK = FileLock(DATABASE_PATH.with_name(f"{DATABASE_PATH.name}.startup.lock"))
+LEADER_LOCK = FileLock(DATABASE_PATH.with_name(f"{DATABASE_PATH.name}.leader.lock"))
+
+
+def create_write_engine(path: Path) -> Engine:
+    """Create an engine for read-write connections to the database at `path`.
+
+    Connections use WAL, and each transaction begins in the mode named by the
+    SQLITE_BEGIN execution option (DEFERRED by default, see `_begin`).
+    """
+    write_engine = create_engine(
+        f"sqlite:///{path}", connect_args={"check_same_thread": False, "timeout": BUSY_TIMEOUT_SECONDS}
+    )
+    event.listen(write_engine, "connect", _configure_connection)
+    event.listen(write_engine, "begin", _begin)
+    return write_engine
+
+
+def _configure_connection(dbapi_connection: sqlite3.Connection, _connection_record: Any) -> None:
+    """Use WAL and take over transaction control from the sqlite3 driver.
+
+    WAL lets readers in every worker proceed while one connection writes. Turning off
+    the driver's implicit BEGIN lets the "begin" hook below choose the BEGIN mode.
+    """
+    dbapi_connection.isolation_level = None
+    with closing(dbapi_connection.cursor()) as cursor:
+        cursor.execute("PRAGMA journal_mode=WAL")
+
+
+def _begin(connection: Connection) -> None:
+    """Begin with the mode from the SQLITE_BEGIN execution option (DEFERRED by default).
+
+    A write transaction must start IMMEDIATE: a deferred one that first reads and then
+    writes cannot wait for a concurrent writer and fails with "database is locked".
+    IMMEDIATE takes the write lock up front, so writers queue on the busy timeout.
+    """
+    mode = connection.get_execution_options().get(SQLITE_BEGIN, "DEFERRED")
+    connection.exec_driver_sql(f"BEGIN {mode}")
+
+
+engine = create_write_engine(DATABASE_PATH)
+
+
+def create_read_engine(path: Path, pool_size: int) -> Engine:
+    """Create an engine whose connections can only read the database at `path`.
+
+    Connections open the file with ``mode=ro`` and set ``query_only``, and come from
+    their own pool, so a slow report never holds a connection a booking waits for.
+    In WAL mode readers also never block, nor are blocked by, the writer.
+    """
+    read_engine = create_engine(
+        f"sqlite:///file:{path}?mode=ro&uri=true",
+        connect_args={"check_same_thread": False, "timeout": BUSY_TIMEOUT_SECONDS},
+        pool_size=pool_size,
+        max_overflow=0,
+    )
+
+    @event.listens_for(read_engine, "connect")
+    def _query_only(dbapi_connection: sqlite3.Connection, _connection_record: Any) -> None:
+        with closing(dbapi_connection.cursor()) as cursor:
+            cursor.execute("PRAGMA query_only=1")
+
+    return read_engine
+
+
+read_engine = create_read_engine(DATABASE_PATH, cfg.read_pool_size)
 
 
 def _create_backup() -> None:
@@ -45,20 +120,33 @@ def _prune_backups() -> None:
         _logger.info(f"Removed old backup: {old}")
 
 
-async def backup_db_periodically() -> None:
+async def backup_db_periodically(leader: FileLock | None = None) -> None:
+    """Take a backup every BACKUP_INTERVAL_SECONDS.
+
+    With a ``leader`` lock only the process holding it backs up. Each round retries
+    the lock, so when the leading worker exits another one takes over.
+    """
     while True:
-        try:
-            await asyncio.to_thread(_create_backup)
-        except Exception:
-            _logger.exception("Database backup failed")
+        if leader is None or leader.acquire(blocking=False):
+            try:
+                await asyncio.to_thread(_create_backup)
+            except Exception:
+                _logger.exception("Database backup failed")
         await asyncio.sleep(BACKUP_INTERVAL_SECONDS)
 
 
 def get_db() -> Generator[Session]:
+    """Session on the write engine, for routes that change data."""
     with Session(engine) as session:
         yield session
 
 
+def get_read_db() -> Generator[Session]:
+    """Session on the read-only engine, for routes that only query."""
+    with Session(read_engine) as session:
+        yield session
+
+
 def init_db() -> None:
     SQLModel.metadata.create_all(engine)
 
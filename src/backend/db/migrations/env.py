@@ -14,7 +14,7 @@ from sqlmodel import SQLModel
 
 from alembic import context
 from src.backend.core.config import config as app_config
-from src.backend.models import user  # noqa: F401  (import registers tables on SQLModel.metadata)
+from src.backend.models import stats, user  # noqa: F401  (import registers tables on SQLModel.metadata)
 
 config = context.config
 
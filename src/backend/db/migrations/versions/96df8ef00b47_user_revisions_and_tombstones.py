@@ -0,0 +1,59 @@
+"""user revisions and tombstones
+
+Revision ID: 96df8ef00b47
+Revises: f209444625a3
+Create Date: 2026-10-19 09:12:40.118204
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+import sqlmodel.sql.sqltypes
+
+
+# revision identifiers, used by Alembic.
+revision: str = '96df8ef00b47'
+down_revision: Union[str, Sequence[str], None] = 'f209444625a3'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('user_tombstones',
+    sa.Column('nfc_id', sqlmodel.sql.sqltypes.AutoString(), nullable=False),
+    sa.Column('rev', sa.Integer(), nullable=False),
+    sa.PrimaryKeyConstraint('nfc_id')
+    )
+    with op.batch_alter_table('user_tombstones', schema=None) as batch_op:
+        batch_op.create_index(batch_op.f('ix_user_tombstones_rev'), ['rev'], unique=False)
+
+    with op.batch_alter_table('users', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('rev', sa.Integer(), nullable=False, server_default='0'))
+        batch_op.create_index(batch_op.f('ix_users_rev'), ['rev'], unique=False)
+
+    # A revision is the id of the ledger entry that made the change. Existing rows
+    # take their latest entry (at least 1, so a full sync from 0 includes them).
+    op.execute(
+        "UPDATE users SET rev = COALESCE("
+        "(SELECT MAX(id) FROM payment_logs WHERE payment_logs.nfc_id = users.nfc_id), 1)"
+    )
+    op.execute(
+        "INSERT INTO user_tombstones (nfc_id, rev) "
+        "SELECT nfc_id, MAX(id) FROM payment_logs "
+        "WHERE description = 'Deleted' AND nfc_id NOT IN (SELECT nfc_id FROM users) "
+        "GROUP BY nfc_id"
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.batch_alter_table('users', schema=None) as batch_op:
+        batch_op.drop_index(batch_op.f('ix_users_rev'))
+        batch_op.drop_column('rev')
+
+    with op.batch_alter_table('user_tombstones', schema=None) as batch_op:
+        batch_op.drop_index(batch_op.f('ix_user_tombstones_rev'))
+
+    op.drop_table('user_tombstones')
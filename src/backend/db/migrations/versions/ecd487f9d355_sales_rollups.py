@@ -0,0 +1,71 @@
+"""sales rollups
+
+Revision ID: ecd487f9d355
+Revises: 96df8ef00b47
+Create Date: 2026-10-19 10:31:07.552914
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+import sqlmodel.sql.sqltypes
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'ecd487f9d355'
+down_revision: Union[str, Sequence[str], None] = '96df8ef00b47'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+_IS_BOOKING = "description NOT IN ('Created', 'Updated', 'Deleted', 'Top Up')"
+_IS_TOP_UP = "description IN ('Created', 'Top Up')"
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('cocktail_sales_hourly',
+    sa.Column('hour', sqlmodel.sql.sqltypes.AutoString(), nullable=False),
+    sa.Column('cocktail', sqlmodel.sql.sqltypes.AutoString(), nullable=False),
+    sa.Column('bookings', sa.Integer(), nullable=False),
+    sa.Column('revenue', sa.Numeric(precision=12, scale=2), nullable=False),
+    sa.PrimaryKeyConstraint('hour', 'cocktail')
+    )
+    with op.batch_alter_table('users', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('total_topped_up', sa.Numeric(precision=12, scale=2), nullable=False, server_default='0'))
+        batch_op.add_column(sa.Column('total_spent', sa.Numeric(precision=12, scale=2), nullable=False, server_default='0'))
+        batch_op.add_column(sa.Column('booking_count', sa.Integer(), nullable=False, server_default='0'))
+        batch_op.add_column(sa.Column('last_booking_at', sa.DateTime(timezone=True), nullable=True))
+
+    # Backfill from the existing ledger (same queries as StatsService.rebuild).
+    op.execute(
+        "INSERT INTO cocktail_sales_hourly (hour, cocktail, bookings, revenue) "
+        "SELECT strftime('%Y-%m-%d %H:00', created_at), description, COUNT(*), -SUM(amount) "
+        f"FROM payment_logs WHERE {_IS_BOOKING} GROUP BY 1, 2"
+    )
+    # One grouped pass over the ledger; only entries after an account's latest
+    # deletion belong to its current incarnation.
+    op.execute(
+        "UPDATE users SET total_topped_up = totals.topped_up, total_spent = totals.spent, "
+        "booking_count = totals.bookings, last_booking_at = totals.last_booking_at "
+        "FROM ("
+        f"SELECT nfc_id, SUM(CASE WHEN {_IS_TOP_UP} THEN amount ELSE 0 END) AS topped_up, "
+        f"SUM(CASE WHEN {_IS_BOOKING} THEN -amount ELSE 0 END) AS spent, "
+        f"SUM(CASE WHEN {_IS_BOOKING} THEN 1 ELSE 0 END) AS bookings, "
+        f"MAX(CASE WHEN {_IS_BOOKING} THEN created_at END) AS last_booking_at "
+        "FROM payment_logs WHERE id > COALESCE((SELECT MAX(d.id) FROM payment_logs AS d "
+        "WHERE d.nfc_id = payment_logs.nfc_id AND d.description = 'Deleted'), 0) "
+        "GROUP BY nfc_id"
+        ") AS totals WHERE totals.nfc_id = users.nfc_id"
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.batch_alter_table('users', schema=None) as batch_op:
+        batch_op.drop_column('last_booking_at')
+        batch_op.drop_column('booking_count')
+        batch_op.drop_column('total_spent')
+        batch_op.drop_column('total_topped_up')
+
+    op.drop_table('cocktail_sales_hourly')
@@ -0,0 +1,55 @@
+"""upper-case nfc ids
+
+Revision ID: ff18176b7eb1
+Revises: ae56c883c587
+Create Date: 2026-10-19 14:12:40.118203
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'ff18176b7eb1'
+down_revision: Union[str, Sequence[str], None] = 'ae56c883c587'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+_CANONICAL = "UPPER(TRIM(nfc_id))"
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # NFC IDs are now stored in canonical form (upper case, no surrounding blanks),
+    # as the API normalizes them. Two accounts differing only in case cannot be merged
+    # automatically; the operator has to delete one of them first.
+    collisions = op.get_bind().execute(
+        sa.text(f"SELECT {_CANONICAL} FROM users GROUP BY 1 HAVING COUNT(*) > 1")
+    ).scalars().all()
+    if collisions:
+        raise RuntimeError(
+            f"Accounts differ only in the case of their NFC ID: {', '.join(collisions)}. "
+            "Delete the duplicates, then start the backend again."
+        )
+
+    op.execute(f"UPDATE users SET nfc_id = {_CANONICAL} WHERE nfc_id != {_CANONICAL}")
+    op.execute(f"UPDATE payment_logs SET nfc_id = {_CANONICAL} WHERE nfc_id != {_CANONICAL}")
+    # Tombstones may now collide with each other (keep the latest deletion) or with a
+    # live account (which was created after the deletion, so it has none).
+    op.execute(
+        f"CREATE TEMPORARY TABLE canonical_tombstones AS SELECT {_CANONICAL} AS nfc_id, MAX(rev) AS rev "
+        "FROM user_tombstones GROUP BY 1"
+    )
+    op.execute("DELETE FROM user_tombstones")
+    op.execute(
+        "INSERT INTO user_tombstones (nfc_id, rev) SELECT nfc_id, rev FROM canonical_tombstones "
+        "WHERE nfc_id NOT IN (SELECT nfc_id FROM users)"
+    )
+    op.execute("DROP TABLE canonical_tombstones")
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    # The original spelling of the IDs is not kept; canonical IDs stay valid.
@@ -3,15 +3,15 @@
 Mirrors the frontend translator: one YAML file per language, loaded once into a
 ``Translations`` dataclass for the language configured by ``LANGUAGE``. A missing
 language file falls back to English. Domain errors render their message through
-the ``translations`` singleton, so ``str(exc)`` (and therefore both the API detail
-and the logs) follow the configured language.
+``get_translations()``, so ``str(exc)`` (and therefore both the API detail and
+the logs) follow the configured language. The YAML (and PyYAML) is loaded on
+first use, not at import: most API starts never render a domain error early.
 """
 
+import functools
 from dataclasses import dataclass
 from pathlib import Path
 
-import yaml
-
 from src.backend.core.config import config as cfg
 
 TRANSLATION_DIR = Path(__file__).parent / "translations"
@@ -29,6 +29,8 @@ class Translations:
 
 
 def load_translations(lang: str = cfg.language) -> Translations:
+    import yaml
+
     file_path = TRANSLATION_DIR / f"{lang}.yaml"
     if not file_path.exists():
         file_path = TRANSLATION_DIR / "en.yaml"
@@ -37,5 +39,7 @@ def load_translations(lang: str = cfg.language) -> Translations:
     return Translations(**data)
 
 
-# Singleton for app-wide use, loaded for the configured language.
-translations = load_translations()
+@functools.cache
+def get_translations() -> Translations:
+    """Return the app-wide translations for the configured language, loading them on the first call."""
+    return load_translations()
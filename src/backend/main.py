@@ -3,16 +3,26 @@ from collections.abc import AsyncGenerator
 from contextlib import asynccontextmanager
 from decimal import Decimal
 
-import uvicorn
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 
 from src.backend.api.routes import api_router
+from src.backend.core.compression import CompressionMiddleware
 from src.backend.core.config import config as cfg
 from src.backend.core.exception_handlers import register_exception_handlers
-from src.backend.db.database import backup_db_periodically, get_db, run_db_migrations
+from src.backend.db.database import (
+    LEADER_LOCK,
+    STARTUP_LOCK,
+    backup_db_periodically,
+    get_db,
+    read_engine,
+    run_db_migrations,
+)
+from src.backend.i18n.translator import get_translations
 from src.backend.models.user import UserCreate
+from src.backend.service.change_feed import change_feed
 from src.backend.service.user_service import get_user_service
+from src.backend.service.write_actor import write_actor
 from src.shared import LOG_CONFIG_PATH
 
 
@@ -29,12 +39,23 @@ def initialize_master_key_users() -> None:
 @asynccontextmanager
 async def lifespan(app: FastAPI) -> AsyncGenerator[None]:
     # Startup
-    run_db_migrations()
-    initialize_master_key_users()
-    backups = asyncio.create_task(backup_db_periodically())
+    # Load the locale now: a malformed file must fail the start, not the first error response.
+    get_translations()
+    # Workers start one at a time: the first migrates and provisions master keys,
+    # the ones after it find both already done.
+    with STARTUP_LOCK:
+        run_db_migrations()
+        initialize_master_key_users()
+    write_actor.start()
+    tasks = [asyncio.create_task(backup_db_periodically(LEADER_LOCK))]
+    if cfg.workers > 1:
+        tasks.append(asyncio.create_task(change_feed.follow_ledger(read_engine)))
     yield
     # Shutdown
-    backups.cancel()
+    for task in tasks:
+        task.cancel()
+    LEADER_LOCK.release()
+    write_actor.stop()
 
 
 app = FastAPI(
@@ -51,6 +72,10 @@ app.add_middleware(
     allow_methods=["*"],
     allow_headers=["*"],
 )
+if cfg.compression_encodings:
+    app.add_middleware(
+        CompressionMiddleware, encodings=cfg.compression_encodings, minimum_size=cfg.compression_min_size
+    )
 
 app.include_router(api_router)
 register_exception_handlers(app)
@@ -62,4 +87,17 @@ def read_root() -> dict[str, str]:
 
 
 def run_with_uvicorn() -> None:
+    # Imported here: importing the app (uvicorn workers, tests, CLI tools) does not need it.
+    import uvicorn
+
+    if cfg.workers > 1:
+        # Worker processes import the app themselves, so uvicorn needs its import string.
+        uvicorn.run(
+            "src.backend.main:app",
+            host="0.0.0.0",
+            port=cfg.api_port,
+            log_config=str(LOG_CONFIG_PATH),
+            workers=cfg.workers,
+        )
+        return
     uvicorn.run(app, host="0.0.0.0", port=cfg.api_port, log_config=str(LOG_CONFIG_PATH))
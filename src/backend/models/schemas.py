@@ -1,6 +1,9 @@
+from enum import StrEnum
+
 from sqlmodel import Field, SQLModel
 
 from src.backend.models.types import MONEY_DECIMAL_PLACES, MONEY_MAX_DIGITS, Money
+from src.backend.models.user import PaymentLog, User
 
 
 class BookCocktailRequest(SQLModel):
@@ -24,3 +27,59 @@ class BalanceUpdateRequest(SQLModel):
         decimal_places=MONEY_DECIMAL_PLACES,
         description="Amount to add (negative to subtract)",
     )
+
+
+class ChangeEvent(SQLModel):
+    """A committed account change, as published on the change feed."""
+
+    nfc_id: str = Field(description="NFC card ID of the changed account")
+    rev: int | None = Field(default=None, description="Revision of the change (the id of its ledger entry)")
+    deleted: bool = Field(default=False, description="Whether the account was deleted")
+    is_adult: bool | None = Field(default=None, description="Adult flag after the change, None if deleted")
+    balance: Money | None = Field(default=None, description="Balance after the change, None if deleted")
+    log: PaymentLog | None = Field(default=None, description="Ledger entry written by the change")
+
+
+class UserChanges(SQLModel):
+    """Accounts created, updated or deleted after a given revision."""
+
+    rev: int = Field(description="Revision to pass as `since` on the next call")
+    users: list[User] = Field(description="Accounts created or updated since the revision")
+    deleted: list[str] = Field(description="NFC IDs of accounts deleted since the revision")
+
+
+class UserSort(StrEnum):
+    """Columns a page of accounts can be sorted by."""
+
+    NFC_ID = "nfc_id"
+    BALANCE = "balance"
+    IS_ADULT = "is_adult"
+
+
+class UserPage(SQLModel):
+    """One page of accounts, with the number of accounts matching the search."""
+
+    total: int = Field(description="Accounts matching the search, over all pages")
+    users: list[User] = Field(description="Accounts on this page")
+
+
+class AdmissionStats(SQLModel):
+    """Load on the write endpoints' admission control, for this worker process."""
+
+    limit: int = Field(description="Writes allowed to run at once")
+    queue_size: int = Field(description="Writes allowed to wait for a turn")
+    active: int = Field(description="Writes running now")
+    waiting: int = Field(description="Writes waiting now (queue depth)")
+    admitted: int = Field(description="Writes admitted since start")
+    rejected: int = Field(description="Writes turned away with 503 since start")
+
+
+class WriterStats(SQLModel):
+    """Throughput and latency of the single-writer actor, for this worker process."""
+
+    queued: int = Field(description="Commands waiting to run")
+    processed: int = Field(description="Commands that succeeded since start")
+    failed: int = Field(description="Commands that raised since start (e.g. insufficient balance)")
+    mean_wait_ms: float = Field(description="Mean time a command waited in the queue")
+    mean_service_ms: float = Field(description="Mean time a command took to run and commit")
+    max_service_ms: float = Field(description="Longest time a command took to run and commit")
@@ -0,0 +1,50 @@
+"""Sales rollups, maintained alongside the ledger so reports never scan it."""
+
+from decimal import Decimal
+
+from sqlmodel import Field, SQLModel
+
+from src.backend.models.types import MONEY_DECIMAL_PLACES, MONEY_MAX_DIGITS, Money
+
+# Hour buckets are UTC (like the ledger timestamps) and stored as text in this
+# format, which sorts chronologically and matches SQLite's strftime output.
+HOUR_FORMAT = "%Y-%m-%d %H:00"
+
+
+class CocktailSalesHourly(SQLModel, table=True):
+    """Bookings and revenue per cocktail per hour."""
+
+    __tablename__ = "cocktail_sales_hourly"  # type: ignore[assignment]
+
+    hour: str = Field(primary_key=True, description="UTC hour bucket, 'YYYY-MM-DD HH:00'")
+    cocktail: str = Field(primary_key=True, description="Name of the cocktail")
+    bookings: int = Field(default=0, description="Number of bookings")
+    revenue: Money = Field(
+        default=Decimal("0"),
+        max_digits=MONEY_MAX_DIGITS,
+        decimal_places=MONEY_DECIMAL_PLACES,
+        description="Sum of the booked prices",
+    )
+
+
+class CocktailStat(SQLModel):
+    """Sales of one cocktail over a time range."""
+
+    cocktail: str
+    bookings: int
+    revenue: Money
+
+
+class HourlyStat(SQLModel):
+    """Sales of all cocktails in one hour."""
+
+    hour: str
+    bookings: int
+    revenue: Money
+
+
+class RollupRebuild(SQLModel):
+    """Row counts written by a rollup rebuild."""
+
+    cocktail_hours: int
+    accounts: int
@@ -3,7 +3,7 @@
 from decimal import Decimal
 from typing import Annotated
 
-from pydantic import PlainSerializer
+from pydantic import AfterValidator, PlainSerializer
 
 # Monetary amount type.
 #
@@ -20,3 +20,12 @@ Money = Annotated[
 # Database column precision: up to 9_999_999_999.99.
 MONEY_MAX_DIGITS = 12
 MONEY_DECIMAL_PLACES = 2
+
+
+def normalize_nfc_id(nfc_id: str) -> str:
+    """Return the canonical form of an NFC ID: card UIDs are upper-case hex."""
+    return nfc_id.strip().upper()
+
+
+# NFC ID as received from a client (path parameter), in its canonical form.
+NfcId = Annotated[str, AfterValidator(normalize_nfc_id)]
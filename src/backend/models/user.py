@@ -1,11 +1,21 @@
 from datetime import datetime
 from decimal import Decimal
+from enum import StrEnum
 
-from pydantic import field_serializer
+from pydantic import field_serializer, field_validator
 from sqlalchemy import Column, DateTime, func
 from sqlmodel import Field, SQLModel
 
-from src.backend.models.types import MONEY_DECIMAL_PLACES, MONEY_MAX_DIGITS, Money
+from src.backend.models.types import MONEY_DECIMAL_PLACES, MONEY_MAX_DIGITS, Money, normalize_nfc_id
+
+
+class PaymentLogOptions(StrEnum):
+    """Descriptions of the non-booking ledger entries; a booking is described by its cocktail name."""
+
+    CREATED = "Created"
+    UPDATED = "Updated"
+    DELETED = "Deleted"
+    TOP_UP = "Top Up"
 
 
 class UserBase(SQLModel):
@@ -26,10 +36,48 @@ class User(UserBase, table=True):
 
     __tablename__ = "users"  # type: ignore[assignment]
 
+    rev: int = Field(default=0, index=True, description="Revision of the last change to this account")
+    total_topped_up: Money = Field(
+        default=Decimal("0"),
+        max_digits=MONEY_MAX_DIGITS,
+        decimal_places=MONEY_DECIMAL_PLACES,
+        description="Money put on the account (initial balance and top-ups)",
+    )
+    total_spent: Money = Field(
+        default=Decimal("0"),
+        max_digits=MONEY_MAX_DIGITS,
+        decimal_places=MONEY_DECIMAL_PLACES,
+        description="Money spent on cocktails",
+    )
+    booking_count: int = Field(default=0, description="Number of booked cocktails")
+    last_booking_at: datetime | None = Field(
+        default=None,
+        sa_column=Column(DateTime(timezone=True), nullable=True),
+    )
+
+    @field_serializer("last_booking_at", when_used="json")
+    def _serialize_last_booking_at(self, value: datetime | None) -> str | None:
+        """Render the timestamp as 'YYYY-MM-DD HH:MM:SS' in JSON output."""
+        return value.strftime("%Y-%m-%d %H:%M:%S") if value else None
+
+
+class UserTombstone(SQLModel, table=True):
+    """Marker left behind by a deleted user, so delta-sync clients learn about the deletion."""
+
+    __tablename__ = "user_tombstones"  # type: ignore[assignment]
+
+    nfc_id: str = Field(primary_key=True, description="NFC card ID of the deleted user")
+    rev: int = Field(index=True, description="Revision of the deletion")
+
 
 class UserCreate(UserBase):
     """Schema for creating a new user."""
 
+    @field_validator("nfc_id")
+    @classmethod
+    def _normalize_nfc_id(cls, value: str) -> str:
+        return normalize_nfc_id(value)
+
 
 class UserUpdate(SQLModel):
     """Schema for updating an existing user."""
@@ -69,6 +117,14 @@ class PaymentLog(SQLModel, table=True):
         description="User balance after the transaction",
     )
     description: str = Field(description="Description of the transaction")
+    idempotency_key: str | None = Field(
+        default=None,
+        unique=True,
+        index=True,
+        max_length=64,
+        exclude=True,
+        description="Client-chosen key of the request that wrote this entry, so a retried request is not applied twice",
+    )
 
     @field_serializer("created_at", when_used="json")
     def _serialize_created_at(self, value: datetime | None) -> str | None:
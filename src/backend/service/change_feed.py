@@ -0,0 +1,148 @@
+"""In-process change feed: fans committed account changes out to live subscribers.
+
+``UserService`` publishes a :class:`ChangeEvent` after each successful commit. The
+service runs in worker threads (sync routes), while subscribers are SSE streams on
+the event loop, so publishing hands each event to the subscriber's loop with
+``call_soon_threadsafe``. A subscriber that cannot keep up is cut off rather than
+stalling the write path: its queue is cleared and ends with ``None``, which closes
+its stream, and the client reloads when it reconnects.
+
+With several API workers a commit only reaches the subscribers of the worker that
+made it. In that mode every worker runs :meth:`ChangeFeed.follow_ledger` instead,
+which publishes changes by tailing the shared payment ledger.
+"""
+
+import asyncio
+import contextlib
+import logging
+import threading
+from collections.abc import AsyncGenerator
+from contextlib import asynccontextmanager
+
+from sqlalchemy import Engine, func
+from sqlmodel import Session, select
+
+from src.backend.models.schemas import ChangeEvent
+from src.backend.models.user import PaymentLog, PaymentLogOptions, User
+
+_logger = logging.getLogger(__name__)
+
+SUBSCRIBER_QUEUE_SIZE = 256
+LEDGER_POLL_SECONDS = 0.5
+
+# A subscriber's loop and queue. The queue yields None once the subscriber was cut off.
+_Subscriber = tuple[asyncio.AbstractEventLoop, asyncio.Queue[ChangeEvent | None]]
+
+
+def _latest_log_id(engine: Engine) -> int:
+    with Session(engine) as db:
+        return db.exec(select(func.max(PaymentLog.id))).one() or 0
+
+
+def _read_ledger(engine: Engine, after: int) -> list[ChangeEvent]:
+    """Build change events for the ledger entries written after id `after`."""
+    with Session(engine) as db:
+        logs = db.exec(select(PaymentLog).where(PaymentLog.id > after).order_by(PaymentLog.id)).all()  # type: ignore[arg-type,operator]
+        events = []
+        for log in logs:
+            deleted = log.description == PaymentLogOptions.DELETED
+            event = ChangeEvent(nfc_id=log.nfc_id, rev=log.id, deleted=deleted, log=log)
+            if not deleted:
+                user = db.get(User, log.nfc_id)
+                if user is None:
+                    continue  # deleted since; its "Deleted" entry follows
+                event.is_adult = user.is_adult
+                event.balance = log.current_balance
+            events.append(event)
+        return events
+
+
+class ChangeFeed:
+    """Thread-safe publish/subscribe hub for :class:`ChangeEvent`."""
+
+    def __init__(self, queue_size: int = SUBSCRIBER_QUEUE_SIZE) -> None:
+        self._queue_size = queue_size
+        self._subscribers: set[_Subscriber] = set()
+        self._lock = threading.Lock()
+        self._following_ledger = False
+
+    @property
+    def subscriber_count(self) -> int:
+        return len(self._subscribers)
+
+    def publish(self, event: ChangeEvent) -> None:
+        """Hand the event to every subscriber. Safe to call from any thread."""
+        with self._lock:
+            subscribers = list(self._subscribers)
+        for subscriber in subscribers:
+            # The loop may already be closed during shutdown; nothing left to deliver to.
+            with contextlib.suppress(RuntimeError):
+                subscriber[0].call_soon_threadsafe(self._offer, subscriber, event)
+
+    def announce(self, event: ChangeEvent) -> None:
+        """Publish a change committed by this process, unless the feed follows the ledger."""
+        if not self._following_ledger:
+            self.publish(event)
+
+    async def follow_ledger(self, engine: Engine, interval: float = LEDGER_POLL_SECONDS) -> None:
+        """Publish every change written to the ledger by any process, until cancelled.
+
+        Polls for entries past the last one seen, an indexed primary-key range scan.
+        While this runs, :meth:`announce` is ignored so changes are not sent twice.
+        """
+        self._following_ledger = True
+        try:
+            last_id = await asyncio.to_thread(_latest_log_id, engine)
+            while True:
+                await asyncio.sleep(interval)
+                if not self._subscribers:
+                    last_id = await asyncio.to_thread(_latest_log_id, engine)
+                    continue
+                try:
+                    events = await asyncio.to_thread(_read_ledger, engine, last_id)
+                except Exception:
+                    _logger.exception("Reading the ledger for the change feed failed")
+                    continue
+                for event in events:
+                    self.publish(event)
+                    last_id = event.log.id  # type: ignore[union-attr,assignment]
+        finally:
+            self._following_ledger = False
+
+    def _offer(self, subscriber: _Subscriber, event: ChangeEvent) -> None:
+        """Enqueue on the subscriber's loop; cut the subscriber off if its queue is full.
+
+        Dropping events would leave the client showing stale accounts without
+        knowing it. Ending its stream instead makes it reconnect and reload.
+        """
+        queue = subscriber[1]
+        if subscriber not in self._subscribers:
+            return  # already cut off: its queue ends with None
+        if not queue.full():
+            queue.put_nowait(event)
+            return
+        with self._lock:
+            self._subscribers.discard(subscriber)
+        while not queue.empty():
+            queue.get_nowait()
+        queue.put_nowait(None)
+        _logger.warning(f"Change feed subscriber lagging, closed its stream at {event.nfc_id}")
+
+    @asynccontextmanager
+    async def subscribe(self) -> AsyncGenerator[asyncio.Queue[ChangeEvent | None]]:
+        """Register a subscriber queue for the lifetime of the context.
+
+        The queue yields None if the subscriber fell too far behind; no events follow.
+        """
+        entry: _Subscriber = (asyncio.get_running_loop(), asyncio.Queue(maxsize=self._queue_size))
+        with self._lock:
+            self._subscribers.add(entry)
+        try:
+            yield entry[1]
+        finally:
+            with self._lock:
+                self._subscribers.discard(entry)
+
+
+# Singleton for app-wide use.
+change_feed = ChangeFeed()
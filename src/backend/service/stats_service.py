@@ -0,0 +1,137 @@
+"""Sales rollups: kept current with each ledger entry, and rebuildable from the ledger.
+
+``record`` folds one freshly flushed ledger entry into the rollups inside the
+caller's transaction, so the rollups commit (or roll back) together with the
+booking. The per-account lifetime totals live on the ``users`` row and are kept
+by ``UserService`` itself. ``rebuild`` recomputes both from the whole ledger with
+one set-based, grouped statement per table.
+"""
+
+from datetime import UTC, datetime
+from typing import Annotated
+
+from fastapi import Depends
+from sqlalchemy import ColumnElement, func, text
+from sqlmodel import Session, col, delete, select
+
+from src.backend.db.database import get_read_db
+from src.backend.models.stats import HOUR_FORMAT, CocktailSalesHourly, CocktailStat, HourlyStat, RollupRebuild
+from src.backend.models.user import PaymentLogOptions
+
+# SQL predicates on payment_logs; a booking is any entry not described by an option.
+_IS_BOOKING = "description NOT IN ('{}')".format("', '".join(PaymentLogOptions))
+_IS_TOP_UP = f"description IN ('{PaymentLogOptions.CREATED}', '{PaymentLogOptions.TOP_UP}')"
+_HOUR = f"strftime('{HOUR_FORMAT}', created_at)"
+
+# Only entries after an account's latest deletion belong to its current incarnation.
+_CURRENT_ACCOUNT = (
+    "id > COALESCE((SELECT MAX(d.id) FROM payment_logs AS d "
+    f"WHERE d.nfc_id = payment_logs.nfc_id AND d.description = '{PaymentLogOptions.DELETED}'), 0)"
+)
+
+_ACCOUNT_COLUMNS = f"""
+    nfc_id,
+    SUM(CASE WHEN {_IS_TOP_UP} THEN amount ELSE 0 END) AS topped_up,
+    SUM(CASE WHEN {_IS_BOOKING} THEN -amount ELSE 0 END) AS spent,
+    SUM(CASE WHEN {_IS_BOOKING} THEN 1 ELSE 0 END) AS bookings,
+    MAX(CASE WHEN {_IS_BOOKING} THEN created_at END) AS last_booking_at
+"""
+
+_RECORD_COCKTAIL = text(f"""
+    INSERT INTO cocktail_sales_hourly (hour, cocktail, bookings, revenue)
+    SELECT {_HOUR}, description, 1, -amount FROM payment_logs WHERE id = :id AND {_IS_BOOKING}
+    ON CONFLICT (hour, cocktail) DO UPDATE SET
+        bookings = bookings + excluded.bookings,
+        revenue = revenue + excluded.revenue
+""")
+
+_REBUILD_COCKTAILS = text(f"""
+    INSERT INTO cocktail_sales_hourly (hour, cocktail, bookings, revenue)
+    SELECT {_HOUR}, description, COUNT(*), -SUM(amount) FROM payment_logs WHERE {_IS_BOOKING}
+    GROUP BY 1, 2
+""")
+
+_REBUILD_ACCOUNTS = text(f"""
+    UPDATE users SET
+        total_topped_up = COALESCE(totals.topped_up, 0),
+        total_spent = COALESCE(totals.spent, 0),
+        booking_count = COALESCE(totals.bookings, 0),
+        last_booking_at = totals.last_booking_at
+    FROM users AS account
+    LEFT JOIN (
+        SELECT {_ACCOUNT_COLUMNS} FROM payment_logs WHERE {_CURRENT_ACCOUNT} GROUP BY nfc_id
+    ) AS totals ON totals.nfc_id = account.nfc_id
+    WHERE users.nfc_id = account.nfc_id
+""")
+
+
+def _bucket(moment: datetime) -> str:
+    """Hour bucket of a moment; naive datetimes are taken as UTC, like the ledger timestamps."""
+    if moment.tzinfo is not None:
+        moment = moment.astimezone(UTC)
+    return moment.strftime(HOUR_FORMAT)
+
+
+def _hour_range(since: datetime | None, until: datetime | None) -> list[ColumnElement[bool]]:
+    """Conditions selecting the hour buckets in [since, until)."""
+    hour = col(CocktailSalesHourly.hour)
+    conditions = []
+    if since is not None:
+        conditions.append(hour >= _bucket(since))
+    if until is not None:
+        conditions.append(hour < _bucket(until))
+    return conditions
+
+
+class StatsService:
+    """Service for the sales rollups."""
+
+    def __init__(self, db: Session) -> None:
+        self.db = db
+
+    def record(self, log_id: int) -> None:
+        """Fold a flushed (not yet committed) ledger entry into the rollups."""
+        self.db.execute(_RECORD_COCKTAIL, {"id": log_id})
+
+    def rebuild(self) -> RollupRebuild:
+        """Recompute all rollups from the ledger in one pass per table."""
+        self.db.execute(delete(CocktailSalesHourly))
+        self.db.execute(_REBUILD_COCKTAILS)
+        accounts = self.db.execute(_REBUILD_ACCOUNTS).rowcount  # type: ignore[attr-defined]
+        self.db.commit()
+        return RollupRebuild(
+            cocktail_hours=self.db.exec(select(func.count()).select_from(CocktailSalesHourly)).one(),
+            accounts=accounts,
+        )
+
+    def get_cocktail_stats(
+        self, since: datetime | None = None, until: datetime | None = None, limit: int = 100
+    ) -> list[CocktailStat]:
+        """Bookings and revenue per cocktail in the hours [since, until), best sellers first."""
+        bookings = func.sum(CocktailSalesHourly.bookings).label("bookings")
+        query = (
+            select(CocktailSalesHourly.cocktail, bookings, func.sum(CocktailSalesHourly.revenue))
+            .where(*_hour_range(since, until))
+            .group_by(CocktailSalesHourly.cocktail)
+            .order_by(bookings.desc())
+            .limit(limit)
+        )
+        rows = self.db.exec(query).all()
+        return [CocktailStat(cocktail=name, bookings=count, revenue=revenue) for name, count, revenue in rows]
+
+    def get_hourly_stats(self, since: datetime | None = None, until: datetime | None = None) -> list[HourlyStat]:
+        """Bookings and revenue per hour in [since, until), oldest first."""
+        hour = col(CocktailSalesHourly.hour)
+        query = (
+            select(hour, func.sum(CocktailSalesHourly.bookings), func.sum(CocktailSalesHourly.revenue))
+            .where(*_hour_range(since, until))
+            .group_by(hour)
+            .order_by(hour)
+        )
+        rows = self.db.exec(query).all()
+        return [HourlyStat(hour=hour, bookings=count, revenue=revenue) for hour, count, revenue in rows]
+
+
+def get_read_stats_service(db: Annotated[Session, Depends(get_read_db)]) -> StatsService:
+    """Dependency to get a StatsService on a read-only session, for queries."""
+    return StatsService(db)
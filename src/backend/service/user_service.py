@@ -1,10 +1,11 @@
 import logging
+import sys
+from datetime import UTC, datetime
 from decimal import Decimal
-from enum import StrEnum
 from typing import Annotated
 
 from fastapi import Depends
-from sqlmodel import Session, select
+from sqlmodel import Session, col, func, select
 
 from src.backend.core.config import config
 from src.backend.core.errors import (
@@ -14,24 +15,22 @@ from src.backend.core.errors import (
     UnderageBooking,
     UserNotFound,
 )
-from src.backend.db.database import get_db
-from src.backend.models.user import PaymentLog, User, UserCreate, UserUpdate
+from src.backend.db.database import SQLITE_BEGIN, get_db, get_read_db
+from src.backend.models.schemas import ChangeEvent, UserChanges, UserPage, UserSort
+from src.backend.models.types import normalize_nfc_id
+from src.backend.models.user import PaymentLog, PaymentLogOptions, User, UserCreate, UserTombstone, UserUpdate
+from src.backend.service.change_feed import change_feed
+from src.backend.service.stats_service import StatsService
 
 _logger = logging.getLogger(__name__)
 
 
-class PaymentLogOptions(StrEnum):
-    CREATED = "Created"
-    UPDATED = "Updated"
-    DELETED = "Deleted"
-    TOP_UP = "Top Up"
-
-
 class UserService:
     """Service for managing users."""
 
     def __init__(self, db: Session) -> None:
         self.db = db
+        self.stats = StatsService(db)
 
     def get_user_by_nfc(self, nfc_id: str) -> User | None:
         return self.db.exec(select(User).where(User.nfc_id == nfc_id)).first()
@@ -39,59 +38,110 @@ class UserService:
     def get_users(self, skip: int = 0, limit: int = 1000) -> list[User]:
         return list(self.db.exec(select(User).offset(skip).limit(limit)).all())
 
-    def create_user(self, user: UserCreate) -> User:
+    def get_user_page(
+        self,
+        prefix: str = "",
+        sort: UserSort = UserSort.NFC_ID,
+        descending: bool = False,
+        offset: int = 0,
+        limit: int = 50,
+    ) -> UserPage:
+        """Return one page of the accounts whose NFC ID starts with `prefix`.
+
+        The prefix is matched as a key range on the primary key rather than with
+        LIKE, so the search is an index seek; NFC ID breaks ties in the sort order.
+        NFC IDs are stored in canonical (upper-case) form, so the prefix is
+        normalized the same way: typing ``ab`` finds ``AB12``.
+        """
+        prefix = normalize_nfc_id(prefix)
+        query = select(User)
+        count = select(func.count()).select_from(User)
+        if prefix:
+            nfc_id = col(User.nfc_id)
+            matches = nfc_id >= prefix
+            if (last := ord(prefix[-1])) < sys.maxunicode:
+                matches &= nfc_id < prefix[:-1] + chr(last + 1)
+            query = query.where(matches)
+            count = count.where(matches)
+        column = col(getattr(User, sort))
+        order = [column.desc() if descending else column.asc()]
+        if sort != UserSort.NFC_ID:
+            order.append(col(User.nfc_id).asc())
+        users = self.db.exec(query.order_by(*order).offset(offset).limit(limit)).all()
+        return UserPage(total=self.db.exec(count).one(), users=list(users))
+
+    def create_user(self, user: UserCreate, idempotency_key: str | None = None) -> User:
+        self._begin_write()
+        if self._replayed(idempotency_key):
+            return self._replay_result(user.nfc_id, idempotency_key)
         existing_user = self.get_user_by_nfc(user.nfc_id)
         if existing_user:
             raise DuplicateNfc(user.nfc_id)
         db_user = User.model_validate(user)
+        db_user.total_topped_up = db_user.balance
         self.db.add(db_user)
-        self.log_payment_event(
+        # Re-registering a deleted card revives it: it is no longer a deletion to sync.
+        if tombstone := self.db.get(UserTombstone, user.nfc_id):
+            self.db.delete(tombstone)
+        log = self.log_payment_event(
             nfc_id=db_user.nfc_id,
             amount=db_user.balance,
             current_balance=db_user.balance,
             description=PaymentLogOptions.CREATED,
             commit=False,
+            idempotency_key=idempotency_key,
         )
+        self._stamp(db_user, log)
         self.db.commit()
         self.db.refresh(db_user)
+        self._publish(db_user, log)
         _logger.info(f"Created new user with NFC ID {db_user.nfc_id}")
         return db_user
 
     def update_user(self, nfc_id: str, user_update: UserUpdate) -> User:
+        self._begin_write()
         db_user = self.get_user_by_nfc(nfc_id)
         if not db_user:
             raise UserNotFound(nfc_id)
 
         db_user.sqlmodel_update(user_update.model_dump(exclude_unset=True))
         self.db.add(db_user)
-        self.log_payment_event(
+        log = self.log_payment_event(
             nfc_id=db_user.nfc_id,
             amount=user_update.balance or Decimal("0"),
             current_balance=db_user.balance,
             description=PaymentLogOptions.UPDATED,
             commit=False,
         )
+        self._stamp(db_user, log)
         self.db.commit()
         self.db.refresh(db_user)
+        self._publish(db_user, log)
         _logger.info(f"Updated user with NFC ID {db_user.nfc_id}")
         return db_user
 
     def delete_user(self, nfc_id: str) -> None:
+        self._begin_write()
         db_user = self.get_user_by_nfc(nfc_id)
         if not db_user:
             raise UserNotFound(nfc_id)
         self.db.delete(db_user)
-        self.log_payment_event(
+        log = self.log_payment_event(
             nfc_id=db_user.nfc_id,
             amount=Decimal("0"),
             current_balance=Decimal("0"),
             description=PaymentLogOptions.DELETED,
             commit=False,
         )
+        self._stamp(db_user, log, deleted=True)
         self.db.commit()
+        self._publish(db_user, log, deleted=True)
         _logger.info(f"Deleted user with NFC ID {db_user.nfc_id}")
 
-    def update_balance(self, nfc_id: str, amount: Decimal) -> User:
+    def update_balance(self, nfc_id: str, amount: Decimal, idempotency_key: str | None = None) -> User:
+        self._begin_write()
+        if self._replayed(idempotency_key):
+            return self._replay_result(nfc_id, idempotency_key)
         db_user = self.get_user_by_nfc(nfc_id)
         if not db_user:
             raise UserNotFound(nfc_id)
@@ -102,20 +152,27 @@ class UserService:
             raise BalanceBelowMinimum(current=db_user.balance, requested=amount)
 
         db_user.balance = new_balance
+        db_user.total_topped_up += amount
         self.db.add(instance=db_user)
-        self.log_payment_event(
+        log = self.log_payment_event(
             nfc_id=db_user.nfc_id,
             amount=amount,
             current_balance=new_balance,
             description=PaymentLogOptions.TOP_UP,
             commit=False,
+            idempotency_key=idempotency_key,
         )
+        self._stamp(db_user, log)
         self.db.commit()
         self.db.refresh(db_user)
+        self._publish(db_user, log)
         _logger.info(f"Updated balance for NFC ID {db_user.nfc_id}: {amount:.2f}, new balance: {new_balance:.2f}")
         return db_user
 
     def book_cocktail(self, nfc_id: str, amount: Decimal, is_alcoholic: bool, name: str) -> User:
+        # Master key bookings write nothing, so they need not wait for the write lock.
+        if nfc_id not in config.master_keys:
+            self._begin_write()
         db_user = self.get_user_by_nfc(nfc_id)
         if not db_user:
             raise UserNotFound(nfc_id)
@@ -134,16 +191,21 @@ class UserService:
             raise InsufficientBalance(current=db_user.balance, required=amount)
 
         db_user.balance -= amount
+        db_user.total_spent += amount
+        db_user.booking_count += 1
+        db_user.last_booking_at = datetime.now(UTC)
         self.db.add(db_user)
-        self.log_payment_event(
+        log = self.log_payment_event(
             nfc_id=nfc_id,
             amount=-amount,
             current_balance=db_user.balance,
             description=name,
             commit=False,
         )
+        self._stamp(db_user, log)
         self.db.commit()
         self.db.refresh(db_user)
+        self._publish(db_user, log)
         _logger.info(
             f"Booked cocktail '{name}' for NFC ID {db_user.nfc_id}: -{amount:.2f}, new balance: {db_user.balance:.2f}"
         )
@@ -156,20 +218,89 @@ class UserService:
         current_balance: Decimal,
         description: str,
         commit: bool = True,
-    ) -> None:
-        transaction = PaymentLog(nfc_id=nfc_id, amount=amount, current_balance=current_balance, description=description)
+        *,
+        idempotency_key: str | None = None,
+    ) -> PaymentLog:
+        transaction = PaymentLog(
+            nfc_id=nfc_id,
+            amount=amount,
+            current_balance=current_balance,
+            description=description,
+            idempotency_key=idempotency_key,
+        )
         self.db.add(transaction)
         if commit:
             self.db.commit()
+        return transaction
 
-    def get_payment_logs(self, nfc_id: str) -> list[PaymentLog]:
-        return list(
-            self.db.exec(
-                select(PaymentLog)
-                .where(PaymentLog.nfc_id == nfc_id)
-                .order_by(PaymentLog.created_at.desc(), PaymentLog.current_balance.asc())  # type: ignore
-            ).all()
-        )
+    def _replayed(self, idempotency_key: str | None) -> bool:
+        """Whether a request with this key was already applied (the client is retrying)."""
+        if idempotency_key is None:
+            return False
+        query = select(PaymentLog.id).where(PaymentLog.idempotency_key == idempotency_key)
+        return self.db.exec(query).first() is not None
+
+    def _replay_result(self, nfc_id: str, idempotency_key: str | None) -> User:
+        """Answer a retried request with the account's current state, applying nothing."""
+        db_user = self.get_user_by_nfc(nfc_id)
+        if not db_user:
+            raise UserNotFound(nfc_id)
+        _logger.info(f"Request {idempotency_key} for NFC ID {nfc_id} was already applied, not repeating it")
+        return db_user
+
+    def _begin_write(self) -> None:
+        """Start the transaction with BEGIN IMMEDIATE, so concurrent writers queue up.
+
+        Must run before the mutation's first read; other workers may write the same file.
+        """
+        if not self.db.in_transaction():
+            self.db.connection(execution_options={SQLITE_BEGIN: "IMMEDIATE"})
+
+    def _stamp(self, db_user: User, log: PaymentLog, deleted: bool = False) -> None:
+        """Book-keep a change inside its transaction: revision and sales rollups.
+
+        The revision is the id of the change's ledger entry, which only ever grows.
+        """
+        self.db.flush()  # assigns the ledger entry's id
+        rev: int = log.id  # type: ignore[assignment]
+        if deleted:
+            self.db.merge(UserTombstone(nfc_id=db_user.nfc_id, rev=rev))
+        else:
+            db_user.rev = rev
+            self.stats.record(rev)
+
+    def _publish(self, db_user: User, log: PaymentLog, deleted: bool = False) -> None:
+        """Announce a committed change on the change feed."""
+        self.db.refresh(log)
+        event = ChangeEvent(nfc_id=db_user.nfc_id, rev=log.id, deleted=deleted, log=log)
+        if not deleted:
+            event.is_adult = db_user.is_adult
+            event.balance = db_user.balance
+        change_feed.announce(event)
+
+    def get_changes(self, since: int = 0) -> UserChanges:
+        """Return the accounts created, updated or deleted after revision `since`.
+
+        Both lookups are range scans on an indexed revision column, so the cost is
+        proportional to the number of changes, not to the number of accounts.
+        """
+        users = list(self.db.exec(select(User).where(User.rev > since).order_by(User.rev)).all())  # type: ignore[arg-type]
+        tombstones = list(self.db.exec(select(UserTombstone).where(UserTombstone.rev > since)).all())
+        rev = max([since] + [user.rev for user in users] + [tombstone.rev for tombstone in tombstones])
+        return UserChanges(rev=rev, users=users, deleted=[tombstone.nfc_id for tombstone in tombstones])
+
+    def get_payment_logs(self, nfc_id: str, before: int | None = None, limit: int | None = None) -> list[PaymentLog]:
+        """Return the account's ledger entries, newest first.
+
+        Ledger ids grow in commit order, so they order the entries (unlike `created_at`,
+        which has ties) and serve as a cursor: pass the last id seen as `before` to get
+        the next `limit` older entries. The nfc_id index ends in the id, so a chunk is
+        one index seek however long the history is.
+        """
+        query = select(PaymentLog).where(PaymentLog.nfc_id == nfc_id)
+        if before is not None:
+            query = query.where(col(PaymentLog.id) < before)
+        return list(self.db.exec(query.order_by(col(PaymentLog.id).desc()).limit(limit)).all())
 
     def get_all_payment_logs(self) -> list[PaymentLog]:
         return list(self.db.exec(select(PaymentLog)).all())
@@ -178,3 +309,8 @@ class UserService:
 def get_user_service(db: Annotated[Session, Depends(get_db)]) -> UserService:
     """Dependency to get UserService with injected database session."""
     return UserService(db)
+
+
+def get_read_user_service(db: Annotated[Session, Depends(get_read_db)]) -> UserService:
+    """Dependency to get a UserService on a read-only session, for queries."""
+    return UserService(db)
@@ -0,0 +1,132 @@
+"""Single-writer actor: every account mutation of this process runs on one thread.
+
+SQLite lets one connection write at a time. Rather than have each request thread
+open a session and race for the write lock, routes hand their mutation to the
+actor as a command (a function of a :class:`UserService`) and await the result.
+The actor thread runs the commands one after another, so writes within a worker
+never contend, and it times every command. Each command gets a fresh session whose
+transaction ends with the command: one that returns without committing (an
+idempotent replay, a master-key booking) must not keep holding SQLite's write lock
+against the other workers.
+"""
+
+import asyncio
+import logging
+import queue
+import threading
+import time
+from collections.abc import Callable
+from concurrent.futures import Future
+from dataclasses import dataclass, field
+from typing import Any
+
+from sqlalchemy import Engine
+from sqlmodel import Session
+
+from src.backend.db.database import engine as write_engine
+from src.backend.models.schemas import WriterStats
+from src.backend.service.user_service import UserService
+
+_logger = logging.getLogger(__name__)
+
+type Command[T] = Callable[[UserService], T]
+
+
+@dataclass
+class _Job:
+    command: Command[Any]
+    future: Future[Any]
+    enqueued_at: float = field(default_factory=time.perf_counter)
+
+
+class WriteActor:
+    """Runs submitted commands in order on a dedicated thread and session."""
+
+    def __init__(self, engine: Engine) -> None:
+        self._engine = engine
+        self._jobs: queue.SimpleQueue[_Job | None] = queue.SimpleQueue()
+        self._thread: threading.Thread | None = None
+        self._start_lock = threading.Lock()
+        self._processed = 0
+        self._failed = 0
+        self._wait_seconds = 0.0
+        self._service_seconds = 0.0
+        self._max_service_seconds = 0.0
+
+    @property
+    def stats(self) -> WriterStats:
+        done = self._processed + self._failed
+        return WriterStats(
+            queued=self._jobs.qsize(),
+            processed=self._processed,
+            failed=self._failed,
+            mean_wait_ms=1000 * self._wait_seconds / done if done else 0.0,
+            mean_service_ms=1000 * self._service_seconds / done if done else 0.0,
+            max_service_ms=1000 * self._max_service_seconds,
+        )
+
+    def start(self) -> None:
+        with self._start_lock:
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name="write-actor", daemon=True)
+                self._thread.start()
+
+    def stop(self) -> None:
+        """Finish the commands already queued, then stop the thread."""
+        with self._start_lock:
+            if self._thread is None:
+                return
+            self._jobs.put(None)
+            self._thread.join()
+            self._thread = None
+
+    def enqueue[T](self, command: Command[T]) -> Future[T]:
+        """Queue a command; the future resolves to its result or raises its error."""
+        self.start()
+        future: Future[T] = Future()
+        self._jobs.put(_Job(command, future))
+        return future
+
+    async def submit[T](self, command: Command[T]) -> T:
+        """Queue a command and await its result without blocking the event loop."""
+        return await asyncio.wrap_future(self.enqueue(command))
+
+    def _run(self) -> None:
+        while (job := self._jobs.get()) is not None:
+            self._execute(job)
+
+    def _execute(self, job: _Job) -> None:
+        if not job.future.set_running_or_notify_cancel():
+            return
+        started = time.perf_counter()
+        error: Exception | None = None
+        with Session(self._engine) as session:
+            try:
+                result = job.command(UserService(session))
+            except Exception as exc:
+                error = exc
+            finally:
+                # Results leave the thread: detach them (before the rollback expires
+                # them) so nothing lazy-loads on this session.
+                session.expunge_all()
+                # End the transaction whatever the command did, releasing the write lock.
+                session.rollback()
+        elapsed = time.perf_counter() - started
+        self._wait_seconds += started - job.enqueued_at
+        self._service_seconds += elapsed
+        self._max_service_seconds = max(self._max_service_seconds, elapsed)
+        if error is not None:
+            self._failed += 1
+            job.future.set_exception(error)
+        else:
+            self._processed += 1
+            job.future.set_result(result)
+
+
+# Singleton for app-wide use.
+write_actor = WriteActor(write_engine)
+
+
+def get_write_actor() -> WriteActor:
+    """Dependency to get the process' write actor."""
+    return write_actor
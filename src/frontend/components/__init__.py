@@ -1,6 +1,8 @@
 # Frontend reusable UI components
 from src.frontend.components.amount_selector import AmountSelector
+from src.frontend.components.lazy_tab_panels import LazyTabPanels, PausableTab
 from src.frontend.components.nfc_scanner import NfcScannerSection
 from src.frontend.components.nfc_search_bar import NfcSearchBar
+from src.frontend.components.table_patcher import TablePatcher
 
-__all__ = ["AmountSelector", "NfcScannerSection", "NfcSearchBar"]
+__all__ = ["AmountSelector", "LazyTabPanels", "NfcScannerSection", "NfcSearchBar", "PausableTab", "TablePatcher"]
@@ -0,0 +1,63 @@
+"""Tab panels that build each tab the first time it is shown.
+
+Building every tab on page load costs each browser client the backend calls
+and file reads of tabs the operator may never open. `LazyTabPanels` keeps a
+builder per tab, runs it on first activation (logging how long it took), and
+tells tabs implementing `PausableTab` when they are shown or hidden, so hidden
+tabs can hold off their background refreshes.
+"""
+
+import logging
+import time
+from collections.abc import Callable
+from typing import Any, Protocol, runtime_checkable
+
+from nicegui import events, ui
+from nicegui.elements.tabs import Tab
+
+_logger = logging.getLogger(__name__)
+
+
+@runtime_checkable
+class PausableTab(Protocol):
+    def set_active(self, active: bool) -> None:
+        """Tell the tab it is shown (True) or that another tab is (False)."""
+
+
+def _tab_name(value: Any) -> Any:
+    return value.props["name"] if isinstance(value, Tab) else value
+
+
+class LazyTabPanels(ui.tab_panels):
+    """`ui.tab_panels` whose tab contents are built by `add`ed builders on first activation."""
+
+    def __init__(self, tabs: ui.tabs, value: Tab) -> None:
+        super().__init__(tabs, value=value, on_change=self._on_tab_change)
+        self._builders: dict[str, Callable[[], object]] = {}
+        self._contents: dict[str, object] = {}
+        self._shown: str | None = None
+
+    def add(self, tab: Tab, build: Callable[[], object]) -> None:
+        """Build the tab's content with `build` when the tab is first shown (now, if it is shown)."""
+        name = tab.props["name"]
+        self._builders[name] = build
+        if name == _tab_name(self.value):
+            self._show(name)
+
+    def _on_tab_change(self, e: events.ValueChangeEventArguments) -> None:
+        self._show(_tab_name(e.value))
+
+    def _show(self, name: str) -> None:
+        previous, self._shown = self._shown, name
+        if previous is not None and previous != name:
+            self._set_active(previous, False)
+        if name not in self._contents and (build := self._builders.get(name)) is not None:
+            started = time.perf_counter()
+            with self:
+                self._contents[name] = build()
+            _logger.debug(f"Built the {name} tab in {(time.perf_counter() - started) * 1000:.1f} ms")
+        self._set_active(name, True)
+
+    def _set_active(self, name: str, active: bool) -> None:
+        if isinstance(content := self._contents.get(name), PausableTab):
+            content.set_active(active)
@@ -0,0 +1,59 @@
+"""Send a `ui.table` only the rows that changed.
+
+Assigning `table.rows` re-sends the whole element (every row) to the browser.
+`TablePatcher.show` diffs the new rows against a `KeyedRows` snapshot instead
+and, unless most rows changed anyway, updates the server-side props without
+an element update and applies the `RowPatch` in the browser: changed rows are
+replaced, the rest keep their identity, so Vue re-renders only those.
+"""
+
+import json
+from typing import Any
+
+from nicegui import ui
+
+from src.frontend.core.row_diff import KeyedRows, Row, RowPatch
+
+# Runs in the browser: apply a RowPatch (and changed props) to the element's props.
+_PATCH_JS = """
+const props = mounted_app.elements[{id}].props;
+const patch = {patch};
+const rows = new Map(props.rows.map((row) => [row[patch.key], row]));
+patch.deleted.forEach((key) => rows.delete(key));
+patch.upserts.forEach((row) => rows.set(row[patch.key], row));
+const order = patch.order ?? props.rows.map((row) => row[patch.key]).filter((key) => rows.has(key));
+props.rows = order.map((key) => rows.get(key));
+Object.assign(props, patch.props);
+"""
+
+
+class TablePatcher:
+    """Updates a table's rows (and props like `pagination`) by sending only what changed."""
+
+    def __init__(self, table: ui.table, key: str) -> None:
+        self.table = table
+        self.rows = KeyedRows(key)
+
+    def show(self, rows: list[Row], **props: Any) -> None:
+        """Show `rows`, in order, and set the given table props."""
+        patch = self.rows.diff(rows)
+        changed = {name: value for name, value in props.items() if self.table.props.get(name) != value}
+        if not patch and not changed:
+            return
+        if len(patch.upserts) > len(rows) // 2:
+            # Most rows changed (e.g. a new page): a plain element update is as small.
+            self.table.props.update(rows=rows, **changed)
+            return
+        with self.table.props.suspend_updates():
+            self.table.props.update(rows=rows, **changed)
+        self._send(patch, changed)
+
+    def _send(self, patch: RowPatch, props: dict[str, Any]) -> None:
+        payload = {
+            "key": self.rows.key,
+            "upserts": patch.upserts,
+            "deleted": patch.deleted,
+            "order": patch.order,
+            "props": props,
+        }
+        self.table.client.run_javascript(_PATCH_JS.format(id=self.table.id, patch=json.dumps(payload)))
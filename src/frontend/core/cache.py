@@ -0,0 +1,79 @@
+"""Small in-memory cache whose entries expire a fixed time after they were stored."""
+
+import logging
+import time
+from collections.abc import Callable
+
+_logger = logging.getLogger(__name__)
+
+
+class TtlCache[K, V]:
+    """Mapping with per-entry expiry and a size bound, counting hits and misses.
+
+    When full, the least recently used entry is evicted to make room.
+
+    Every `log_every` lookups the hit rate is logged, so the benefit of the cache
+    can be judged from the logs. A `ttl` of 0 disables caching.
+    """
+
+    def __init__(
+        self,
+        ttl: float,
+        max_entries: int = 256,
+        name: str = "cache",
+        log_every: int = 100,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.name = name
+        self.log_every = log_every
+        self._clock = clock
+        self._entries: dict[K, tuple[float, V]] = {}
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    @property
+    def hit_rate(self) -> float:
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+    def get(self, key: K) -> V | None:
+        """Return the value if it is stored and not expired, else None."""
+        entry = self._entries.get(key)
+        if entry is not None and entry[0] > self._clock():
+            self.hits += 1
+            value: V | None = entry[1]
+            # Move it to the end: the entries stay in order of last use.
+            self._entries[key] = self._entries.pop(key)
+        else:
+            if entry is not None:
+                del self._entries[key]
+            self.misses += 1
+            value = None
+        if (self.hits + self.misses) % self.log_every == 0:
+            _logger.info(f"{self.name}: hit rate {self.hit_rate:.0%} over {self.hits + self.misses} lookups")
+        return value
+
+    def peek(self, key: K) -> V | None:
+        """Return the value if it is stored and not expired, without counting a lookup or marking it used."""
+        entry = self._entries.get(key)
+        return entry[1] if entry is not None and entry[0] > self._clock() else None
+
+    def put(self, key: K, value: V) -> None:
+        if self.ttl <= 0:
+            return
+        self._entries.pop(key, None)
+        if len(self._entries) >= self.max_entries:
+            # Entries are kept in order of last use, so the first one is the least recently used.
+            del self._entries[next(iter(self._entries))]
+        self._entries[key] = (self._clock() + self.ttl, value)
+
+    def invalidate(self, key: K) -> None:
+        self._entries.pop(key, None)
+
+    def clear(self) -> None:
+        self._entries.clear()
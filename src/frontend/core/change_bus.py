@@ -0,0 +1,68 @@
+"""Coalescing notification bus for account changes.
+
+Changes are collected for a short window and then delivered to every listener as
+one batch: several changes to the same account in the window collapse into the
+newest, and a resync (changes may have been missed) supersedes everything pending.
+A burst of bookings thus costs each tab one update, not one per booking.
+"""
+
+import asyncio
+import logging
+from collections.abc import Callable
+
+from src.frontend.models.nfc import NfcChange
+
+_logger = logging.getLogger(__name__)
+
+# The changes since the last batch, newest per account, or None: reload from scratch.
+type ChangeBatch = list[NfcChange] | None
+type ChangeListener = Callable[[ChangeBatch], None]
+
+
+class ChangeBus:
+    """Collects changes for `window` seconds, then hands each listener one batch."""
+
+    def __init__(self, window: float = 0.1) -> None:
+        self.window = window
+        self._listeners: list[ChangeListener] = []
+        self._pending: dict[str, NfcChange] = {}
+        self._resync = False
+        self._flush_handle: asyncio.TimerHandle | None = None
+
+    def subscribe(self, listener: ChangeListener) -> Callable[[], None]:
+        """Register a listener. Returns a function removing it."""
+        self._listeners.append(listener)
+        return lambda: self._unsubscribe(listener)
+
+    def _unsubscribe(self, listener: ChangeListener) -> None:
+        if listener in self._listeners:
+            self._listeners.remove(listener)
+
+    def publish(self, change: NfcChange | None) -> None:
+        """Queue a change (None: changes were missed) for the next batch. Needs a running event loop."""
+        if change is None:
+            self._resync = True
+            self._pending.clear()
+        elif not self._resync:
+            # Re-insert so the batch is ordered by each account's latest change.
+            self._pending.pop(change.nfc_id, None)
+            self._pending[change.nfc_id] = change
+        if self._flush_handle is None:
+            self._flush_handle = asyncio.get_running_loop().call_later(self.window, self.flush)
+
+    def flush(self) -> None:
+        """Deliver the pending batch now."""
+        if self._flush_handle is not None:
+            self._flush_handle.cancel()
+            self._flush_handle = None
+        batch: ChangeBatch = None if self._resync else list(self._pending.values())
+        self._resync = False
+        self._pending = {}
+        if batch == []:
+            return
+        for listener in list(self._listeners):
+            # A failing listener (e.g. of a closing browser tab) must not starve the others.
+            try:
+                listener(batch)
+            except Exception:
+                _logger.exception("Change listener failed")
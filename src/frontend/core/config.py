@@ -1,7 +1,7 @@
 from dotenv import load_dotenv
 from pydantic_settings import BaseSettings
 
-from src.shared import DEFAULT_API_KEY, DEFAULT_BACKEND_PORT, ENV_PATH
+from src.shared import DEFAULT_API_KEY, DEFAULT_BACKEND_PORT, DEFAULT_OUTBOX_PATH, ENV_PATH
 
 load_dotenv(ENV_PATH)
 
@@ -11,13 +11,41 @@ class Config(BaseSettings):
     api_port: int = DEFAULT_BACKEND_PORT
     api_address: str = "http://localhost"
     mock_nfc: bool = False
+    # Mocked NFC: a random card is tapped this long after a scan starts; its UID read takes the APDU time.
+    mock_nfc_tap_seconds: float = 3.0
+    mock_nfc_apdu_seconds: float = 0.05
     dev_mode: bool = False
     native_mode: bool = False
     full_screen: bool = False
     language: str = "en"
     default_balance: float = 10.0
     nfc_timeout: float = 10.0
+    # Continuous scanning reports the same card again only after this many seconds.
+    nfc_dedupe_seconds: float = 2.0
     can_change_settings: bool = True
+    change_feed: bool = True
+    # Changes within this many seconds reach the tabs as one batch.
+    change_coalesce_seconds: float = 0.1
+    # Keep top-ups and new cards made while the backend is unreachable, send them later.
+    offline_outbox: bool = False
+    outbox_path: str = str(DEFAULT_OUTBOX_PATH)
+    # Backend HTTP client: timeouts, connection pool, retries of GETs, circuit breaker.
+    http_connect_timeout: float = 3.0
+    http_read_timeout: float = 10.0
+    http_max_connections: int = 10
+    http_max_keepalive: int = 5
+    http_keepalive_seconds: float = 30.0
+    http2: bool = False  # needs the 'h2' package (httpx[http2])
+    # Ask for compressed responses (gzip; brotli/zstd too if their packages are installed).
+    http_compression: bool = True
+    http_retries: int = 2
+    breaker_failure_threshold: int = 5
+    breaker_reset_seconds: float = 10.0
+    # Seconds a fetched account is reused after a scan instead of asking the backend (0 disables).
+    account_cache_ttl: float = 10.0
+    # Cards whose newest history chunk is kept (least recently used first out), and for how long.
+    history_cache_size: int = 32
+    history_cache_ttl: float = 60.0
 
     @property
     def api_url(self) -> str:
@@ -1,154 +1,486 @@
 """NFC reader module for the frontend.
 
 Provides stateless NFC scanning with two modes:
-- one_shot: Scans until a card is detected or timeout
-- continuous: Continuously scans and calls a callback for each card
+- one_shot / scan: Waits for a card insertion event or timeout
+- continuous: Calls a callback for each card put on a reader
+
+Every PC/SC reader attached is used, and readers plugged in or out while the
+GUI runs are picked up (or dropped) from reader monitor events. A scan may wait
+on one named reader or on all of them; each read is tagged with its reader
+(`Scan`), so two operators at one station can scan in parallel.
+
+Scanning does not poll: pyscard's `CardMonitor` watches the readers in its own
+thread and reports insertions and removals to one observer, registered for the
+scanner's lifetime (registering one starts or joins pyscard's monitor thread,
+which must not happen on the event loop per scan). It tracks the cards on the
+readers and hands them to waiting coroutines through asyncio futures; a resting
+card whose UID could not be read is not offered again until it is taken off. Reading the UID (a blocking APDU exchange)
+runs on the reader's own thread, so the event loop never waits on a reader and
+readers never wait on each other.
+
+Continuous scanning follows the same observer for the whole session and
+tracks which cards are on the readers, so a card resting on one is read once;
+the same UID read again within `NFC_DEDUPE_SECONDS` (a double tap) is suppressed.
+
+The blocking reader operations sit behind `ReaderBackend`; `PcscBackend` is the
+pyscard one, and tests drive the scanner with a fake backend.
 """
 
 import asyncio
+import contextlib
+import functools
 import logging
 import time
 from collections.abc import Callable
-from threading import Event, Thread
-from typing import ClassVar
-
-try:
-    from smartcard.CardRequest import CardRequest
-    from smartcard.CardType import AnyCardType
-    from smartcard.PassThruCardService import PassThruCardService
-    from smartcard.pcsc.PCSCReader import PCSCReader
-    from smartcard.System import readers
-    from smartcard.util import toHexString
-except (ImportError, ModuleNotFoundError):
-    print("pyscard library is required for NFC functionality. Please install the 'nfc' extra.")
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from threading import Lock
+from typing import Any, ClassVar, Protocol
 
 from src.frontend.core.config import config as cfg
 
 _logger = logging.getLogger(__name__)
 
 
-class USBReader:
-    """Low-level USB NFC reader interface."""
+class Observer(Protocol):
+    """Receives `(added, removed)` cards or readers from a `ReaderBackend`, in the backend's thread."""
+
+    def update(self, observable: Any, handlers: tuple[list[Any], list[Any]]) -> None: ...
+
+
+class ReaderBackend(Protocol):
+    """The reader operations the scanner needs; `PcscBackend` implements them with pyscard.
+
+    Readers are reported as objects whose `str` is the reader name; cards are
+    opaque, hashable objects with a `reader` attribute. Observers are told about
+    the readers or cards present at once when added. `read_uid` blocks and is only
+    called from a reader's own thread, never from the event loop.
+    """
+
+    def add_reader_observer(self, observer: Observer) -> None:
+        """Report readers plugged in and out."""
+
+    def delete_reader_observer(self, observer: Observer) -> None: ...
+
+    def add_observer(self, observer: Observer) -> None:
+        """Report card insertions and removals, on any reader."""
+
+    def delete_observer(self, observer: Observer) -> None: ...
+
+    def read_uid(self, card: Any) -> str | None: ...
+
+
+class PcscBackend:
+    """`ReaderBackend` for the PC/SC readers attached to this machine."""
 
     GET_UID: ClassVar[list[int]] = [0xFF, 0xCA, 0x00, 0x00, 0x00]
 
     def __init__(self) -> None:
-        available: list[PCSCReader] = readers()
-        if not available:
-            _logger.error("No PC/SC reader found")
-            raise RuntimeError("No PC/SC reader found")
-        self.reader_name = available[0]
-
-    def read_card(self, timeout: int = 5) -> str | None:
-        """Read a card UID with timeout in seconds."""
-        card_request = CardRequest(cardType=AnyCardType(), timeout=timeout)
+        # pyscard is imported only when real readers are used, not with mocked NFC or at import.
         try:
-            service = card_request.waitforcard()
-            if not isinstance(service, PassThruCardService):
-                return None
-            conn = service.connection  # type: ignore
-            conn.connect()
-            response, sw1, sw2 = conn.transmit(self.GET_UID)
+            from smartcard.CardMonitoring import CardMonitor
+            from smartcard.ReaderMonitoring import ReaderMonitor
+            from smartcard.util import toHexString
+        except ImportError as exc:
+            raise RuntimeError("pyscard is required for NFC readers, install the 'nfc' extra") from exc
+        self._card_monitor = CardMonitor()
+        self._reader_monitor = ReaderMonitor()
+        self._to_hex = toHexString
+
+    def add_reader_observer(self, observer: Observer) -> None:
+        self._reader_monitor.addObserver(observer)
+
+    def delete_reader_observer(self, observer: Observer) -> None:
+        self._reader_monitor.deleteObserver(observer)
+
+    def add_observer(self, observer: Observer) -> None:
+        self._card_monitor.addObserver(observer)
+
+    def delete_observer(self, observer: Observer) -> None:
+        self._card_monitor.deleteObserver(observer)
+
+    def read_uid(self, card: Any) -> str | None:
+        try:
+            conn = card.createConnection()
+            try:
+                conn.connect()
+                response, sw1, sw2 = conn.transmit(self.GET_UID)
+            finally:
+                conn.disconnect()
         except Exception:
             return None
         if (sw1, sw2) == (0x90, 0x00):
-            return toHexString(response).replace(" ", "")
+            return self._to_hex(response).replace(" ", "")
         return None
 
 
-class NFCScanner:
-    """Singleton NFC scanner for frontend use.
+@dataclass(frozen=True)
+class Scan:
+    """A card UID and the reader it was read on."""
 
-    Provides two scanning modes:
-    - one_shot: Blocking scan until card detected or timeout
-    - continuous: Non-blocking continuous scanning with callback
+    nfc_id: str
+    reader: str
+
+
+class USBReader:
+    """One NFC reader, with a dedicated thread for its blocking calls."""
+
+    def __init__(self, name: str, backend: ReaderBackend) -> None:
+        self.name = name
+        self.backend = backend
+        # One thread per reader: its calls never queue behind other blocking work
+        # (or another reader's APDUs), and never run on the event loop.
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix=f"nfc-{name}")
+
+    async def read_uid(self, card: Any) -> str | None:
+        """Read the UID of a card on this reader, on the reader's thread.
+
+        Cancelling the caller stops the wait at once; an APDU exchange already
+        running finishes in the thread and its result is dropped. Raises
+        RuntimeError if the reader was closed (unplugged) before the read ran.
+        """
+        future = self._executor.submit(self.backend.read_uid, card)
+        try:
+            return await asyncio.wrap_future(future)
+        except asyncio.CancelledError:
+            task = asyncio.current_task()
+            if future.cancelled() and task is not None and not task.cancelling():
+                # Not our caller's cancellation: `close` dropped the queued read.
+                raise RuntimeError(f"Reader {self.name} closed") from None
+            raise
+
+    def submit(self, card: Any, on_read: Callable[[str | None], None]) -> None:
+        """Read the card's UID on the reader's thread and pass it to `on_read` there."""
+        # A reader closed (unplugged) meanwhile has nothing left to report.
+        with contextlib.suppress(RuntimeError):
+            self._executor.submit(lambda: on_read(self.backend.read_uid(card)))
+
+    def close(self) -> None:
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+
+class _ReaderWatch:
+    """Observer keeping the scanner's readers in step with the readers plugged in."""
+
+    def __init__(self, scanner: "NFCScanner") -> None:
+        self._scanner = scanner
+
+    def update(self, observable: Any, handlers: tuple[list[Any], list[Any]]) -> None:
+        added, removed = handlers
+        self._scanner._readers_changed([str(r) for r in added], [str(r) for r in removed])
+
+
+class _CardInsertion:
+    """A waiting scan: resolves an asyncio future with the first card offered on an accepted reader.
+
+    `offer` runs in the backend's thread; the future is resolved on its event loop.
     """
 
-    _instance: ClassVar["NFCScanner | None"] = None
-    _initialized: bool = False
+    def __init__(self, accepts: Callable[[str], bool], loop: asyncio.AbstractEventLoop) -> None:
+        self._accepts = accepts
+        self._loop = loop
+        self.future: asyncio.Future[Any] = loop.create_future()
 
-    def __new__(cls) -> "NFCScanner":
-        if cls._instance is None:
-            cls._instance = object.__new__(cls)
-        return cls._instance
+    def offer(self, cards: list[Any]) -> bool:
+        """Take the first of `cards` on an accepted reader. Returns whether one was taken."""
+        for card in cards:
+            if self._accepts(str(card.reader)):
+                self._loop.call_soon_threadsafe(self._resolve, card)
+                return True
+        return False
+
+    def _resolve(self, card: Any) -> None:
+        if not self.future.done():
+            self.future.set_result(card)
+
+
+class _CardWatch:
+    """Observer of the cards on the readers, registered once for the scanner's lifetime.
+
+    Hands inserted cards to the waiting scans and to the continuous session, and
+    offers a new scan the cards already present, except those whose read failed.
+    Events arrive in the backend's thread; nothing here blocks.
+    """
 
     def __init__(self) -> None:
-        if self._initialized:
+        self._lock = Lock()
+        self._present: set[Any] = set()
+        self._unreadable: set[Any] = set()
+        self._waiting: set[_CardInsertion] = set()
+        self._session: _ContinuousSession | None = None
+
+    def update(self, observable: Any, handlers: tuple[list[Any], list[Any]]) -> None:
+        added, removed = handlers
+        with self._lock:
+            self._present.difference_update(removed)
+            self._unreadable.difference_update(removed)
+            self._present.update(added)
+            for insertion in self._waiting:
+                insertion.offer(added)
+            if self._session is not None:
+                self._session.update(observable, handlers)
+
+    def wait(self, insertion: _CardInsertion) -> bool:
+        """Offer `insertion` the readable cards present, then every new one. Returns whether one was taken."""
+        with self._lock:
+            self._waiting.add(insertion)
+            return insertion.offer([card for card in self._present if card not in self._unreadable])
+
+    def stop_waiting(self, insertion: _CardInsertion) -> None:
+        with self._lock:
+            self._waiting.discard(insertion)
+
+    def mark_unreadable(self, card: Any) -> None:
+        """Skip the card in later scans while it stays on the reader."""
+        with self._lock:
+            if card in self._present:
+                self._unreadable.add(card)
+
+    def follow(self, session: "_ContinuousSession | None") -> None:
+        """Hand card events to `session` (None: to no session), starting with the cards present."""
+        with self._lock:
+            self._session = session
+            if session is not None and self._present:
+                session.update(self, (list(self._present), []))
+
+
+@dataclass
+class ScanStats:
+    """Counters of a continuous scanning session."""
+
+    started_at: float = field(default_factory=time.monotonic)
+    insertions: int = 0
+    failed: int = 0
+    suppressed: int = 0
+    callbacks: int = 0
+
+    def cards_per_second(self, now: float | None = None) -> float:
+        """Cards reported to the callback per second since the session started."""
+        elapsed = (time.monotonic() if now is None else now) - self.started_at
+        return self.callbacks / elapsed if elapsed > 0 else 0.0
+
+    def __str__(self) -> str:
+        return (
+            f"{self.callbacks} cards reported ({self.cards_per_second():.2f}/s), "
+            f"{self.insertions} insertions, {self.suppressed} repeats suppressed, {self.failed} unreadable"
+        )
+
+
+class _ContinuousSession:
+    """Observer reading each card put on a reader once and reporting it as a `Scan`.
+
+    Presence is tracked from insert and remove events, so a card resting on a
+    reader is read once; a UID reported less than `dedupe_seconds` ago is
+    suppressed. Events arrive in the backend's thread, reads run on the reader's.
+    """
+
+    def __init__(
+        self,
+        scanner: "NFCScanner",
+        callback: Callable[[Scan], None],
+        dedupe_seconds: float,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self._scanner = scanner
+        self._callback = callback
+        self._dedupe_seconds = dedupe_seconds
+        self._clock = clock
+        self._present: set[Any] = set()
+        self._reported: dict[str, float] = {}
+        self._lock = Lock()
+        self.active = True
+        self.stats = ScanStats(started_at=clock())
+
+    def update(self, observable: Any, handlers: tuple[list[Any], list[Any]]) -> None:
+        added, removed = handlers
+        with self._lock:
+            self._present.difference_update(removed)
+            inserted = [card for card in added if card not in self._present]
+            self._present.update(inserted)
+        for card in inserted:
+            name = str(card.reader)
+            if (reader := self._scanner.reader(name)) is None:
+                continue
+            self.stats.insertions += 1
+            reader.submit(card, functools.partial(self._on_read, reader=name))
+
+    def _on_read(self, nfc_id: str | None, reader: str) -> None:
+        if not self.active:
+            return
+        if nfc_id is None:
+            self.stats.failed += 1
             return
-        self._initialized = True
-        self._reader: USBReader | None = None
-        self._stop_event = Event()
-        self._scan_thread: Thread | None = None
-        self._init_reader()
-
-    def _init_reader(self) -> None:
-        """Initialize the USB reader, catching errors if no reader available."""
+        now = self._clock()
+        with self._lock:
+            # Forget cards reported long enough ago, so the map stays small.
+            self._reported = {uid: at for uid, at in self._reported.items() if now - at < self._dedupe_seconds}
+            if nfc_id in self._reported:
+                self.stats.suppressed += 1
+                return
+            self._reported[nfc_id] = now
+            self.stats.callbacks += 1
+        try:
+            self._callback(Scan(nfc_id, reader))
+        except Exception:
+            _logger.exception(f"Continuous scan callback failed for {nfc_id}")
+
+
+class NFCScanner:
+    """NFC scanner for frontend use, over every reader attached.
+
+    Provides two scanning modes:
+    - one_shot / scan: Async wait for a card, cancellable, never blocking the event loop
+    - continuous: Callback for each card put on any reader, from that reader's thread
+
+    Without a `backend` the PC/SC readers are used; if pyscard is missing there
+    are none and `is_available` is False. `on_wait` is called (on the event loop)
+    when a scan starts waiting with no card to read yet; the simulated reader
+    uses it to bring a card.
+    """
+
+    def __init__(self, backend: ReaderBackend | None = None, on_wait: Callable[[], None] | None = None) -> None:
+        self._readers: dict[str, USBReader] = {}
+        self._lock = Lock()
+        self._session: _ContinuousSession | None = None
+        self._cards = _CardWatch()
+        self._on_wait = on_wait
+        self._reader_listeners: list[Callable[[list[str]], None]] = []
         try:
-            self._reader = USBReader()
-        except RuntimeError:
-            self._reader = None
+            self.backend: ReaderBackend | None = backend or PcscBackend()
+        except RuntimeError as exc:
+            _logger.warning(f"No NFC readers: {exc}")
+            self.backend = None
+        self._watch = _ReaderWatch(self)
+        if self.backend is not None:
+            self.backend.add_reader_observer(self._watch)
+            self.backend.add_observer(self._cards)
+
+    def _readers_changed(self, added: list[str], removed: list[str]) -> None:
+        changed = False
+        with self._lock:
+            for name in added:
+                if self.backend is not None and name not in self._readers:
+                    self._readers[name] = USBReader(name, self.backend)
+                    changed = True
+                    _logger.info(f"NFC reader connected: {name}")
+            for name in removed:
+                if (reader := self._readers.pop(name, None)) is not None:
+                    reader.close()
+                    changed = True
+                    _logger.info(f"NFC reader disconnected: {name}")
+        if changed:
+            names = self.reader_names
+            for listener in list(self._reader_listeners):
+                try:
+                    listener(names)
+                except Exception:
+                    _logger.exception("Reader listener failed")
+
+    def add_reader_listener(self, listener: Callable[[list[str]], None]) -> Callable[[], None]:
+        """Call `listener` with the reader names whenever a reader is plugged in or out. Returns a function removing it.
+
+        It runs in the backend's thread.
+        """
+        self._reader_listeners.append(listener)
+        return lambda: self._reader_listeners.remove(listener)
+
+    @property
+    def reader_names(self) -> list[str]:
+        """Names of the readers attached now."""
+        with self._lock:
+            return sorted(self._readers)
+
+    def reader(self, name: str) -> USBReader | None:
+        with self._lock:
+            return self._readers.get(name)
 
     def is_available(self) -> bool:
-        """Check if NFC reader is available."""
-        return self._reader is not None
+        """Check if an NFC reader is attached."""
+        return bool(self.reader_names)
+
+    async def scan(self, timeout: float = cfg.nfc_timeout, reader: str | None = None) -> Scan | None:
+        """Wait for a card on `reader` (any reader if None) and return it, or None after `timeout` seconds.
 
-    async def one_shot(self, timeout: float = cfg.nfc_timeout, poll_interval: float = 0.5) -> str | None:
-        """Scan for a single NFC card (blocking) until detected or timeout reached."""
-        if not self._reader:
+        Readers plugged in while waiting count. Cancelling the calling task (e.g.
+        its browser tab closed) stops the scan and withdraws it from the card watch.
+        """
+        backend = self.backend
+        if backend is None:
             return None
 
-        start_time = time.monotonic()
-        while (time.monotonic() - start_time) < timeout:
-            await asyncio.sleep(0.1)
-            nfc_id = self._reader.read_card(timeout=max(1, int(poll_interval)))
+        def accepts(name: str) -> bool:
+            return name == reader if reader is not None else self.reader(name) is not None
+
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + timeout
+        while (remaining := deadline - loop.time()) > 0:
+            insertion = _CardInsertion(accepts, loop)
+            if not self._cards.wait(insertion) and self._on_wait is not None:
+                self._on_wait()
+            try:
+                card = await asyncio.wait_for(insertion.future, remaining)
+            except TimeoutError:
+                return None
+            finally:
+                self._cards.stop_waiting(insertion)
+            name = str(card.reader)
+            usb = self.reader(name)
+            try:
+                nfc_id = await usb.read_uid(card) if usb is not None else None
+            except RuntimeError:
+                nfc_id = None  # its reader was unplugged after the card arrived
             if nfc_id:
-                return nfc_id
+                return Scan(nfc_id, name)
+            # Unreadable (e.g. removed too soon) or its reader unplugged: wait for the next card.
+            self._cards.mark_unreadable(card)
         return None
 
+    async def one_shot(
+        self, timeout: float = cfg.nfc_timeout, poll_interval: float = 0.5, reader: str | None = None
+    ) -> str | None:
+        """Like `scan`, returning only the UID. `poll_interval` is unused; it is kept for `NFCInterface`."""
+        result = await self.scan(timeout, reader)
+        return result.nfc_id if result is not None else None
+
     def start_continuous(
         self,
-        callback: Callable[[str], None],
+        callback: Callable[[Scan], None],
         poll_interval: float = 0.5,
+        dedupe_seconds: float = cfg.nfc_dedupe_seconds,
     ) -> bool:
-        """Start continuous NFC scanning in background thread. Returns True if started."""
-        if not self._reader:
-            return False
-        if self._scan_thread and self._scan_thread.is_alive():
-            return False
+        """Start reporting cards put on any reader to `callback`. Returns True if started.
 
-        self._stop_event.clear()
-        self._scan_thread = Thread(
-            target=self._continuous_scan_loop,
-            args=(callback, poll_interval),
-            daemon=True,
-        )
-        self._scan_thread.start()
+        The callback runs in the reader's thread. `poll_interval` is unused (detection
+        is event-driven); it is kept for compatibility.
+        """
+        if self.backend is None or self._session is not None:
+            return False
+        self._session = _ContinuousSession(self, callback, dedupe_seconds)
+        self._cards.follow(self._session)
         return True
 
-    def _continuous_scan_loop(
-        self,
-        callback: Callable[[str], None],
-        poll_interval: float,
-    ) -> None:
-        """Run the continuous scanning loop."""
-        if not self._reader:
-            return
-        while not self._stop_event.is_set():
-            nfc_id = self._reader.read_card(timeout=max(1, int(poll_interval)))
-            if nfc_id and not self._stop_event.is_set():
-                callback(nfc_id)
-
     def stop_continuous(self) -> None:
-        """Stop continuous scanning."""
-        self._stop_event.set()
-        if self._scan_thread:
-            self._scan_thread.join(timeout=2.0)
-            self._scan_thread = None
+        """Stop continuous scanning and log the session's throughput."""
+        session, self._session = self._session, None
+        if session is None or self.backend is None:
+            return
+        session.active = False
+        self._cards.follow(None)
+        _logger.info(f"Continuous NFC scan stopped: {session.stats}")
 
     def is_scanning(self) -> bool:
         """Check if continuous scanning is active."""
-        return self._scan_thread is not None and self._scan_thread.is_alive()
+        return self._session is not None
 
+    @property
+    def scan_stats(self) -> ScanStats | None:
+        """Counters of the running continuous scan, if any."""
+        return self._session.stats if self._session is not None else None
 
-# Module-level scanner instance
-nfc_scanner = NFCScanner()
+    def close(self) -> None:
+        """Stop scanning, stop watching for readers and release the readers' threads."""
+        self.stop_continuous()
+        if self.backend is not None:
+            self.backend.delete_observer(self._cards)
+            self.backend.delete_reader_observer(self._watch)
+        self._readers_changed([], self.reader_names)
@@ -0,0 +1,124 @@
+"""Durable outbox for operations made while the backend is unreachable.
+
+Top-ups and new cards that could not be sent are stored in a small local SQLite
+file and replayed in order once the backend answers again. Each operation carries
+an idempotency key chosen when it was first attempted, so replaying one that did
+reach the backend (e.g. the response was lost) does not apply it twice. An
+operation the backend rejects moves to a dead-letter table with the backend's
+error, kept until the operator dismisses it.
+"""
+
+import json
+import sqlite3
+import uuid
+from dataclasses import dataclass, field
+from enum import StrEnum
+from pathlib import Path
+from typing import Any
+
+
+class OperationKind(StrEnum):
+    CREATE = "create"
+    TOP_UP = "top_up"
+
+
+@dataclass
+class PendingOperation:
+    kind: OperationKind
+    nfc_id: str
+    payload: dict[str, Any]
+    idempotency_key: str = field(default_factory=lambda: uuid.uuid4().hex)
+    id: int | None = None
+
+
+@dataclass
+class RejectedOperation:
+    operation: PendingOperation
+    error: str
+    rejected_at: str
+
+
+class Outbox:
+    """Append-ordered store of pending and rejected operations. Every change is committed at once."""
+
+    def __init__(self, path: Path) -> None:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        self._connection = sqlite3.connect(path, isolation_level=None, check_same_thread=False)
+        self._connection.execute(
+            "CREATE TABLE IF NOT EXISTS outbox ("
+            "id INTEGER PRIMARY KEY AUTOINCREMENT, kind TEXT NOT NULL, nfc_id TEXT NOT NULL, "
+            "payload TEXT NOT NULL, idempotency_key TEXT NOT NULL UNIQUE)"
+        )
+        # Keeps the outbox id, so an operation is the same row wherever it lives.
+        self._connection.execute(
+            "CREATE TABLE IF NOT EXISTS rejected ("
+            "id INTEGER PRIMARY KEY, kind TEXT NOT NULL, nfc_id TEXT NOT NULL, payload TEXT NOT NULL, "
+            "idempotency_key TEXT NOT NULL, error TEXT NOT NULL, rejected_at TEXT NOT NULL DEFAULT CURRENT_TIMESTAMP)"
+        )
+
+    def __len__(self) -> int:
+        return self._connection.execute("SELECT COUNT(*) FROM outbox").fetchone()[0]
+
+    def add(self, operation: PendingOperation) -> PendingOperation:
+        cursor = self._connection.execute(
+            "INSERT INTO outbox (kind, nfc_id, payload, idempotency_key) VALUES (?, ?, ?, ?)",
+            (operation.kind, operation.nfc_id, json.dumps(operation.payload), operation.idempotency_key),
+        )
+        operation.id = cursor.lastrowid
+        return operation
+
+    def pending(self) -> list[PendingOperation]:
+        """Return the stored operations, oldest first."""
+        rows = self._connection.execute(
+            "SELECT id, kind, nfc_id, payload, idempotency_key FROM outbox ORDER BY id"
+        ).fetchall()
+        return [
+            PendingOperation(OperationKind(kind), nfc_id, json.loads(payload), key, row_id)
+            for row_id, kind, nfc_id, payload, key in rows
+        ]
+
+    def remove(self, operation: PendingOperation) -> None:
+        self._connection.execute("DELETE FROM outbox WHERE id = ?", (operation.id,))
+
+    def reject(self, operation: PendingOperation, error: str) -> None:
+        """Move the operation to the rejected ones, with the backend's error."""
+        self._connection.execute("BEGIN")
+        try:
+            self._connection.execute(
+                "INSERT INTO rejected (id, kind, nfc_id, payload, idempotency_key, error) VALUES (?, ?, ?, ?, ?, ?)",
+                (
+                    operation.id,
+                    operation.kind,
+                    operation.nfc_id,
+                    json.dumps(operation.payload),
+                    operation.idempotency_key,
+                    error,
+                ),
+            )
+            self._connection.execute("DELETE FROM outbox WHERE id = ?", (operation.id,))
+        except BaseException:
+            self._connection.execute("ROLLBACK")
+            raise
+        self._connection.execute("COMMIT")
+
+    def rejected(self) -> list[RejectedOperation]:
+        """Return the rejected operations, oldest first."""
+        rows = self._connection.execute(
+            "SELECT id, kind, nfc_id, payload, idempotency_key, error, rejected_at FROM rejected ORDER BY id"
+        ).fetchall()
+        return [
+            RejectedOperation(
+                PendingOperation(OperationKind(kind), nfc_id, json.loads(payload), key, row_id), error, at
+            )
+            for row_id, kind, nfc_id, payload, key, error, at in rows
+        ]
+
+    def rejected_count(self) -> int:
+        return self._connection.execute("SELECT COUNT(*) FROM rejected").fetchone()[0]
+
+    def dismiss(self, rejected: RejectedOperation) -> None:
+        """Forget a rejected operation, once the operator has dealt with it."""
+        self._connection.execute("DELETE FROM rejected WHERE id = ?", (rejected.operation.id,))
+
+    def close(self) -> None:
+        self._connection.close()
@@ -2,12 +2,13 @@
 
 Every method returns a ``Result`` (``Success`` | ``Err``); ``run_catching`` turns
 any exception (incl. an httpx error body's ``{"detail": ...}``) into a localized
-``Err``. The httpx client is injected, so tests drive this through an
+``Err``; ``Err.transient`` marks failures where the backend was unreachable or
+busy, so retrying the same request later may succeed. The httpx client is injected, so tests drive this through an
 ``httpx.MockTransport`` with no server — the interface is the test surface.
 """
 
 import contextlib
-from collections.abc import Awaitable, Callable
+from collections.abc import AsyncIterator, Awaitable, Callable
 from dataclasses import dataclass
 from functools import wraps
 from typing import Any, TypeGuard
@@ -15,9 +16,11 @@ from typing import Any, TypeGuard
 import httpx
 
 from src.frontend.i18n.translator import translations as t
-from src.frontend.models.nfc import Nfc
+from src.frontend.models.nfc import Nfc, NfcChange, NfcPage
 
 _HTTP_NOT_FOUND = 404
+_HTTP_SERVICE_UNAVAILABLE = 503
+IDEMPOTENCY_HEADER = "Idempotency-Key"
 
 
 @dataclass
@@ -28,6 +31,10 @@ class Success[T]:
 @dataclass
 class Err:
     error: str
+    # The request may be retried later: the backend was unreachable or busy.
+    transient: bool = False
+    # Not sent yet, but stored in the outbox and sent once the backend is back.
+    queued: bool = False
 
 
 type Result[T] = Success[T] | Err
@@ -42,16 +49,18 @@ def run_catching[**P, T](
             return Success(await fn(*args, **kwargs))
         except Exception as exc:
             reason: str = str(exc)
+            transient = isinstance(exc, httpx.TransportError)
             # If this is an HTTP error from httpx, try to surface the
             # server-provided error body (commonly {'detail': '...'}).
             if isinstance(exc, httpx.HTTPStatusError):
+                transient = exc.response.status_code == _HTTP_SERVICE_UNAVAILABLE
                 try:
                     body = exc.response.json()
                     reason = body["detail"] if isinstance(body, dict) and "detail" in body else str(body)
                 except Exception:
                     with contextlib.suppress(Exception):
                         reason = exc.response.text or reason
-            return Err(error=t.request_error.format(reason=str(reason)))
+            return Err(error=t.request_error.format(reason=str(reason)), transient=transient)
 
     return wrapper
 
@@ -64,6 +73,10 @@ def is_err(result: Result[Any]) -> TypeGuard[Err]:
     return isinstance(result, Err)
 
 
+def _idempotency_headers(idempotency_key: str | None) -> dict[str, str]:
+    return {IDEMPOTENCY_HEADER: idempotency_key} if idempotency_key else {}
+
+
 class PaymentApi:
     """Backend client. Pure: no UI listeners, no scanner, no config reads."""
 
@@ -77,6 +90,23 @@ class PaymentApi:
         resp.raise_for_status()
         return [Nfc.model_validate(item) for item in resp.json()]
 
+    @run_catching
+    async def get_nfc_page(
+        self,
+        query: str = "",
+        sort: str = "nfc_id",
+        descending: bool = False,
+        offset: int = 0,
+        limit: int = 50,
+    ) -> NfcPage:
+        """Fetch one page of users whose NFC ID starts with `query`, sorted by `sort`."""
+        resp = await self._client.get(
+            "/users/page",
+            params={"q": query, "sort": sort, "descending": descending, "offset": offset, "limit": limit},
+        )
+        resp.raise_for_status()
+        return NfcPage.model_validate(resp.json())
+
     @run_catching
     async def get_nfc(self, nfc_id: str) -> Nfc | None:
         """Fetch a single user by NFC ID from backend, or return None if 404."""
@@ -87,19 +117,25 @@ class PaymentApi:
         return Nfc.model_validate(resp.json())
 
     @run_catching
-    async def get_nfc_history(self, nfc_id: str) -> list[dict[str, Any]]:
-        """Fetch transaction history for a user by NFC ID."""
-        resp = await self._client.get(f"/users/{nfc_id}/history")
+    async def get_nfc_history(
+        self, nfc_id: str, before: int | None = None, limit: int | None = None
+    ) -> list[dict[str, Any]]:
+        """Fetch transaction history for a user by NFC ID, newest first.
+
+        With `limit`, fetch one chunk; pass the last entry's `id` as `before` for the next.
+        """
+        params = {name: value for name, value in (("before", before), ("limit", limit)) if value is not None}
+        resp = await self._client.get(f"/users/{nfc_id}/history", params=params)
         if resp.status_code == _HTTP_NOT_FOUND:
             raise RuntimeError(t.nfc_card_not_registered.format(nfc_id=nfc_id))
         resp.raise_for_status()
         return resp.json()
 
     @run_catching
-    async def create_nfc(self, nfc_id: str, is_adult: bool, balance: float) -> Nfc:
-        """Create a user via backend."""
+    async def create_nfc(self, nfc_id: str, is_adult: bool, balance: float, idempotency_key: str | None = None) -> Nfc:
+        """Create a user via backend. A retry with the same `idempotency_key` is not applied twice."""
         payload = {"nfc_id": nfc_id, "is_adult": is_adult, "balance": balance}
-        resp = await self._client.post("/users", json=payload)
+        resp = await self._client.post("/users", json=payload, headers=_idempotency_headers(idempotency_key))
         resp.raise_for_status()
         return Nfc.model_validate(resp.json())
 
@@ -120,13 +156,38 @@ class PaymentApi:
         resp.raise_for_status()
 
     @run_catching
-    async def update_balance(self, nfc_id: str, amount: float) -> Nfc:
-        """Top up (or subtract from) a user's balance via backend."""
+    async def update_balance(self, nfc_id: str, amount: float, idempotency_key: str | None = None) -> Nfc:
+        """Top up (or subtract from) a user's balance via backend.
+
+        A retry with the same `idempotency_key` is not applied twice.
+        """
         payload = {"amount": amount}
-        resp = await self._client.post(f"/users/{nfc_id}/balance/top-up", json=payload)
+        resp = await self._client.post(
+            f"/users/{nfc_id}/balance/top-up", json=payload, headers=_idempotency_headers(idempotency_key)
+        )
         resp.raise_for_status()
         return Nfc.model_validate(resp.json())
 
+    async def stream_changes(self, on_connect: Callable[[], None] | None = None) -> AsyncIterator[NfcChange]:
+        """Yield account changes from the backend's Server-Sent Events feed.
+
+        Not wrapped in `run_catching`: this is a long-lived stream, so connection
+        errors propagate and the caller decides when to reconnect. `on_connect`
+        fires once the stream is established.
+        """
+        async with self._client.stream("GET", "/events", timeout=httpx.Timeout(10.0, read=None)) as resp:
+            resp.raise_for_status()
+            if on_connect is not None:
+                on_connect()
+            data: list[str] = []
+            async for line in resp.aiter_lines():
+                if line.startswith("data:"):
+                    data.append(line.removeprefix("data:").strip())
+                elif not line and data:
+                    # A blank line terminates the event; comment lines (": ...") are keep-alives.
+                    yield NfcChange.model_validate_json("\n".join(data))
+                    data = []
+
     async def aclose(self) -> None:
         """Close the underlying HTTP client. Should be called on app shutdown."""
         await self._client.aclose()
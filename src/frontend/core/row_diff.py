@@ -0,0 +1,57 @@
+"""Keyed row snapshots, so a table update carries only the rows that changed.
+
+`KeyedRows` remembers the rows a table shows and diffs fresh rows against them:
+rows that are new or differ are upserts, keys that are gone are deletions, and
+the key order is included only if it changed (an insert always changes it).
+Rows are plain dicts, compared by value, so an unchanged account yields an
+empty (falsy) `RowPatch`.
+"""
+
+from dataclasses import dataclass, field
+from typing import Any
+
+type Row = dict[str, Any]
+
+
+@dataclass
+class RowPatch:
+    upserts: list[Row] = field(default_factory=list)
+    deleted: list[Any] = field(default_factory=list)
+    # The new key order, or None if it did not change.
+    order: list[Any] | None = None
+
+    def __bool__(self) -> bool:
+        return bool(self.upserts or self.deleted or self.order is not None)
+
+
+class KeyedRows:
+    """The rows a table shows, in order, keyed by the `key` field."""
+
+    def __init__(self, key: str) -> None:
+        self.key = key
+        self._rows: dict[Any, Row] = {}
+
+    def __len__(self) -> int:
+        return len(self._rows)
+
+    def __contains__(self, key: object) -> bool:
+        return key in self._rows
+
+    def __getitem__(self, key: Any) -> Row:
+        return self._rows[key]
+
+    @property
+    def rows(self) -> list[Row]:
+        """Copies of the rows, in order, to edit and pass back to `diff`."""
+        return [dict(row) for row in self._rows.values()]
+
+    def diff(self, rows: list[Row]) -> RowPatch:
+        """Return what changed from the snapshot to `rows`, which become the new snapshot."""
+        fresh = {row[self.key]: dict(row) for row in rows}
+        upserts = [row for key, row in fresh.items() if self._rows.get(key) != row]
+        deleted = [key for key in self._rows if key not in fresh]
+        order = list(fresh)
+        # Unchanged if the surviving rows keep their order and nothing was inserted.
+        reordered = [key for key in self._rows if key in fresh] != order
+        self._rows = fresh
+        return RowPatch(upserts=upserts, deleted=deleted, order=order if reordered else None)
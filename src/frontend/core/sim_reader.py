@@ -0,0 +1,173 @@
+"""A simulated PC/SC reader, to run and measure the NFC scanner without hardware.
+
+`SimulatedBackend` is a `ReaderBackend` whose cards arrive when `tap` is called,
+or, with `auto_tap_seconds` set and `auto_tap` passed as the scanner's
+`on_wait`, that many seconds after a scan starts waiting (the GUI's mock mode).
+A tapped card rests on the reader for `hold_seconds` and is then removed;
+reading its UID blocks for `apdu_seconds`, and a card removed before the read
+completes is unreadable, as with a real reader. Events come from timer threads,
+like pyscard's monitors.
+"""
+
+import random
+import threading
+import time
+from collections.abc import Callable, Sequence
+from dataclasses import dataclass
+from typing import Any
+
+from src.frontend.core.nfc import Observer
+
+SIMULATED_READER = "Simulated Reader 0"
+
+
+def random_uid() -> str:
+    """Return a random 4-byte card UID, hex encoded like the reader's."""
+    return "".join(random.choices("0123456789ABCDEF", k=8))
+
+
+@dataclass(frozen=True, eq=False)
+class SimulatedCard:
+    """One tap of a card: tapping the same UID again is a new card, as with pyscard."""
+
+    reader: str
+    uid: str
+    readable: bool = True
+
+
+class SimulatedBackend:
+    """`ReaderBackend` with simulated readers, card arrival and removal, and APDU latency.
+
+    Adding or deleting a card observer blocks for `observer_seconds`, as pyscard
+    starts or joins its monitor thread. `reads` counts the UID reads.
+    """
+
+    def __init__(
+        self,
+        readers: Sequence[str] = (SIMULATED_READER,),
+        apdu_seconds: float = 0.05,
+        hold_seconds: float | None = 0.5,
+        auto_tap_seconds: float | None = None,
+        uids: Callable[[], str] = random_uid,
+        *,
+        observer_seconds: float = 0,
+    ) -> None:
+        self.readers = list(readers)
+        self.apdu_seconds = apdu_seconds
+        self.hold_seconds = hold_seconds
+        self.auto_tap_seconds = auto_tap_seconds
+        self.observer_seconds = observer_seconds
+        self.reads = 0
+        self._uids = uids
+        self._reader_observers: list[Observer] = []
+        self._observers: list[Observer] = []
+        self._cards: list[SimulatedCard] = []
+        self._lock = threading.Lock()
+
+    # --- ReaderBackend -----------------------------------------------
+
+    def add_reader_observer(self, observer: Observer) -> None:
+        with self._lock:
+            self._reader_observers.append(observer)
+            readers = list(self.readers)
+        observer.update(self, (readers, []))
+
+    def delete_reader_observer(self, observer: Observer) -> None:
+        with self._lock:
+            self._reader_observers.remove(observer)
+
+    def add_observer(self, observer: Observer) -> None:
+        time.sleep(self.observer_seconds)
+        with self._lock:
+            self._observers.append(observer)
+            present = list(self._cards)
+        if present:
+            observer.update(self, (present, []))
+
+    def delete_observer(self, observer: Observer) -> None:
+        time.sleep(self.observer_seconds)
+        with self._lock:
+            self._observers.remove(observer)
+
+    def read_uid(self, card: Any) -> str | None:
+        time.sleep(self.apdu_seconds)
+        with self._lock:
+            self.reads += 1
+            return card.uid if card.readable and card in self._cards else None
+
+    # --- Driving the simulation --------------------------------------
+
+    def auto_tap(self) -> None:
+        """Tap a new card after `auto_tap_seconds`, if set (the scanner's `on_wait` hook)."""
+        if self.auto_tap_seconds is not None:
+            _after(self.auto_tap_seconds, lambda: self.tap(self._uids()))
+
+    @property
+    def cards(self) -> list[SimulatedCard]:
+        """The cards on the readers now."""
+        with self._lock:
+            return list(self._cards)
+
+    def tap(self, uid: str, reader: str | None = None, hold_seconds: float | None = None) -> SimulatedCard:
+        """Put a card on `reader` (the first if None) and remove it after `hold_seconds` (default `hold_seconds`)."""
+        card = self.insert(uid, reader)
+        hold = self.hold_seconds if hold_seconds is None else hold_seconds
+        if hold is not None:
+            _after(hold, lambda: self.remove(card))
+        return card
+
+    def insert(self, uid: str, reader: str | None = None, readable: bool = True) -> SimulatedCard:
+        """Put a card on `reader` (the first if None) until `remove` is called.
+
+        The UID of a card that is not `readable` cannot be read, like a card of
+        an unsupported type.
+        """
+        card = SimulatedCard(reader or self.readers[0], uid, readable)
+        with self._lock:
+            self._cards.append(card)
+            observers = list(self._observers)
+        _notify(self, observers, [card], [])
+        return card
+
+    def remove(self, card: SimulatedCard) -> None:
+        with self._lock:
+            if card not in self._cards:
+                return
+            self._cards.remove(card)
+            observers = list(self._observers)
+        _notify(self, observers, [], [card])
+
+    def report_again(self) -> None:
+        """Report the cards on the readers as arriving again, as a monitor may after reconnecting to PC/SC."""
+        with self._lock:
+            cards, observers = list(self._cards), list(self._observers)
+        _notify(self, observers, cards, [])
+
+    def plug(self, reader: str) -> None:
+        """Connect another reader."""
+        with self._lock:
+            self.readers.append(reader)
+            observers = list(self._reader_observers)
+        _notify(self, observers, [reader], [])
+
+    def unplug(self, reader: str) -> None:
+        """Disconnect a reader; the cards on it go with it."""
+        with self._lock:
+            self.readers.remove(reader)
+            gone = [card for card in self._cards if card.reader == reader]
+            self._cards = [card for card in self._cards if card.reader != reader]
+            observers, reader_observers = list(self._observers), list(self._reader_observers)
+        if gone:
+            _notify(self, observers, [], gone)
+        _notify(self, reader_observers, [], [reader])
+
+
+def _after(seconds: float, action: Callable[[], object]) -> None:
+    timer = threading.Timer(seconds, action)
+    timer.daemon = True
+    timer.start()
+
+
+def _notify(backend: SimulatedBackend, observers: list[Observer], added: list[Any], removed: list[Any]) -> None:
+    for observer in observers:
+        observer.update(backend, (added, removed))
@@ -0,0 +1,208 @@
+"""HTTP transport for `PaymentApi`: pooling, timeouts, retries and a circuit breaker.
+
+The layers are plain httpx transports, stacked as
+``RetryTransport(CircuitBreakerTransport(AsyncHTTPTransport))``, so each can be
+tested on its own over an ``httpx.MockTransport``:
+
+* `CircuitBreakerTransport` counts consecutive failures (connection errors and
+  ``502``/``503``/``504``). A ``503`` with ``Retry-After`` is not one: it is the
+  backend's admission control shedding load, so the backend is up. After ``failure_threshold`` of them it fails every
+  request at once with `BackendUnavailable` for ``reset_seconds``, then lets a
+  single trial request through; its outcome closes or re-opens the circuit.
+* `RetryTransport` retries idempotent requests (``GET``/``HEAD``) that failed
+  with such an error, after a jittered exponential backoff, or after the
+  response's ``Retry-After`` delay if it has one (giving up if that is longer
+  than ``max_retry_after_seconds``). It never retries a request the open
+  circuit rejected.
+
+`BackendUnavailable` is an ``httpx.TransportError``, so `run_catching` reports it
+as a transient `Err` like any other unreachable-backend error.
+"""
+
+import asyncio
+import importlib.util
+import logging
+import random
+import time
+from collections.abc import Awaitable, Callable
+
+import httpx
+
+from src.frontend.core.config import Config
+
+_logger = logging.getLogger(__name__)
+
+_RETRYABLE_STATUS = frozenset({502, 503, 504})
+_IDEMPOTENT_METHODS = frozenset({"GET", "HEAD"})
+
+
+class BackendUnavailable(httpx.TransportError):
+    """Raised without sending while the circuit breaker is open."""
+
+
+def _retry_after(response: httpx.Response) -> float | None:
+    """Return the response's ``Retry-After`` delay in seconds, None if it has none (or an HTTP date)."""
+    try:
+        return max(float(response.headers["Retry-After"]), 0.0)
+    except (KeyError, ValueError):
+        return None
+
+
+def _is_failure(response: httpx.Response) -> bool:
+    """Whether the response means the backend is failing, rather than asking to retry later."""
+    if response.status_code == httpx.codes.SERVICE_UNAVAILABLE and _retry_after(response) is not None:
+        return False
+    return response.status_code in _RETRYABLE_STATUS
+
+
+class CircuitBreakerTransport(httpx.AsyncBaseTransport):
+    """Fails fast while the backend keeps failing, instead of waiting on every request."""
+
+    def __init__(
+        self,
+        transport: httpx.AsyncBaseTransport,
+        failure_threshold: int = 5,
+        reset_seconds: float = 10.0,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self._transport = transport
+        self.failure_threshold = failure_threshold
+        self.reset_seconds = reset_seconds
+        self._clock = clock
+        self._failures = 0
+        self._opened_at: float | None = None
+        self._trial_running = False
+
+    @property
+    def is_open(self) -> bool:
+        return self._opened_at is not None
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        trial = self._admit(request)
+        try:
+            response = await self._transport.handle_async_request(request)
+        except httpx.TransportError:
+            self._record(success=False, trial=trial)
+            raise
+        except BaseException:
+            if trial:
+                self._trial_running = False
+            raise
+        self._record(success=not _is_failure(response), trial=trial)
+        return response
+
+    def _admit(self, request: httpx.Request) -> bool:
+        """Let the request through, or raise if the circuit is open. Returns whether it is the trial."""
+        if self._opened_at is None:
+            return False
+        remaining = self._opened_at + self.reset_seconds - self._clock()
+        if remaining > 0 or self._trial_running:
+            raise BackendUnavailable(f"Backend unavailable, next attempt in {max(remaining, 0):.0f}s", request=request)
+        self._trial_running = True
+        return True
+
+    def _record(self, success: bool, trial: bool) -> None:
+        if trial:
+            self._trial_running = False
+        if success:
+            if self._opened_at is not None:
+                _logger.info("Backend reachable again, closing the circuit")
+            self._failures = 0
+            self._opened_at = None
+            return
+        self._failures += 1
+        if trial or self._failures >= self.failure_threshold:
+            if self._opened_at is None:
+                _logger.warning(f"Backend failed {self._failures} times in a row, opening the circuit")
+            self._opened_at = self._clock()
+
+    async def aclose(self) -> None:
+        await self._transport.aclose()
+
+
+class RetryTransport(httpx.AsyncBaseTransport):
+    """Retries idempotent requests after transient failures, with jittered exponential backoff."""
+
+    def __init__(
+        self,
+        transport: httpx.AsyncBaseTransport,
+        retries: int = 2,
+        backoff_seconds: float = 0.2,
+        max_backoff_seconds: float = 2.0,
+        *,
+        max_retry_after_seconds: float = 5.0,
+        sleep: Callable[[float], Awaitable[None]] = asyncio.sleep,
+    ) -> None:
+        self._transport = transport
+        self.retries = retries
+        self.backoff_seconds = backoff_seconds
+        self.max_backoff_seconds = max_backoff_seconds
+        self.max_retry_after_seconds = max_retry_after_seconds
+        self._sleep = sleep
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        if request.method not in _IDEMPOTENT_METHODS:
+            return await self._transport.handle_async_request(request)
+        for attempt in range(self.retries):
+            retry_after = None
+            try:
+                response = await self._transport.handle_async_request(request)
+            except BackendUnavailable:
+                raise
+            except httpx.TransportError as exc:
+                _logger.debug(f"{request.method} {request.url.path} failed ({exc!r}), retrying")
+            else:
+                if response.status_code not in _RETRYABLE_STATUS:
+                    return response
+                retry_after = _retry_after(response)
+                if retry_after is not None and retry_after > self.max_retry_after_seconds:
+                    return response  # a caller waiting that long is better off with the error
+                await response.aclose()
+                _logger.debug(f"{request.method} {request.url.path} returned {response.status_code}, retrying")
+            await self._sleep(self._backoff(attempt) if retry_after is None else retry_after)
+        return await self._transport.handle_async_request(request)
+
+    def _backoff(self, attempt: int) -> float:
+        """Full jitter: uniform in [0, base * 2**attempt], capped, so clients don't retry in lockstep."""
+        return random.uniform(0, min(self.max_backoff_seconds, self.backoff_seconds * 2**attempt))
+
+    async def aclose(self) -> None:
+        await self._transport.aclose()
+
+
+def _http2_available(requested: bool) -> bool:
+    if requested and importlib.util.find_spec("h2") is None:
+        _logger.warning("HTTP/2 requested but the 'h2' package is not installed, using HTTP/1.1")
+        return False
+    return requested
+
+
+def build_transport(config: Config) -> httpx.AsyncBaseTransport:
+    """Stack the pooled connection transport, the circuit breaker and retries from the config."""
+    pooled = httpx.AsyncHTTPTransport(
+        limits=httpx.Limits(
+            max_connections=config.http_max_connections,
+            max_keepalive_connections=config.http_max_keepalive,
+            keepalive_expiry=config.http_keepalive_seconds,
+        ),
+        http2=_http2_available(config.http2),
+    )
+    breaker = CircuitBreakerTransport(pooled, config.breaker_failure_threshold, config.breaker_reset_seconds)
+    return RetryTransport(breaker, retries=config.http_retries)
+
+
+def build_client(config: Config) -> httpx.AsyncClient:
+    """Create the backend HTTP client with explicit timeouts over `build_transport`.
+
+    httpx offers (and decodes) every content encoding it supports, so large
+    responses arrive compressed unless `http_compression` is off.
+    """
+    headers = {"x-api-key": config.api_key}
+    if not config.http_compression:
+        headers["Accept-Encoding"] = "identity"
+    return httpx.AsyncClient(
+        base_url=config.api_url,
+        headers=headers,
+        timeout=httpx.Timeout(config.http_read_timeout, connect=config.http_connect_timeout),
+        transport=build_transport(config),
+    )
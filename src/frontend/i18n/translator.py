@@ -14,6 +14,7 @@ class Translations:
     adult: str
     amount: str
     balance_no_amount_given: str
+    balance_offline: str
     balance_notify_add: str
     balance_update_failed: str
     balance_update: str
@@ -23,6 +24,7 @@ class Translations:
     cancel: str
     child: str
     clear: str
+    close: str
     config_description: str
     config_header: str
     config_invalid_value: str
@@ -57,6 +59,7 @@ class Translations:
     nfc_no_card_scanned: str
     nfc_not_found_detail: str
     nfc_not_found: str
+    nfc_reader: str
     nfc_ready_to_scan: str
     nfc_scan_complete: str
     nfc_scan_hint: str
@@ -65,6 +68,13 @@ class Translations:
     nfc_scanning_progress: str
     nfc_simulate_hint: str
     nfc_timeout: str
+    outbox_dismiss: str
+    outbox_pending: str
+    outbox_queued: str
+    outbox_rejected: str
+    outbox_rejected_create: str
+    outbox_rejected_header: str
+    outbox_rejected_top_up: str
     overwrite_nfc: str
     refresh: str
     request_error: str
@@ -1,8 +1,11 @@
+import functools
 from pathlib import Path
 
-from nicegui import app, ui
+from nicegui import app, context, ui
 
+from src.frontend.components import LazyTabPanels
 from src.frontend.core.config import config as cfg
+from src.frontend.core.outbox import OperationKind, RejectedOperation
 from src.frontend.i18n.translator import translations as t
 from src.frontend.services import NFCService
 from src.frontend.tabs.config_tab import build_config_tab
@@ -15,20 +18,111 @@ from src.frontend.theme import Styles, apply_theme
 static_file_path = Path(__file__).parent / "static"
 
 APP_NAME = "CocktailBerry Payment Manager"
+# Client storage key of the NFC reader a browser client scans on (unset: any reader).
+NFC_READER_KEY = "nfc_reader"
+
+
+@functools.cache
+def shared_service() -> NFCService:
+    """Return the app-wide service: one HTTP pool, scanner, change feed and outbox for all browser clients.
+
+    Created on the first page load, where an event loop is running for `start`.
+    """
+    service = NFCService()
+    service.reader_selector = _client_reader
+    service.start()
+    app.on_shutdown(service.aclose)
+    return service
+
+
+def _client_reader() -> str | None:
+    """Return the reader chosen in the calling browser client, if any."""
+    try:
+        return app.storage.client.get(NFC_READER_KEY)
+    except RuntimeError:  # not called from a client's UI
+        return None
+
+
+def _reader_select(service: NFCService) -> None:
+    """Let this client bind its scans to one reader, for stations with a reader per operator.
+
+    Hidden while at most one reader is attached; follows readers being plugged in or out.
+    """
+    select = ui.select(
+        [],
+        label=t.nfc_reader,
+        clearable=True,
+        on_change=lambda e: app.storage.client.update({NFC_READER_KEY: e.value}),
+    ).classes("min-w-48")
+
+    def show(names: list[str]) -> None:
+        select.set_options(names, value=select.value if select.value in names else None)
+        select.visible = len(names) > 1
+
+    show(service.nfc.reader_names)
+    context.client.on_delete(service.add_reader_listener(show))
+
+
+def _describe(rejected: RejectedOperation) -> str:
+    operation = rejected.operation
+    if operation.kind is OperationKind.CREATE:
+        return t.outbox_rejected_create.format(nfc_id=operation.nfc_id)
+    return t.outbox_rejected_top_up.format(nfc_id=operation.nfc_id, amount=operation.payload["amount"])
+
+
+def _show_rejected(service: NFCService) -> None:
+    """Open a dialog listing the operations the backend rejected, each dismissible."""
+
+    def dismiss(rejected: RejectedOperation, row: ui.row) -> None:
+        service.dismiss_rejected(rejected)
+        row.delete()
+
+    with ui.dialog() as dialog, ui.card().classes("min-w-96"):
+        ui.label(t.outbox_rejected_header).classes(Styles.HEADER)
+        for rejected in service.rejected_operations():
+            with ui.row().classes("w-full items-center justify-between no-wrap") as row:
+                with ui.column().classes("gap-0"):
+                    ui.label(_describe(rejected))
+                    ui.label(f"{rejected.rejected_at}: {rejected.error}").classes("text-sm text-negative")
+                ui.button(t.outbox_dismiss, on_click=functools.partial(dismiss, rejected, row)).props("flat")
+        ui.button(t.close, on_click=dialog.close).classes("self-end")
+    dialog.on("hide", dialog.delete)
+    dialog.open()
+
+
+def _pending_badge(service: NFCService) -> None:
+    """Show how many operations wait in the offline outbox and how many the backend rejected, hidden when none do.
+
+    Clicking the rejected badge lists those operations, so the operator can redo them by hand.
+    """
+    badge = ui.badge(color="warning").classes("text-base px-2")
+    rejected_badge = ui.badge(color="negative").classes("text-base px-2 cursor-pointer")
+    rejected_badge.on("click", lambda: _show_rejected(service))
+
+    def show(pending: int, rejected: int) -> None:
+        badge.text = t.outbox_pending.format(count=pending)
+        badge.visible = pending > 0
+        rejected_badge.text = t.outbox_rejected.format(count=rejected)
+        rejected_badge.visible = rejected > 0
+
+    show(service.pending_count, service.rejected_count)
+    context.client.on_delete(service.add_pending_listener(show))
 
 
 def _ui() -> None:
     # Apply theme before creating any UI elements
     apply_theme()
 
-    service = NFCService()
-    app.on_shutdown(service.aclose)
+    service = shared_service()
     app.add_static_files("/static", static_file_path)
     ui.button.default_classes("rounded-lg")
 
     with ui.header().classes("p-4 bg-surface"), ui.row().classes("items-center justify-center w-full"):
         ui.image("/static/berry.svg").classes("w-10 h-10")
         ui.label(APP_NAME).classes(f"text-3xl {Styles.HEADER}")
+        if service.outbox is not None:
+            _pending_badge(service)
+        _reader_select(service)
 
     with ui.column().classes("w-full max-w-2xl mx-auto mt-4"):
         with ui.tabs().classes("w-full") as tabs:
@@ -39,13 +133,14 @@ def _ui() -> None:
             if cfg.can_change_settings:
                 tab_config = ui.tab(t.tab_config, icon="settings").classes("px-6")
 
-        with ui.tab_panels(tabs, value=tab_topup).classes("w-full px-4 rounded-2xl"):
-            build_topup_tab(tab_topup, service)
-            build_create_tab(tab_create, service)
-            build_history_tab(tab_history, service)
-            build_manage_tab(tab_manage, service)
+        # Tabs are built on first activation: a client doing only top-ups never loads the others.
+        with LazyTabPanels(tabs, value=tab_topup).classes("w-full px-4 rounded-2xl") as panels:
+            panels.add(tab_topup, lambda: build_topup_tab(tab_topup, service))
+            panels.add(tab_create, lambda: build_create_tab(tab_create, service))
+            panels.add(tab_history, lambda: build_history_tab(tab_history, service))
+            panels.add(tab_manage, lambda: build_manage_tab(tab_manage, service))
             if cfg.can_change_settings:
-                build_config_tab(tab_config)
+                panels.add(tab_config, lambda: build_config_tab(tab_config))
 
 
 def start_nicegui() -> None:
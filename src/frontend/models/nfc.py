@@ -1,3 +1,5 @@
+from typing import Any
+
 from pydantic import BaseModel
 
 
@@ -5,3 +7,33 @@ class Nfc(BaseModel):
     nfc_id: str
     is_adult: bool
     balance: float
+    rev: int = 0  # revision of the last change, 0 if unknown
+
+
+class NfcPage(BaseModel):
+    """One page of accounts and the number of accounts matching the search."""
+
+    total: int
+    users: list[Nfc]
+
+
+class NfcChange(BaseModel):
+    """A committed change to one account, from a local mutation or the backend change feed."""
+
+    nfc_id: str
+    rev: int | None = None
+    deleted: bool = False
+    is_adult: bool | None = None
+    balance: float | None = None
+    log: dict[str, Any] | None = None
+
+    @classmethod
+    def from_nfc(cls, nfc: Nfc) -> "NfcChange":
+        return cls(nfc_id=nfc.nfc_id, rev=nfc.rev or None, is_adult=nfc.is_adult, balance=nfc.balance)
+
+    @property
+    def nfc(self) -> Nfc | None:
+        """The account state after the change, or None if it was deleted."""
+        if self.deleted or self.is_adult is None or self.balance is None:
+            return None
+        return Nfc(nfc_id=self.nfc_id, is_adult=self.is_adult, balance=self.balance, rev=self.rev or 0)
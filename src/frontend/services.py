@@ -1,108 +1,406 @@
 import asyncio
-import random
+import contextlib
+import logging
 from collections.abc import Callable
+from pathlib import Path
 from typing import Any, Protocol
 
-import httpx
-
+from src.frontend.core.cache import TtlCache
+from src.frontend.core.change_bus import ChangeBatch, ChangeBus, ChangeListener
 from src.frontend.core.config import config as cfg
 from src.frontend.core.nfc import NFCScanner
-from src.frontend.core.payment_api import PaymentApi, Result, is_err, is_success
-from src.frontend.models.nfc import Nfc
+from src.frontend.core.outbox import OperationKind, Outbox, PendingOperation, RejectedOperation
+from src.frontend.core.payment_api import Err, PaymentApi, Result, Success, is_err, is_success
+from src.frontend.core.sim_reader import SimulatedBackend
+from src.frontend.core.transport import build_client
+from src.frontend.i18n.translator import translations as t
+from src.frontend.models.nfc import Nfc, NfcChange, NfcPage
+
+# Re-exported so tabs keep importing the Result guards (and the change batch type) from here.
+__all__ = ["ChangeBatch", "NFCInterface", "NFCService", "is_err", "is_success"]
+
+_logger = logging.getLogger(__name__)
+
+# Pause between reconnect attempts when the backend change feed drops.
+CHANGE_FEED_RETRY_SECONDS = 5.0
+# Pause between attempts to send the operations waiting in the outbox.
+OUTBOX_RETRY_SECONDS = 5.0
+
+# Newest history entries fetched (and cached) at once; older ones are fetched by cursor.
+HISTORY_CHUNK_SIZE = 50
+
+# A pending listener gets the number of operations waiting in the outbox and of those the backend rejected.
+type PendingListener = Callable[[int, int], None]
+# A reader listener gets the names of the NFC readers attached, after one is plugged in or out.
+type ReaderListener = Callable[[list[str]], None]
+
 
-# Re-exported so tabs keep importing the Result guards from here unchanged.
-__all__ = ["NFCInterface", "NFCService", "is_err", "is_success"]
+def _discard[L](listeners: list[L], listener: L) -> None:
+    with contextlib.suppress(ValueError):
+        listeners.remove(listener)
 
 
-async def mock_nfc_scan() -> str:
-    """Simulate a 3-second NFC scan and return a random card ID."""
-    await asyncio.sleep(3)
-    return "".join(random.choices("0123456789ABCDEF", k=8))
+def _call_listener[*Args](listener: Callable[[*Args], None], *args: *Args) -> None:
+    """Call one listener; a failing listener (e.g. of a closing browser tab) must not starve the others."""
+    try:
+        listener(*args)
+    except Exception:
+        _logger.exception("Listener failed")
 
 
 class NFCInterface(Protocol):
     """Minimal interface for NFC scanners used by the UI."""
 
-    async def one_shot(self, timeout: float = cfg.nfc_timeout, poll_interval: float = 0.5) -> str | None:
-        """Scan for a single NFC card."""
+    @property
+    def reader_names(self) -> list[str]:
+        """Readers a scan can be bound to."""
+
+    async def one_shot(
+        self, timeout: float = cfg.nfc_timeout, poll_interval: float = 0.5, reader: str | None = None
+    ) -> str | None:
+        """Scan for a single NFC card, on `reader` or on any reader if None."""
+
+
+class _ScanHook:
+    """Scanner wrapper that reports every scanned card, whichever tab asked for the scan.
+
+    A scan naming no reader uses the one `default_reader` returns (the browser
+    client's choice, see `NFCService.reader_selector`).
+    """
+
+    def __init__(
+        self,
+        scanner: NFCInterface,
+        on_scan: Callable[[str], None],
+        default_reader: Callable[[], str | None],
+    ) -> None:
+        self._scanner = scanner
+        self._on_scan = on_scan
+        self._default_reader = default_reader
+
+    @property
+    def reader_names(self) -> list[str]:
+        return self._scanner.reader_names
+
+    async def one_shot(
+        self, timeout: float = cfg.nfc_timeout, poll_interval: float = 0.5, reader: str | None = None
+    ) -> str | None:
+        nfc_id = await self._scanner.one_shot(timeout, poll_interval, reader or self._default_reader())
+        if nfc_id:
+            self._on_scan(nfc_id)
+        return nfc_id
 
 
 class NFCService:
     """Facade for the GUI: the backend client, the NFC scanner, and UI change listeners.
 
-    Read calls delegate straight to `PaymentApi`; mutations delegate and then notify
-    listeners on success so other tabs refresh.
+    Read calls delegate straight to `PaymentApi`, except `get_nfc`, which reuses an
+    account fetched or returned by a mutation within `ACCOUNT_CACHE_TTL` seconds,
+    and `get_nfc_history`, which keeps the newest history chunk of the last
+    `HISTORY_CACHE_SIZE` cards. Scanning a card in any tab prefetches that chunk.
+    Mutations delegate and then notify listeners on success so other tabs refresh.
+    Changes made elsewhere (other GUIs, cocktail machines) arrive over the backend
+    change feed once `start` is called; a notified change updates the cached
+    account and evicts its history, and one no newer than the cached account
+    (such as the feed's echo of a change made here) is dropped.
+
+    With the offline outbox enabled, top-ups and new cards that fail because the
+    backend is unreachable are stored and sent later; the call returns an `Err`
+    with `queued` set.
+
+    The GUI shares one instance between all browser clients (`main.shared_service`),
+    so a change made in one browser reaches the listeners of every other one. Each
+    client's UI removes its listeners when it disconnects. With several NFC readers
+    attached, `reader_selector` returns the reader the calling client scans on.
     """
 
     def __init__(self) -> None:
-        client = httpx.AsyncClient(base_url=cfg.api_url, headers={"x-api-key": cfg.api_key})
-        self.api = PaymentApi(client)
-        self._listeners: list[Callable[[], None]] = []
+        self.api = PaymentApi(build_client(cfg))
+        self._changes = ChangeBus(cfg.change_coalesce_seconds)
+        self._feed_task: asyncio.Task | None = None
+        self.outbox = Outbox(Path(cfg.outbox_path)) if cfg.offline_outbox else None
+        self._pending_listeners: list[PendingListener] = []
+        self._reader_listeners: list[ReaderListener] = []
+        self._unsubscribe_readers: Callable[[], None] | None = None
+        self._outbox_task: asyncio.Task | None = None
+        self._flush_lock = asyncio.Lock()
+        self._accounts = TtlCache[str, Nfc](cfg.account_cache_ttl, name="Account cache")
+        self._histories = TtlCache[str, list[dict[str, Any]]](
+            cfg.history_cache_ttl, cfg.history_cache_size, name="History cache"
+        )
+        # Running fetches of a card's newest history chunk, shared by prefetch and readers.
+        self._history_fetches: dict[str, asyncio.Task[Result[list[dict[str, Any]]]]] = {}
         self.mock_nfc_enabled = cfg.mock_nfc
-        self.nfc: NFCInterface = self._create_nfc_interface()
+        # Reader of the client calling a scan, None for any; set by the GUI.
+        self.reader_selector: Callable[[], str | None] = lambda: None
+        self._scanner = self._create_nfc_interface()
+        self.nfc: NFCInterface = _ScanHook(self._scanner, self.prefetch_history, self._selected_reader)
+
+    def start(self) -> None:
+        """Follow the change feed and send queued operations, if enabled, and relay reader hot-plugs.
+
+        Needs a running event loop.
+        """
+        if self._unsubscribe_readers is None:
+            loop = asyncio.get_running_loop()
+
+            def relay(names: list[str]) -> None:  # in the reader monitor's thread
+                loop.call_soon_threadsafe(self._notify_readers, names)
+
+            self._unsubscribe_readers = self._scanner.add_reader_listener(relay)
+        if cfg.change_feed and self._feed_task is None:
+            self._feed_task = asyncio.create_task(self._follow_changes())
+        if self.outbox is not None and self._outbox_task is None:
+            self._outbox_task = asyncio.create_task(self._replay_outbox())
+
+    @property
+    def pending_count(self) -> int:
+        """Number of operations waiting in the outbox to be sent."""
+        return len(self.outbox) if self.outbox is not None else 0
+
+    @property
+    def rejected_count(self) -> int:
+        """Number of queued operations the backend rejected, kept until dismissed."""
+        return self.outbox.rejected_count() if self.outbox is not None else 0
+
+    def rejected_operations(self) -> list[RejectedOperation]:
+        """Return the queued operations the backend rejected, oldest first."""
+        return self.outbox.rejected() if self.outbox is not None else []
+
+    def dismiss_rejected(self, rejected: RejectedOperation) -> None:
+        """Forget a rejected operation the operator has dealt with."""
+        if self.outbox is not None:
+            self.outbox.dismiss(rejected)
+            self._notify_pending()
 
     # --- State access (straight delegation) --------------------------
 
     async def get_all_nfc(self) -> Result[list[Nfc]]:
         return await self.api.get_all_nfc()
 
+    async def get_nfc_page(
+        self, query: str = "", sort: str = "nfc_id", descending: bool = False, offset: int = 0, limit: int = 50
+    ) -> Result[NfcPage]:
+        return await self.api.get_nfc_page(query, sort, descending, offset, limit)
+
     async def get_nfc(self, nfc_id: str) -> Result[Nfc | None]:
-        return await self.api.get_nfc(nfc_id)
+        """Return the account, from the cache if it was fetched or changed within the TTL."""
+        if (cached := self._accounts.get(nfc_id)) is not None:
+            return Success(cached)
+        result = await self.api.get_nfc(nfc_id)
+        if is_success(result) and result.data is not None:
+            self._accounts.put(nfc_id, result.data)
+        return result
 
-    async def get_nfc_history(self, nfc_id: str) -> Result[list[dict[str, Any]]]:
-        return await self.api.get_nfc_history(nfc_id)
+    async def get_nfc_history(
+        self, nfc_id: str, before: int | None = None, limit: int | None = None
+    ) -> Result[list[dict[str, Any]]]:
+        """Return a chunk of the card's history; the newest chunk comes from the cache or a running prefetch."""
+        if before is not None or limit != HISTORY_CHUNK_SIZE:
+            return await self.api.get_nfc_history(nfc_id, before, limit)
+        if (cached := self._histories.get(nfc_id)) is not None:
+            return Success(cached)
+        task = self._history_fetches.get(nfc_id) or self._fetch_history(nfc_id)
+        # Shielded: a reader giving up (e.g. its tab closed) must not cancel the shared fetch.
+        return await asyncio.shield(task)
+
+    def prefetch_history(self, nfc_id: str) -> None:
+        """Start fetching the card's newest history chunk, unless it is cached or on its way."""
+        if nfc_id not in self._history_fetches and self._histories.get(nfc_id) is None:
+            self._fetch_history(nfc_id)
+
+    def _fetch_history(self, nfc_id: str) -> asyncio.Task[Result[list[dict[str, Any]]]]:
+        async def fetch() -> Result[list[dict[str, Any]]]:
+            result = await self.api.get_nfc_history(nfc_id, limit=HISTORY_CHUNK_SIZE)
+            # Cache it only if no change to the card invalidated the fetch meanwhile.
+            if self._history_fetches.get(nfc_id) is task:
+                del self._history_fetches[nfc_id]
+                if is_success(result):
+                    self._histories.put(nfc_id, result.data)
+            return result
+
+        task = asyncio.create_task(fetch())
+        self._history_fetches[nfc_id] = task
+        return task
 
     # --- Mutations (delegate, then notify on success) ----------------
 
     async def create_nfc(self, nfc_id: str, is_adult: bool, balance: float) -> Result[Nfc]:
-        result = await self.api.create_nfc(nfc_id, is_adult, balance)
-        if is_success(result):
-            self._notify()
-        return result
+        payload = {"is_adult": is_adult, "balance": balance}
+        return await self._submit(PendingOperation(OperationKind.CREATE, nfc_id, payload))
 
     async def update_nfc(self, nfc_id: str, is_adult: bool, balance: float) -> Result[Nfc]:
         result = await self.api.update_nfc(nfc_id, is_adult, balance)
         if is_success(result):
-            self._notify()
+            self._updated(result.data)
         return result
 
     async def delete_nfc(self, nfc_id: str) -> Result[None]:
         result = await self.api.delete_nfc(nfc_id)
         if is_success(result):
-            self._notify()
+            self._notify(NfcChange(nfc_id=nfc_id, deleted=True))
         return result
 
     async def update_balance(self, nfc_id: str, amount: float) -> Result[Nfc]:
-        result = await self.api.update_balance(nfc_id, amount)
-        if is_success(result):
-            self._notify()
-        return result
+        return await self._submit(PendingOperation(OperationKind.TOP_UP, nfc_id, {"amount": amount}))
 
     async def aclose(self) -> None:
-        """Close the underlying HTTP client. Should be called on app shutdown."""
+        """Stop the background tasks, release the readers and close the HTTP client. Call on app shutdown."""
+        for task in (self._feed_task, self._outbox_task):
+            if task is not None:
+                task.cancel()
+        self._feed_task = self._outbox_task = None
+        if self.outbox is not None:
+            self.outbox.close()
+        if self._unsubscribe_readers is not None:
+            self._unsubscribe_readers()
+            self._unsubscribe_readers = None
+        self._scanner.close()
         await self.api.aclose()
 
+    # --- Offline outbox ----------------------------------------------
+
+    async def _send(self, operation: PendingOperation) -> Result[Nfc]:
+        key = operation.idempotency_key
+        if operation.kind is OperationKind.CREATE:
+            is_adult, balance = operation.payload["is_adult"], operation.payload["balance"]
+            return await self.api.create_nfc(operation.nfc_id, is_adult, balance, idempotency_key=key)
+        return await self.api.update_balance(operation.nfc_id, operation.payload["amount"], idempotency_key=key)
+
+    async def _submit(self, operation: PendingOperation) -> Result[Nfc]:
+        """Send a mutation, or queue it if the outbox is on and the backend is unreachable."""
+        if self.outbox is None:
+            result = await self._send(operation)
+        elif self.pending_count:
+            # Keep the order: a top-up must not overtake the queued creation of its card.
+            return self._enqueue(self.outbox, operation)
+        else:
+            result = await self._send(operation)
+            if is_err(result) and result.transient:
+                return self._enqueue(self.outbox, operation)
+        if is_success(result):
+            self._updated(result.data)
+        return result
+
+    def _enqueue(self, outbox: Outbox, operation: PendingOperation) -> Err:
+        outbox.add(operation)
+        self._notify_pending()
+        return Err(error=t.outbox_queued, transient=True, queued=True)
+
+    async def flush_outbox(self) -> None:
+        """Send the queued operations in order, stopping at the first that still cannot be sent.
+
+        An operation the backend rejects (e.g. the card was deleted meanwhile) is
+        not retried, it would never succeed: it moves to the outbox's rejected
+        operations, which the GUI shows until the operator dismisses them.
+        """
+        if self.outbox is None:
+            return
+        async with self._flush_lock:
+            for operation in self.outbox.pending():
+                result = await self._send(operation)
+                if is_err(result) and result.transient:
+                    return
+                if is_success(result):
+                    self.outbox.remove(operation)
+                    self._updated(result.data)
+                elif is_err(result):
+                    self.outbox.reject(operation, result.error)
+                    _logger.error(f"Rejected queued {operation.kind} for NFC ID {operation.nfc_id}: {result.error}")
+                self._notify_pending()
+
+    async def _replay_outbox(self) -> None:
+        while True:
+            try:
+                await self.flush_outbox()
+            except Exception:
+                _logger.exception("Sending queued operations failed")
+            await asyncio.sleep(OUTBOX_RETRY_SECONDS)
+
     # --- Listener management -----------------------------------------
 
-    def add_listener(self, listener: Callable[[], None]) -> None:
-        """Register a callback that is called whenever users change."""
-        self._listeners.append(listener)
+    def add_listener(self, listener: ChangeListener) -> Callable[[], None]:
+        """Register a callback for batches of user changes (see `ChangeBus`). Returns a function removing it."""
+        return self._changes.subscribe(listener)
 
-    def _notify(self) -> None:
-        for listener in list(self._listeners):
-            listener()
+    def add_pending_listener(self, listener: PendingListener) -> Callable[[], None]:
+        """Register a callback for changes of the queued and rejected counts. Returns a function removing it."""
+        self._pending_listeners.append(listener)
+        return lambda: _discard(self._pending_listeners, listener)
 
-    # --- NFC selection -----------------------------------------------
+    def add_reader_listener(self, listener: ReaderListener) -> Callable[[], None]:
+        """Register a callback, run on the event loop, for readers plugged in or out. Returns a function removing it."""
+        self._reader_listeners.append(listener)
+        return lambda: _discard(self._reader_listeners, listener)
+
+    def _notify_readers(self, names: list[str]) -> None:
+        for listener in list(self._reader_listeners):
+            _call_listener(listener, names)
+
+    def _updated(self, nfc: Nfc) -> None:
+        """Announce a successful mutation, caching the account state it returned."""
+        self._notify(NfcChange.from_nfc(nfc))
+
+    def _notify(self, change: NfcChange | None) -> None:
+        """Apply a change to the caches and announce it, unless the cached account is already as new.
 
-    def _create_nfc_interface(self) -> NFCInterface:
-        """Return the configured NFC interface (real or mocked)."""
+        The account state a change carries replaces the cached one; the history is
+        stale either way. None means changes may have been missed: drop everything.
+        """
+        if change is None:
+            self._accounts.clear()
+            self._histories.clear()
+            self._history_fetches.clear()
+        else:
+            cached = self._accounts.peek(change.nfc_id)
+            if cached is not None and change.rev is not None and change.rev <= cached.rev:
+                return  # already applied, e.g. the feed's echo of a change made in this GUI
+            if (nfc := change.nfc) is not None:
+                self._accounts.put(change.nfc_id, nfc)
+            else:
+                self._accounts.invalidate(change.nfc_id)
+            self._histories.invalidate(change.nfc_id)
+            self._history_fetches.pop(change.nfc_id, None)
+        self._changes.publish(change)
 
-        class MockNFC:
-            """Lightweight wrapper to present the same interface as NFCScanner."""
+    def _notify_pending(self) -> None:
+        pending, rejected = self.pending_count, self.rejected_count
+        for listener in list(self._pending_listeners):
+            _call_listener(listener, pending, rejected)
+
+    async def _follow_changes(self) -> None:
+        """Relay backend change-feed events to the listeners, reconnecting when the stream drops.
+
+        Changes made in this GUI are already notified locally; their feed echo is
+        dropped by `_notify`, as the cached account already has its revision.
+        """
+        resync = False
+
+        def on_connect() -> None:
+            # Events may have been missed while disconnected: have listeners reload.
+            if resync:
+                self._notify(None)
+
+        while True:
+            try:
+                async for change in self.api.stream_changes(on_connect=on_connect):
+                    self._notify(change)
+            except Exception as exc:
+                _logger.debug(f"Change feed disconnected: {exc!r}")
+            resync = True
+            await asyncio.sleep(CHANGE_FEED_RETRY_SECONDS)
+
+    # --- NFC selection -----------------------------------------------
 
-            async def one_shot(self, timeout: float = 10.0, poll_interval: float = 0.5) -> str | None:
-                return await mock_nfc_scan()
+    def _selected_reader(self) -> str | None:
+        return self.reader_selector()
 
+    def _create_nfc_interface(self) -> NFCScanner:
+        """Return the scanner over the PC/SC readers, or over a simulated reader if NFC is mocked."""
         if self.mock_nfc_enabled:
-            return MockNFC()
+            # A random card arrives a while after each scan starts, read through the real scan path.
+            backend = SimulatedBackend(
+                apdu_seconds=cfg.mock_nfc_apdu_seconds, auto_tap_seconds=cfg.mock_nfc_tap_seconds
+            )
+            return NFCScanner(backend, on_wait=backend.auto_tap)
         return NFCScanner()
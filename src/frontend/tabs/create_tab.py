@@ -91,6 +91,12 @@ class CreateTab:
             is_adult=self.checkbox_adult.value,
             balance=self.amount_selector.value,
         )
+        if is_err(result) and result.queued:
+            ui.notify(result.error, type="warning", position="top-right")
+            self.reset_ui()
+            self.nfc_scanner.set_status(result.error)
+            return
+
         if is_err(result):
             self.nfc_scanner.set_status(result.error)
             ui.notify(result.error, type="negative", position="top-right")
@@ -2,12 +2,12 @@ import asyncio
 from collections.abc import Coroutine
 from typing import Any
 
-from nicegui import context, ui
+from nicegui import context, events, ui
 from nicegui.elements.tabs import Tab
 
-from src.frontend.components import NfcSearchBar
+from src.frontend.components import NfcSearchBar, TablePatcher
 from src.frontend.i18n.translator import translations as t
-from src.frontend.services import NFCService, is_err, is_success
+from src.frontend.services import HISTORY_CHUNK_SIZE, ChangeBatch, NFCService, is_err, is_success
 from src.frontend.theme import Styles
 
 TABLE_COLUMNS: list[dict[str, Any]] = [
@@ -39,7 +39,6 @@ BALANCE_SLOT = """
 </q-td>
 """
 
-PAGE_SIZE = 10
 # NFC UIDs are at least 8 hex chars (4-byte cards); don't fetch on shorter, partial input.
 MIN_NFC_LEN = 8
 SEARCH_DEBOUNCE_MS = 400
@@ -51,6 +50,10 @@ class HistoryTab:
     def __init__(self, service: NFCService, tab: Tab) -> None:
         self.service = service
         self._background_tasks: set[asyncio.Task] = set()
+        # Card shown, and the id of its oldest loaded entry (None once the history is exhausted).
+        self._nfc_id: str | None = None
+        self._cursor: int | None = None
+        self._loading_more = False
 
         with ui.tab_panel(tab):
             # Captured here (a valid UI context) so background tasks can re-enter the
@@ -65,18 +68,25 @@ class HistoryTab:
                 debounce_ms=SEARCH_DEBOUNCE_MS,
             )
 
+            # Virtual scroll: the browser renders only the rows in view, and the rows are
+            # fetched in chunks as the end comes into view.
             self.table = (
                 ui.table(
                     columns=TABLE_COLUMNS,
                     rows=[],
-                    row_key="nfc_id",
-                    pagination=PAGE_SIZE,
+                    row_key="id",
+                    pagination=0,
                 )
                 .classes("w-full mb-4")
-                .props("flat bordered")
+                .style("height: 60vh")
+                .props("flat bordered virtual-scroll hide-bottom")
             )
             self.table.add_slot("body-cell-amount", AMOUNT_SLOT)
             self.table.add_slot("body-cell-current_balance", BALANCE_SLOT)
+            self.table.on("virtual-scroll", self._on_scroll, args=["to"])
+            self.patcher = TablePatcher(self.table, key="id")
+
+        context.client.on_delete(self.service.add_listener(self._on_change))
 
     def _add_task(self, coro: Coroutine) -> None:
         """Run a background task inside the UI slot, holding a reference so it isn't GC'd."""
@@ -93,25 +103,64 @@ class HistoryTab:
         """Schedule the async history fetch (on_change is synchronous)."""
         self._add_task(self._load_history(value))
 
+    def _on_change(self, batch: ChangeBatch) -> None:
+        """Reload the shown history from the newest entry when its card changes, or changes were missed."""
+        if self._nfc_id is None:
+            return
+        shown = self._nfc_id.upper()
+        if batch is None or any(change.nfc_id == shown for change in batch):
+            self._add_task(self._load_history(self.search.value))
+
+    def _on_scroll(self, e: events.GenericEventArguments) -> None:
+        """Fetch the next chunk once the last loaded entry is rendered."""
+        if self._cursor is None or self._loading_more or e.args["to"] < len(self.patcher.rows) - 1:
+            return
+        self._loading_more = True
+        self._add_task(self._load_more())
+
     async def _load_history(self, value: str) -> None:
-        """Fetch and show history for a full-length NFC ID; shorter input clears the table."""
+        """Fetch and show the newest entries for a full-length NFC ID; shorter input clears the table."""
         nfc_id = value.strip()
+        self._nfc_id, self._cursor = None, None
         if len(nfc_id) < MIN_NFC_LEN:
-            self.table.rows = []
+            self.patcher.show([])
             return
 
-        result = await self.service.get_nfc_history(nfc_id)
+        result = await self.service.get_nfc_history(nfc_id, limit=HISTORY_CHUNK_SIZE)
 
         # Discard a stale response if the input changed while the fetch was in flight.
         if nfc_id != self.search.value:
             return
 
         if is_success(result):
-            self.table.rows = result.data
+            self._nfc_id = nfc_id
+            self._show([], result.data)
         elif is_err(result):
-            self.table.rows = []
+            self.patcher.show([])
             ui.notify(str(result.error), type="negative", position="top-right")
 
+    async def _load_more(self) -> None:
+        """Append the next chunk of older entries."""
+        nfc_id, cursor = self._nfc_id, self._cursor
+        try:
+            result = await self.service.get_nfc_history(nfc_id or "", before=cursor, limit=HISTORY_CHUNK_SIZE)
+        finally:
+            self._loading_more = False
+
+        # Another card was searched meanwhile.
+        if (nfc_id, cursor) != (self._nfc_id, self._cursor):
+            return
+
+        if is_success(result):
+            self._show(self.patcher.rows.rows, result.data)
+        elif is_err(result):
+            ui.notify(str(result.error), type="negative", position="top-right")
+
+    def _show(self, loaded: list[dict[str, Any]], chunk: list[dict[str, Any]]) -> None:
+        """Show `chunk` after the `loaded` entries; a short chunk means the history is exhausted."""
+        self._cursor = chunk[-1]["id"] if len(chunk) == HISTORY_CHUNK_SIZE else None
+        self.patcher.show(loaded + chunk)
+
 
 def build_history_tab(tab: Tab, service: NFCService) -> HistoryTab:
     return HistoryTab(service, tab)
@@ -5,9 +5,10 @@ from typing import Any
 from nicegui import context, events, ui
 from nicegui.elements.tabs import Tab
 
-from src.frontend.components import NfcSearchBar
+from src.frontend.components import NfcSearchBar, TablePatcher
 from src.frontend.i18n.translator import translations as t
-from src.frontend.services import NFCService, is_err, is_success
+from src.frontend.models.nfc import NfcChange
+from src.frontend.services import ChangeBatch, NFCService, is_err, is_success
 
 # Table column definitions
 TABLE_COLUMNS: list[dict[str, Any]] = [
@@ -60,19 +61,33 @@ ACTION_SLOT = f"""
 """
 
 PAGE_SIZE = 10
+# Search typing waits this long for a pause before asking the backend for a page.
+SEARCH_DEBOUNCE_MS = 300
 
 
 class ManageTab:
-    """Manage tab: shows list of users with delete buttons using a paginated table."""
+    """Manage tab: shows list of users with delete buttons using a paginated table.
+
+    Pages load while the tab is shown; changes arriving while it is hidden only
+    mark the page stale, and it reloads when shown again.
+    """
 
     def __init__(self, service: NFCService, tab: Tab) -> None:
         self.service = service
+        self.active = False
+        # Nothing is loaded until the tab is first shown.
+        self._stale = True
 
         with ui.tab_panel(tab):
             # Captured here (a valid UI context) so background tasks can re-enter the
             # slot — asyncio tasks get an empty slot stack, which breaks ui.* calls.
             self._slot = context.slot
-            self.search = NfcSearchBar(hint=t.mange_filter_hint, on_scan=self.service.nfc.one_shot)
+            self.search = NfcSearchBar(
+                hint=t.mange_filter_hint,
+                on_scan=self.service.nfc.one_shot,
+                on_change=self._on_search,
+                debounce_ms=SEARCH_DEBOUNCE_MS,
+            )
 
             with ui.row().classes("items-center w-full mb-2"):
                 self.refresh_button = (
@@ -81,12 +96,20 @@ class ManageTab:
                     .on_click(self._on_refresh_click)
                 )
 
+            # Server-side mode: with `rowsNumber` set, Quasar neither pages nor sorts
+            # the rows itself but emits `request`, and only the visible page is loaded.
             self.table = (
                 ui.table(
                     columns=TABLE_COLUMNS,
                     rows=[],
                     row_key="nfc_id",
-                    pagination=PAGE_SIZE,
+                    pagination={
+                        "page": 1,
+                        "rowsPerPage": PAGE_SIZE,
+                        "sortBy": "nfc_id",
+                        "descending": False,
+                        "rowsNumber": 0,
+                    },
                 )
                 .classes("w-full mb-4")
                 .props("flat bordered")
@@ -98,15 +121,19 @@ class ManageTab:
             self.table.add_slot("body-cell-action", ACTION_SLOT)
 
             self.table.on("delete", self._on_delete)
+            self.table.on("request", self._on_request)
+            self.patcher = TablePatcher(self.table, key="nfc_id")
 
-        # Client-side filter: bind the search box (incl. scanned ids) to the table's built-in filter.
-        self.search.input.bind_value_to(self.table, "filter")
-
-        # Register for changes and do initial render (schedule async refresh)
+        # Register for changes; the first page loads when the tab is shown
         self._background_tasks: set[asyncio.Task] = set()
-        self.service.add_listener(lambda: self._add_task(self.refresh()))
-        # Schedule the initial refresh after the event loop is running
-        ui.timer(0, lambda: self._add_task(self.refresh(notify=False)), once=True)
+        context.client.on_delete(self.service.add_listener(self._on_change))
+
+    def set_active(self, active: bool) -> None:
+        """Load the page if it went stale while the tab was hidden (see `PausableTab`)."""
+        self.active = active
+        if active and self._stale:
+            self._stale = False
+            self._add_task(self.refresh(notify=False))
 
     def _add_task(self, coro: Coroutine) -> None:
         """Run a background task inside the UI slot, holding a reference to prevent GC."""
@@ -119,6 +146,43 @@ class ManageTab:
         self._background_tasks.add(task)
         task.add_done_callback(self._background_tasks.discard)
 
+    def _on_change(self, batch: ChangeBatch) -> None:
+        """Patch visible rows in place; reload the page if the changes may move rows between pages."""
+        if not self.active:
+            self._stale = True
+        elif batch is None or not self._patch(batch):
+            self._add_task(self.refresh(notify=False))
+
+    def _patch(self, batch: list[NfcChange]) -> bool:
+        """Replace the rows of updated, visible accounts. False if the page itself must be reloaded.
+
+        A creation, a deletion, or a change of the sort column can shift rows across page
+        boundaries and change the total, which only the backend can resolve.
+        """
+        sort_by = self.table.pagination.get("sortBy") or "nfc_id"
+        visible = self.patcher.rows
+        updates = {}
+        for change in batch:
+            nfc = change.nfc
+            if change.nfc_id not in visible or nfc is None:
+                return False
+            data = nfc.model_dump()
+            if data[sort_by] != visible[change.nfc_id][sort_by]:
+                return False
+            updates[nfc.nfc_id] = data
+        # The patcher sends only the rows that actually differ (none for a no-op change).
+        with self._slot:
+            self.patcher.show([updates.get(row["nfc_id"], row) for row in visible.rows])
+        return True
+
+    async def _on_request(self, e: events.GenericEventArguments) -> None:
+        """Load the page, page size or sort order the user picked in the table."""
+        await self.load_page(e.args["pagination"])
+
+    def _on_search(self, _: str) -> None:
+        """Start over on the first page of the matching accounts."""
+        self._add_task(self.load_page({**self.table.pagination, "page": 1}))
+
     async def _on_refresh_click(self) -> None:
         """Handle refresh button click."""
         self.refresh_button.disable()
@@ -154,16 +218,35 @@ class ManageTab:
         )
 
     async def refresh(self, notify: bool = True) -> None:
-        """Update table rows from the store (async)."""
-        result = await self.service.get_all_nfc()
+        """Reload the page currently shown."""
+        await self.load_page(self.table.pagination, notify=notify)
+
+    async def load_page(self, pagination: dict[str, Any], notify: bool = True) -> None:
+        """Fetch one page of the accounts matching the search box and show it with its pagination."""
+        rows_per_page = pagination.get("rowsPerPage") or PAGE_SIZE
+        page = max(pagination.get("page") or 1, 1)
+        result = await self.service.get_nfc_page(
+            query=self.search.value,
+            sort=pagination.get("sortBy") or "nfc_id",
+            descending=bool(pagination.get("descending")),
+            offset=(page - 1) * rows_per_page,
+            limit=rows_per_page,
+        )
         if is_err(result):
             if notify:
                 ui.notify(result.error, type="negative", position="top-right")
             return
         if is_success(result):
-            users = result.data
-            rows = [data.model_dump() for data in sorted(users, key=lambda x: x.nfc_id)]
-            self.table.update_rows(rows)
+            data = result.data
+            # A deletion may have emptied the last page: step back to the new last one.
+            last_page = max(-(-data.total // rows_per_page), 1)
+            if page > last_page:
+                await self.load_page({**pagination, "page": last_page}, notify=notify)
+                return
+            self.patcher.show(
+                [nfc.model_dump() for nfc in data.users],
+                pagination={**pagination, "page": page, "rowsPerPage": rows_per_page, "rowsNumber": data.total},
+            )
 
 
 def build_manage_tab(tab: Tab, service: NFCService) -> ManageTab:
@@ -3,14 +3,14 @@
 import asyncio
 import random
 
-from nicegui import ui
+from nicegui import context, ui
 from nicegui.elements.tabs import Tab
 
 from src.frontend.components import AmountSelector, NfcScannerSection
 from src.frontend.core.config import config as cfg
 from src.frontend.i18n.translator import translations as t
 from src.frontend.models.nfc import Nfc
-from src.frontend.services import NFCService, is_err, is_success
+from src.frontend.services import ChangeBatch, NFCService, is_err, is_success
 from src.frontend.theme import Styles
 
 
@@ -20,6 +20,8 @@ class TopUpTab:
     def __init__(self, service: NFCService, tab: Tab) -> None:
         self.service = service
         self.current_user: Nfc | None = None
+        # Scanned while the backend was unreachable: balance unknown, top-up goes to the outbox.
+        self.offline = False
         self._scan_hint = t.nfc_simulate_hint if self.service.mock_nfc_enabled else t.nfc_scan_hint
 
         with ui.tab_panel(tab):
@@ -54,6 +56,7 @@ class TopUpTab:
 
         # Attach handlers
         self.update_button.on_click(self.update_balance)
+        context.client.on_delete(self.service.add_listener(self._on_change))
 
     # --- UI handlers -------------------------------------------------
 
@@ -62,6 +65,7 @@ class TopUpTab:
         self.balance_container.visible = False
         self.topup_container.visible = False
         self.current_user = None
+        self.offline = False
 
         if self.service.mock_nfc_enabled:
             return await self._mock_topup_scan()
@@ -75,6 +79,16 @@ class TopUpTab:
 
         result = await self.service.get_nfc(nfc_id)
 
+        if is_err(result) and result.transient and self.service.outbox is not None:
+            # The top-up can still be taken; it is sent once the backend is back.
+            self.offline = True
+            self.nfc_scanner.set_status(result.error)
+            self.balance_label.text = t.balance_offline
+            self.balance_container.visible = True
+            self.topup_container.visible = True
+            self.amount_selector.reset(cfg.default_balance)
+            return
+
         if is_err(result):
             ui.notify(result.error, type="negative", position="top-right")
             return
@@ -97,11 +111,21 @@ class TopUpTab:
                 position="top-right",
             )
 
+    def _on_change(self, batch: ChangeBatch) -> None:
+        """Keep the shown balance current when the scanned card changes elsewhere."""
+        if batch is None or self.current_user is None:
+            return
+        for change in batch:
+            if change.nfc_id == self.current_user.nfc_id and (nfc := change.nfc) is not None:
+                self.current_user = nfc
+                self._update_balance_display()
+
     def _on_clear(self) -> None:
         """Handle clear button press."""
         self.balance_container.visible = False
         self.topup_container.visible = False
         self.current_user = None
+        self.offline = False
 
     def _update_balance_display(self) -> None:
         """Update the balance label with current user's balance."""
@@ -110,7 +134,7 @@ class TopUpTab:
 
     async def update_balance(self) -> None:
         """Update the user's balance."""
-        if not self.nfc_scanner.nfc_id or not self.current_user:
+        if not self.nfc_scanner.nfc_id or not (self.current_user or self.offline):
             # should not happen due to UI state, but just in case
             ui.notify(t.nfc_no_card_scanned, type="negative", position="top-right")
             return
@@ -125,6 +149,14 @@ class TopUpTab:
         # Request update and handle errors via result object
         result = await self.service.update_balance(self.nfc_scanner.nfc_id, amount)
 
+        if is_err(result) and result.queued:
+            self._on_clear()
+            self.nfc_scanner.reset()
+            self.nfc_scanner.set_status(result.error)
+            ui.notify(result.error, type="warning", position="top-right")
+            self.update_button.enable()
+            return
+
         if is_err(result):
             ui.notify(result.error, type="negative", position="top-right")
             self.nfc_scanner.set_status(t.balance_update_failed)
@@ -9,3 +9,4 @@ ROOT_PATH = Path(__file__).parent.parent.parent
 ENV_PATH = ROOT_PATH / ".env"
 LOG_CONFIG_PATH = ROOT_PATH / "log_config.yaml"
 DEFAULT_DATABASE_PATH = Path.home() / ".cocktailberry" / "payment.db"
+DEFAULT_OUTBOX_PATH = Path.home() / ".cocktailberry" / "outbox.db"
@@ -0,0 +1,98 @@
+"""Measure what importing an entry point costs, from ``python -X importtime``.
+
+`profile_imports` imports an entry point's module in a fresh interpreter and
+parses the interpreter's import-time report into an `ImportNode` tree: each
+module with its own and its cumulative import time, and the modules first
+imported while importing it. `STARTUP_BUDGETS_MS` holds the import time each
+entry point may take; ``cocktailberry.startup check`` fails above it.
+"""
+
+import statistics
+import subprocess
+import sys
+from dataclasses import dataclass, field
+from enum import StrEnum
+
+from src.shared import ROOT_PATH
+
+
+class EntryPoint(StrEnum):
+    API = "api"
+    GUI = "gui"
+    CLI = "cli"
+
+
+ENTRY_MODULES = {
+    EntryPoint.API: "src.backend.main",
+    EntryPoint.GUI: "src.frontend.main",
+    EntryPoint.CLI: "cocktailberry.__main__",
+}
+
+# Import time allowed per entry point, with headroom for slower machines than a laptop.
+STARTUP_BUDGETS_MS = {
+    EntryPoint.API: 2500.0,
+    EntryPoint.GUI: 2500.0,
+    EntryPoint.CLI: 400.0,
+}
+
+
+@dataclass
+class ImportNode:
+    """A module's import: its own time, the time including its imports, and those imports (µs)."""
+
+    module: str
+    self_us: int
+    cumulative_us: int
+    children: list["ImportNode"] = field(default_factory=list)
+
+    def walk(self, depth: int = 0) -> list[tuple[int, "ImportNode"]]:
+        """Return this node and its descendants with their depth, costliest imports first."""
+        nodes = [(depth, self)]
+        for child in sorted(self.children, key=lambda node: node.cumulative_us, reverse=True):
+            nodes.extend(child.walk(depth + 1))
+        return nodes
+
+
+def parse_importtime(report: str) -> list[ImportNode]:
+    """Build the import trees from a ``-X importtime`` report; returns the top-level imports in order.
+
+    The report lists a module after the modules it imported, indented two spaces
+    deeper; lines that are not import times (e.g. other stderr output) are skipped.
+    """
+    # Nodes waiting for their parent, by depth.
+    pending: dict[int, list[ImportNode]] = {}
+    for line in report.splitlines():
+        if not line.startswith("import time:"):
+            continue
+        self_us, cumulative_us, name = line.removeprefix("import time:").split("|")
+        if not self_us.strip().isdigit():
+            continue  # the header line
+        module = name.removeprefix(" ")
+        depth = (len(module) - len(module.lstrip(" "))) // 2
+        node = ImportNode(module.strip(), int(self_us), int(cumulative_us), pending.pop(depth + 1, []))
+        pending.setdefault(depth, []).append(node)
+    return pending.get(0, [])
+
+
+def profile_imports(entry_point: EntryPoint) -> ImportNode:
+    """Import the entry point's module in a fresh interpreter and return its import tree.
+
+    The root stands for the whole run, interpreter startup imports included.
+    """
+    module = ENTRY_MODULES[entry_point]
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        capture_output=True,
+        text=True,
+        cwd=ROOT_PATH,
+        check=False,
+    )
+    if result.returncode != 0:
+        raise RuntimeError(f"Importing {module} failed:\n{result.stderr[-2000:]}")
+    imports = parse_importtime(result.stderr)
+    return ImportNode(f"{entry_point} ({module})", 0, sum(node.cumulative_us for node in imports), imports)
+
+
+def median_import_ms(entry_point: EntryPoint, runs: int = 3) -> float:
+    """Return the median total import time of the entry point over `runs` fresh interpreters, in ms."""
+    return statistics.median(profile_imports(entry_point).cumulative_us / 1000 for _ in range(runs))
@@ -0,0 +1,76 @@
+"""Tests for admission control on the write endpoints."""
+
+import asyncio
+from collections.abc import Generator
+
+import pytest
+from fastapi import status
+from fastapi.testclient import TestClient
+
+from src.backend.core import admission
+from src.backend.core.admission import AdmissionControl, AdmissionRejected
+from src.backend.core.config import config as cfg
+from src.backend.main import app
+
+HEADERS = {"x-api-key": cfg.api_key}
+
+
+def test_queue_full_is_rejected_at_once() -> None:
+    control = AdmissionControl(limit=1, queue_size=1, queue_timeout=1)
+
+    async def scenario() -> None:
+        await control.acquire()
+        queued = asyncio.create_task(control.acquire())
+        await asyncio.sleep(0)
+        assert control.stats.waiting == 1
+        with pytest.raises(AdmissionRejected):
+            await control.acquire()
+        control.release()
+        await queued
+        control.release()
+
+    asyncio.run(scenario())
+    assert control.stats.model_dump() == {
+        "limit": 1,
+        "queue_size": 1,
+        "active": 0,
+        "waiting": 0,
+        "admitted": 2,
+        "rejected": 1,
+    }
+
+
+def test_queue_wait_is_bounded() -> None:
+    control = AdmissionControl(limit=1, queue_size=4, queue_timeout=0.01)
+
+    async def scenario() -> None:
+        await control.acquire()
+        with pytest.raises(AdmissionRejected):
+            await control.acquire()
+
+    asyncio.run(scenario())
+    assert (control.stats.rejected, control.stats.waiting) == (1, 0)
+
+
+@pytest.fixture
+def busy_client(monkeypatch: pytest.MonkeyPatch) -> Generator[TestClient]:
+    """Yield a client whose write admission has no free slot and no queue."""
+    monkeypatch.setattr(admission, "write_admission", AdmissionControl(limit=0, queue_size=0))
+    yield TestClient(app)
+
+
+@pytest.mark.parametrize(
+    ("path", "body"), [("/api/users/ANY/balance/top-up", {"amount": 1}), ("/api/stats/rebuild", None)]
+)
+def test_rejected_write_is_503_with_retry_after(busy_client: TestClient, path: str, body: dict | None) -> None:
+    resp = busy_client.post(path, json=body, headers=HEADERS)
+    assert resp.status_code == status.HTTP_503_SERVICE_UNAVAILABLE
+    assert resp.headers["Retry-After"] == str(admission.RETRY_AFTER_SECONDS)
+    assert resp.json() == {"detail": "Server busy, retry shortly"}
+
+
+def test_admission_stats_report_rejections(busy_client: TestClient) -> None:
+    busy_client.delete("/api/users/ANY", headers=HEADERS)
+    resp = busy_client.get("/api/system/admission", headers=HEADERS)
+    assert resp.status_code == status.HTTP_200_OK
+    assert resp.json()["rejected"] == 1
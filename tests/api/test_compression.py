@@ -0,0 +1,78 @@
+"""Tests for the response compression middleware, on a small app of its own."""
+
+import gzip
+from collections.abc import AsyncIterator
+
+import pytest
+from fastapi import FastAPI
+from fastapi.responses import StreamingResponse
+from fastapi.testclient import TestClient
+
+from src.backend.core.compression import CompressionMiddleware, compress, negotiate
+
+MINIMUM_SIZE = 500
+LARGE = [{"nfc_id": f"CARD{i:04d}", "is_adult": True, "balance": 10.0} for i in range(100)]
+
+
+@pytest.fixture
+def client() -> TestClient:
+    app = FastAPI()
+    app.add_middleware(CompressionMiddleware, encodings=["zstd", "br", "gzip"], minimum_size=MINIMUM_SIZE)
+
+    @app.get("/large")
+    def large() -> list[dict]:
+        return LARGE
+
+    @app.get("/small")
+    def small() -> dict:
+        return {"nfc_id": "CARD0001", "balance": 12.5}
+
+    @app.get("/events")
+    def events() -> StreamingResponse:
+        async def stream() -> AsyncIterator[str]:
+            yield "data: " + "x" * 2 * MINIMUM_SIZE + "\n\n"
+
+        return StreamingResponse(stream(), media_type="text/event-stream")
+
+    return TestClient(app)
+
+
+def test_large_response_is_gzipped(client: TestClient) -> None:
+    resp = client.get("/large", headers={"Accept-Encoding": "gzip"})
+    assert resp.headers["content-encoding"] == "gzip"
+    assert "Accept-Encoding" in resp.headers["vary"]
+    assert int(resp.headers["content-length"]) < len(resp.content)
+    assert resp.json() == LARGE
+
+
+@pytest.mark.parametrize(("path", "accept_encoding"), [("/small", "gzip"), ("/events", "gzip"), ("/large", "identity")])
+def test_small_streamed_or_unaccepted_responses_are_sent_as_they_are(
+    client: TestClient, path: str, accept_encoding: str
+) -> None:
+    resp = client.get(path, headers={"Accept-Encoding": accept_encoding})
+    assert resp.status_code == 200  # noqa: PLR2004
+    assert "content-encoding" not in resp.headers
+
+
+@pytest.mark.parametrize(
+    ("accept_encoding", "chosen"),
+    [
+        ("gzip, deflate", "gzip"),
+        ("deflate;q=1.0, gzip;q=0.5", "gzip"),
+        ("gzip;q=0", None),
+        ("*", "gzip"),
+        ("identity", None),
+        ("", None),
+    ],
+)
+def test_negotiate_honours_the_client_qualities(accept_encoding: str, chosen: str | None) -> None:
+    assert negotiate(accept_encoding, ["gzip"]) == chosen
+
+
+def test_negotiate_skips_encodings_without_a_codec() -> None:
+    assert negotiate("compress, gzip", ["compress", "gzip"]) == "gzip"
+
+
+def test_compress_round_trips() -> None:
+    body = b'{"balance": 10.0}' * 100
+    assert gzip.decompress(compress("gzip", body)) == body
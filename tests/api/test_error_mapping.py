@@ -14,8 +14,9 @@ from sqlalchemy.pool import StaticPool
 from sqlmodel import Session, SQLModel, create_engine
 
 from src.backend.core.config import config as cfg
-from src.backend.db.database import get_db
+from src.backend.db.database import get_db, get_read_db
 from src.backend.main import app
+from src.backend.service.write_actor import WriteActor, get_write_actor
 
 HEADERS = {"x-api-key": cfg.api_key}
 
@@ -31,9 +32,13 @@ def client() -> Generator[TestClient]:
             yield session
 
     app.dependency_overrides[get_db] = override_get_db
+    app.dependency_overrides[get_read_db] = override_get_db
+    writer = WriteActor(engine)
+    app.dependency_overrides[get_write_actor] = lambda: writer
     # No `with TestClient(...)`: skipping the lifespan keeps startup migrations and
     # the backup task away from the real database path.
     yield TestClient(app)
+    writer.stop()
     app.dependency_overrides.clear()
 
 
@@ -94,3 +99,47 @@ def test_balance_below_minimum_is_400(client: TestClient) -> None:
     resp = client.post("/api/users/ACC/balance/top-up", json={"amount": -50}, headers=HEADERS)
     assert resp.status_code == status.HTTP_400_BAD_REQUEST
     assert resp.json() == {"detail": "Balance cannot go below €0.00. Current: 10.00, Requested: -50.00"}
+
+
+def test_user_page_is_searched_and_sorted(client: TestClient) -> None:
+    _create(client, "CARD-2", balance=5)
+    _create(client, "CARD-1", balance=10)
+    _create(client, "OTHER")
+    resp = client.get(
+        "/api/users/page", params={"q": "CARD", "sort": "balance", "descending": True, "limit": 1}, headers=HEADERS
+    )
+    assert resp.status_code == status.HTTP_200_OK
+    body = resp.json()
+    assert body["total"] == 2  # noqa: PLR2004
+    assert [user["nfc_id"] for user in body["users"]] == ["CARD-1"]
+
+
+def test_lower_case_nfc_id_is_found_in_any_case(client: TestClient) -> None:
+    _create(client, "04ab12", balance=3)
+    assert client.get("/api/users/04aB12", headers=HEADERS).json()["nfc_id"] == "04AB12"
+    resp = client.post("/api/users/04ab12/balance/top-up", json={"amount": 1}, headers=HEADERS)
+    assert resp.json()["balance"] == 4  # noqa: PLR2004
+    page = client.get("/api/users/page", params={"q": "04ab"}, headers=HEADERS).json()
+    assert [user["nfc_id"] for user in page["users"]] == ["04AB12"]
+
+
+def test_stats_rebuild_runs_on_the_write_actor(client: TestClient) -> None:
+    _create(client, "STATS", balance=5)
+    resp = client.post("/api/stats/rebuild", headers=HEADERS)
+    assert resp.status_code == status.HTTP_200_OK
+    assert resp.json() == {"cocktail_hours": 0, "accounts": 1}
+
+
+def test_user_page_rejects_unknown_sort(client: TestClient) -> None:
+    resp = client.get("/api/users/page", params={"sort": "secret"}, headers=HEADERS)
+    assert resp.status_code == status.HTTP_422_UNPROCESSABLE_CONTENT
+
+
+def test_history_chunks_end_with_an_empty_page(client: TestClient) -> None:
+    _create(client, "HIST", balance=5)
+    first = client.get("/api/users/HIST/history", params={"limit": 1}, headers=HEADERS)
+    assert first.status_code == status.HTTP_200_OK
+    (entry,) = first.json()
+    resp = client.get("/api/users/HIST/history", params={"before": entry["id"], "limit": 1}, headers=HEADERS)
+    assert resp.status_code == status.HTTP_200_OK
+    assert resp.json() == []
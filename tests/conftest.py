@@ -4,7 +4,7 @@ import os
 
 # Pin the error-message language so tests are hermetic regardless of a local
 # .env (which may set LANGUAGE=de). Must run before any src.backend import,
-# because the translations singleton binds to the configured language at import.
+# because the backend config (and so the translations' language) binds at import.
 os.environ["LANGUAGE"] = "en"
 
 from collections.abc import Generator
@@ -0,0 +1,50 @@
+"""Tests for the cross-process file locks coordinating API workers."""
+
+import asyncio
+from pathlib import Path
+
+import pytest
+
+from src.backend.db import database
+from src.backend.db.locking import FileLock
+
+
+def test_second_holder_is_refused_until_release(tmp_path: Path) -> None:
+    path = tmp_path / "leader.lock"
+    leader, follower = FileLock(path), FileLock(path)
+
+    assert leader.acquire(blocking=False)
+    assert not follower.acquire(blocking=False)
+    assert leader.acquire(blocking=False)  # re-acquiring a held lock is a no-op
+
+    leader.release()
+    assert follower.acquire(blocking=False)
+    follower.release()
+
+
+def test_context_manager_releases(tmp_path: Path) -> None:
+    path = tmp_path / "startup.lock"
+    with FileLock(path) as lock:
+        assert lock.held
+    assert not lock.held
+    assert FileLock(path).acquire(blocking=False)
+
+
+def test_only_leader_takes_backups(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    backups: list[int] = []
+    monkeypatch.setattr(database, "_create_backup", lambda: backups.append(1))
+    path = tmp_path / "leader.lock"
+    other_worker = FileLock(path)
+    other_worker.acquire()
+
+    async def one_round(leader: FileLock) -> None:
+        task = asyncio.create_task(database.backup_db_periodically(leader))
+        await asyncio.sleep(0.05)
+        task.cancel()
+
+    asyncio.run(one_round(FileLock(path)))
+    assert backups == []
+
+    other_worker.release()
+    asyncio.run(one_round(FileLock(path)))
+    assert backups == [1]
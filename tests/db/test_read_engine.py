@@ -0,0 +1,43 @@
+"""Tests for the read-only engine serving GET routes."""
+
+import sqlite3
+from contextlib import closing
+from pathlib import Path
+
+import pytest
+from sqlalchemy import text
+from sqlalchemy.exc import OperationalError
+
+from src.backend.db.database import create_read_engine
+
+
+@pytest.fixture
+def db_path(tmp_path: Path) -> Path:
+    path = tmp_path / "payment.sqlite"
+    with closing(sqlite3.connect(path)) as connection:
+        connection.execute("PRAGMA journal_mode=WAL")
+        connection.execute("CREATE TABLE users (nfc_id TEXT PRIMARY KEY)")
+        connection.execute("INSERT INTO users VALUES ('A')")
+        connection.commit()
+    return path
+
+
+def test_reads_see_committed_rows(db_path: Path) -> None:
+    engine = create_read_engine(db_path, pool_size=2)
+    with engine.connect() as connection:
+        assert connection.execute(text("SELECT nfc_id FROM users")).scalars().all() == ["A"]
+    engine.dispose()
+
+
+def test_writes_are_rejected(db_path: Path) -> None:
+    engine = create_read_engine(db_path, pool_size=2)
+    with engine.connect() as connection, pytest.raises(OperationalError, match="readonly"):
+        connection.execute(text("INSERT INTO users VALUES ('B')"))
+    engine.dispose()
+
+
+def test_pool_is_bounded(db_path: Path) -> None:
+    pool_size = 3
+    engine = create_read_engine(db_path, pool_size=pool_size)
+    assert engine.pool.size() == pool_size  # type: ignore[attr-defined]
+    engine.dispose()
@@ -0,0 +1,75 @@
+"""Tests for the TTL cache used for accounts and histories in the frontend service."""
+
+from src.frontend.core.cache import TtlCache
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def test_entry_expires_after_ttl() -> None:
+    clock = FakeClock()
+    cache = TtlCache[str, int](ttl=10, clock=clock)
+    cache.put("A", 1)
+
+    clock.now = 9.9
+    assert cache.get("A") == 1
+    clock.now = 10
+    assert cache.get("A") is None
+    assert (cache.hits, cache.misses) == (1, 1)
+    assert len(cache) == 0
+
+
+def test_invalidate_and_clear() -> None:
+    cache = TtlCache[str, int](ttl=10)
+    cache.put("A", 1)
+    cache.put("B", 2)
+
+    cache.invalidate("A")
+    assert cache.get("A") is None
+    assert cache.get("B") == 2  # noqa: PLR2004
+    cache.clear()
+    assert cache.get("B") is None
+
+
+def test_oldest_entry_is_evicted_when_full() -> None:
+    cache = TtlCache[str, int](ttl=10, max_entries=2)
+    cache.put("A", 1)
+    cache.put("B", 2)
+    cache.put("A", 3)  # re-storing makes A the newest
+    cache.put("C", 4)
+
+    assert cache.get("B") is None
+    assert cache.get("A") == 3  # noqa: PLR2004
+
+
+def test_reading_an_entry_keeps_it_over_unused_ones() -> None:
+    cache = TtlCache[str, int](ttl=10, max_entries=2)
+    cache.put("A", 1)
+    cache.put("B", 2)
+    assert cache.get("A") == 1  # A is now the most recently used
+    cache.put("C", 3)
+
+    assert cache.get("B") is None
+    assert cache.get("A") == 1
+
+
+def test_zero_ttl_disables_caching() -> None:
+    cache = TtlCache[str, int](ttl=0)
+    cache.put("A", 1)
+    assert cache.get("A") is None
+    assert cache.hit_rate == 0
+
+
+def test_peek_neither_counts_nor_returns_expired_entries() -> None:
+    clock = FakeClock()
+    cache = TtlCache[str, int](ttl=10, clock=clock)
+    cache.put("A", 1)
+    assert cache.peek("A") == 1
+    clock.now = 10
+    assert cache.peek("A") is None
+    assert (cache.hits, cache.misses) == (0, 0)
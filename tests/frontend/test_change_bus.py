@@ -0,0 +1,62 @@
+"""Tests for the coalescing change bus feeding the tabs."""
+
+import asyncio
+
+from src.frontend.core.change_bus import ChangeBatch, ChangeBus
+from src.frontend.models.nfc import NfcChange
+
+
+def _deliver(*changes: NfcChange | None) -> list[ChangeBatch]:
+    """Publish the changes in one burst and return the batches listeners received."""
+    batches: list[ChangeBatch] = []
+
+    async def scenario() -> None:
+        bus = ChangeBus(window=0.01)
+        bus.subscribe(batches.append)
+        for change in changes:
+            bus.publish(change)
+        await asyncio.sleep(0.05)
+
+    asyncio.run(scenario())
+    return batches
+
+
+def test_burst_is_delivered_as_one_batch_newest_per_account() -> None:
+    batches = _deliver(
+        NfcChange(nfc_id="A", is_adult=True, balance=1),
+        NfcChange(nfc_id="B", is_adult=True, balance=5),
+        NfcChange(nfc_id="A", is_adult=True, balance=2),
+    )
+    assert len(batches) == 1
+    batch = batches[0]
+    assert batch is not None
+    assert [(change.nfc_id, change.balance) for change in batch] == [("B", 5), ("A", 2)]
+
+
+def test_resync_supersedes_pending_changes() -> None:
+    batches = _deliver(
+        NfcChange(nfc_id="A", is_adult=True, balance=1),
+        None,
+        NfcChange(nfc_id="B", is_adult=True, balance=5),
+    )
+    assert batches == [None]
+
+
+def test_failing_listener_does_not_starve_others() -> None:
+    received: list[ChangeBatch] = []
+
+    def broken(_batch: ChangeBatch) -> None:
+        raise RuntimeError
+
+    async def scenario() -> None:
+        bus = ChangeBus(window=0)
+        bus.subscribe(broken)
+        unsubscribe = bus.subscribe(received.append)
+        bus.publish(NfcChange(nfc_id="A", deleted=True))
+        bus.flush()
+        unsubscribe()
+        bus.publish(NfcChange(nfc_id="B", deleted=True))
+        bus.flush()
+
+    asyncio.run(scenario())
+    assert len(received) == 1
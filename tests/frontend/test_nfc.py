@@ -0,0 +1,232 @@
+"""Tests for the NFC scanner, driven through the simulated reader backend (no PC/SC hardware)."""
+
+import asyncio
+import threading
+import time
+from collections.abc import Awaitable, Callable
+
+from src.frontend.core.nfc import NFCScanner, Scan
+from src.frontend.core.sim_reader import SimulatedBackend, SimulatedCard
+
+READER = "Simulated Reader 0"
+OTHER_READER = "Simulated Reader 1"
+# How long the simulated UID read blocks its thread, like a slow APDU exchange.
+READ_SECONDS = 0.3
+
+
+def _backend(*readers: str, observer_seconds: float = 0) -> SimulatedBackend:
+    """Return a backend whose cards stay on the readers until taken off by the test."""
+    return SimulatedBackend(
+        readers or [READER], apdu_seconds=READ_SECONDS, hold_seconds=None, observer_seconds=observer_seconds
+    )
+
+
+async def _longest_gap[T](work: Callable[[], Awaitable[T]]) -> tuple[T, float]:
+    """Await `work()` while a heartbeat measures the longest the event loop stalled."""
+    longest_gap = 0.0
+    running = True
+
+    async def heartbeat() -> None:
+        nonlocal longest_gap
+        last = time.monotonic()
+        while running:
+            await asyncio.sleep(0.01)
+            now = time.monotonic()
+            longest_gap = max(longest_gap, now - last)
+            last = now
+
+    beats = asyncio.create_task(heartbeat())
+    await asyncio.sleep(0.02)
+    result = await work()
+    running = False
+    await beats
+    return result, longest_gap
+
+
+def test_one_shot_returns_inserted_card_without_blocking_the_loop() -> None:
+    backend = _backend()
+    scanner = NFCScanner(backend)
+
+    async def scenario() -> tuple[str | None, float]:
+        threading.Timer(0.1, backend.insert, ["04A1B2C3"]).start()
+        return await _longest_gap(lambda: scanner.one_shot(timeout=2))
+
+    nfc_id, longest_gap = asyncio.run(scenario())
+    assert nfc_id == "04A1B2C3"
+    # The loop kept ticking while the UID read blocked its thread for READ_SECONDS.
+    assert longest_gap < READ_SECONDS / 2
+
+
+def test_card_already_on_the_reader_is_read_at_once() -> None:
+    backend = _backend()
+    backend.insert("CAFE0001")
+    assert asyncio.run(NFCScanner(backend).one_shot(timeout=1)) == "CAFE0001"
+
+
+def test_scan_bound_to_a_reader_ignores_the_others() -> None:
+    backend = _backend(READER, OTHER_READER)
+    backend.insert("CAFE0002", OTHER_READER)
+    assert asyncio.run(NFCScanner(backend).one_shot(timeout=0.2, reader=READER)) is None
+
+
+def test_cards_on_unknown_readers_are_ignored() -> None:
+    backend = _backend()
+    backend.insert("CAFE0004", "Unknown Reader")
+    assert asyncio.run(NFCScanner(backend).one_shot(timeout=0.2)) is None
+
+
+def test_two_readers_scan_in_parallel_and_tag_their_reads() -> None:
+    backend = _backend(READER, OTHER_READER)
+    scanner = NFCScanner(backend)
+    assert scanner.reader_names == [READER, OTHER_READER]
+
+    async def scenario() -> tuple[list[Scan | None], float]:
+        started = time.monotonic()
+        threading.Timer(0.05, backend.insert, ["AAAA0001", READER]).start()
+        threading.Timer(0.05, backend.insert, ["BBBB0002", OTHER_READER]).start()
+        scans = await asyncio.gather(scanner.scan(2, READER), scanner.scan(2, OTHER_READER))
+        return list(scans), time.monotonic() - started
+
+    scans, elapsed = asyncio.run(scenario())
+    assert scans == [Scan("AAAA0001", READER), Scan("BBBB0002", OTHER_READER)]
+    # Each reader reads on its own thread: the two slow reads overlap.
+    assert elapsed < 2 * READ_SECONDS
+
+
+def test_hot_plugged_reader_is_used_and_unplugged_one_dropped() -> None:
+    backend = _backend()
+    scanner = NFCScanner(backend)
+    announced: list[list[str]] = []
+    scanner.add_reader_listener(announced.append)
+
+    async def scenario() -> Scan | None:
+        def plug_and_tap() -> None:
+            backend.plug(OTHER_READER)
+            backend.insert("CAFE0005", OTHER_READER)
+
+        threading.Timer(0.05, plug_and_tap).start()
+        return await scanner.scan(timeout=2)
+
+    assert asyncio.run(scenario()) == Scan("CAFE0005", OTHER_READER)
+    backend.unplug(READER)
+    assert scanner.reader_names == [OTHER_READER]
+    assert announced == [[READER, OTHER_READER], [OTHER_READER]]
+    scanner.close()
+    assert not scanner.is_available()
+    backend.plug(READER)  # no longer followed
+    assert scanner.reader_names == []
+
+
+def test_card_on_a_reader_closed_before_the_read_is_skipped() -> None:
+    backend = _backend()
+    scanner = NFCScanner(backend)
+    # Unplugged between the card's arrival and its read: the reader's thread is gone.
+    scanner.reader(READER).close()  # type: ignore[union-attr]
+    backend.insert("CAFE0006")
+    assert asyncio.run(scanner.one_shot(timeout=0.3)) is None
+
+
+def test_scan_keeps_waiting_when_the_reader_is_unplugged_mid_read() -> None:
+    backend = _backend(READER, OTHER_READER)
+    scanner = NFCScanner(backend)
+    # A continuous read keeps the reader's thread busy, so the scan's read queues behind it.
+    scanner.reader(READER).submit(SimulatedCard(READER, "BUSY0001"), lambda _: None)  # type: ignore[union-attr]
+
+    async def scenario() -> Scan | None:
+        backend.insert("CAFE0007", READER)
+        threading.Timer(0.1, backend.unplug, [READER]).start()
+        threading.Timer(0.2, backend.insert, ["CAFE0008", OTHER_READER]).start()
+        return await scanner.scan(timeout=2)
+
+    assert asyncio.run(scenario()) == Scan("CAFE0008", OTHER_READER)
+
+
+def test_cancelling_the_caller_stops_the_scan() -> None:
+    backend = _backend()
+    scanner = NFCScanner(backend)
+
+    async def scenario() -> Scan | None:
+        scan = asyncio.create_task(scanner.one_shot(timeout=10))
+        await asyncio.sleep(0.05)
+        scan.cancel()
+        await asyncio.gather(scan, return_exceptions=True)
+        assert scan.cancelled()
+        # The cancelled scan no longer waits: the next card goes to the next scan.
+        threading.Timer(0.05, backend.insert, ["CAFE0009"]).start()
+        return await scanner.scan(timeout=2)
+
+    assert asyncio.run(scenario()) == Scan("CAFE0009", READER)
+
+
+def test_scans_do_not_register_observers_on_the_loop() -> None:
+    # pyscard starts its monitor thread on the first observer added and joins it on the last one deleted.
+    backend = _backend(observer_seconds=READ_SECONDS)
+    scanner = NFCScanner(backend)
+    backend.insert("04A1B2C3")
+
+    async def scans() -> list[str | None]:
+        return [await scanner.one_shot(timeout=2) for _ in range(3)]
+
+    nfc_ids, longest_gap = asyncio.run(_longest_gap(scans))
+    assert nfc_ids == ["04A1B2C3"] * 3
+    assert longest_gap < READ_SECONDS / 2
+
+
+def test_unreadable_resting_card_is_read_once_until_taken_off() -> None:
+    backend = _backend()
+    scanner = NFCScanner(backend)
+    card = backend.insert("BAD00001", readable=False)
+
+    assert asyncio.run(scanner.one_shot(timeout=0.5)) is None
+    assert asyncio.run(scanner.one_shot(timeout=0.5)) is None
+    assert backend.reads == 1
+
+    backend.remove(card)
+    backend.insert("BAD00001", readable=False)  # tapped again: worth another try
+    assert asyncio.run(scanner.one_shot(timeout=0.5)) is None
+    assert backend.reads == 2  # noqa: PLR2004
+
+
+def _wait_until(condition: Callable[[], bool], timeout: float = 2.0) -> None:
+    deadline = time.monotonic() + timeout
+    while not condition():
+        assert time.monotonic() < deadline, "condition not met in time"
+        time.sleep(0.01)
+
+
+def test_continuous_reports_a_resting_card_once_and_suppresses_double_taps() -> None:
+    backend = _backend()
+    scanner = NFCScanner(backend)
+    reported: list[Scan] = []
+
+    assert scanner.start_continuous(reported.append, dedupe_seconds=READ_SECONDS * 3)
+    card = backend.insert("04A1B2C3")
+    # The monitor reporting the same card again while it rests on the reader is no new tap.
+    backend.report_again()
+    _wait_until(lambda: reported == [Scan("04A1B2C3", READER)])
+
+    backend.remove(card)
+    backend.insert("04A1B2C3")  # a double tap, within the dedupe window
+    stats = scanner.scan_stats
+    assert stats is not None
+    _wait_until(lambda: stats.suppressed == 1)
+    scanner.stop_continuous()
+
+    assert reported == [Scan("04A1B2C3", READER)]
+    assert (stats.insertions, stats.callbacks) == (2, 1)
+    assert not scanner.is_scanning()
+
+
+def test_continuous_reports_the_card_again_after_the_dedupe_window() -> None:
+    backend = _backend()
+    scanner = NFCScanner(backend)
+    reported: list[Scan] = []
+
+    scanner.start_continuous(reported.append, dedupe_seconds=0.05)
+    card = backend.insert("CAFE0003")
+    _wait_until(lambda: len(reported) == 1)
+    backend.remove(card)
+    time.sleep(0.1)
+    backend.insert("CAFE0003")
+    _wait_until(lambda: len(reported) == 2)  # noqa: PLR2004
+    scanner.stop_continuous()
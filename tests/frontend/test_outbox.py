@@ -0,0 +1,52 @@
+"""Tests for the offline outbox's durable, ordered storage."""
+
+from pathlib import Path
+
+from src.frontend.core.outbox import OperationKind, Outbox, PendingOperation
+
+
+def test_operations_survive_reopen_in_order(tmp_path: Path) -> None:
+    path = tmp_path / "outbox.db"
+    outbox = Outbox(path)
+    create = outbox.add(PendingOperation(OperationKind.CREATE, "A", {"is_adult": True, "balance": 5.0}))
+    outbox.add(PendingOperation(OperationKind.TOP_UP, "A", {"amount": 2.5}))
+    outbox.close()
+
+    reopened = Outbox(path)
+    pending = reopened.pending()
+    assert [(op.kind, op.nfc_id) for op in pending] == [(OperationKind.CREATE, "A"), (OperationKind.TOP_UP, "A")]
+    assert pending[0].idempotency_key == create.idempotency_key
+    assert pending[1].payload == {"amount": 2.5}
+    reopened.close()
+
+
+def test_remove_drops_only_that_operation(tmp_path: Path) -> None:
+    outbox = Outbox(tmp_path / "outbox.db")
+    first = outbox.add(PendingOperation(OperationKind.TOP_UP, "A", {"amount": 1.0}))
+    outbox.add(PendingOperation(OperationKind.TOP_UP, "B", {"amount": 2.0}))
+
+    outbox.remove(first)
+
+    assert len(outbox) == 1
+    assert outbox.pending()[0].nfc_id == "B"
+    outbox.close()
+
+
+def test_rejected_operations_are_kept_until_dismissed(tmp_path: Path) -> None:
+    path = tmp_path / "outbox.db"
+    outbox = Outbox(path)
+    rejected = outbox.add(PendingOperation(OperationKind.TOP_UP, "A", {"amount": 1.0}))
+    outbox.add(PendingOperation(OperationKind.TOP_UP, "B", {"amount": 2.0}))
+
+    outbox.reject(rejected, "NFC not found")
+    outbox.close()
+
+    reopened = Outbox(path)
+    assert [op.nfc_id for op in reopened.pending()] == ["B"]
+    [kept] = reopened.rejected()
+    assert (kept.operation.nfc_id, kept.operation.payload, kept.error) == ("A", {"amount": 1.0}, "NFC not found")
+    assert kept.operation.idempotency_key == rejected.idempotency_key
+    reopened.dismiss(kept)
+    assert reopened.rejected_count() == 0
+    assert len(reopened) == 1
+    reopened.close()
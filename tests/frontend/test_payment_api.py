@@ -94,3 +94,90 @@ def test_delete_nfc_404_is_err() -> None:
 
     result: Result = _run(handler, lambda api: api.delete_nfc("MISSING"))
     assert is_err(result)
+
+
+def test_stream_changes_parses_sse_events() -> None:
+    body = (
+        ": connected\n\n"
+        'event: change\ndata: {"nfc_id": "F", "deleted": false, "is_adult": true, "balance": 7.5, "log": null}\n\n'
+        ": keepalive\n\n"
+        'event: change\ndata: {"nfc_id": "G", "deleted": true, "is_adult": null, "balance": null, "log": null}\n\n'
+    )
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        assert request.url.path == "/events"
+        return httpx.Response(200, text=body, headers={"content-type": "text/event-stream"})
+
+    connected: list[bool] = []
+
+    async def collect(api: PaymentApi) -> list:
+        return [change async for change in api.stream_changes(on_connect=lambda: connected.append(True))]
+
+    changes = _run(handler, collect)
+    assert connected == [True]
+    assert [c.nfc_id for c in changes] == ["F", "G"]
+    assert changes[0].nfc is not None
+    assert changes[0].nfc.balance == 7.5  # noqa: PLR2004
+    assert changes[1].nfc is None
+
+
+def test_get_nfc_page_passes_search_and_sort() -> None:
+    def handler(request: httpx.Request) -> httpx.Response:
+        assert request.url.path == "/users/page"
+        assert dict(request.url.params) == {
+            "q": "AB",
+            "sort": "balance",
+            "descending": "true",
+            "offset": "20",
+            "limit": "10",
+        }
+        return httpx.Response(200, json={"total": 21, "users": [{"nfc_id": "AB9", "is_adult": False, "balance": 3.0}]})
+
+    result: Result = _run(handler, lambda api: api.get_nfc_page("AB", "balance", True, offset=20, limit=10))
+    assert is_success(result)
+    assert result.data.total == 21  # noqa: PLR2004
+    assert [nfc.nfc_id for nfc in result.data.users] == ["AB9"]
+
+
+def test_get_nfc_history_passes_cursor() -> None:
+    def handler(request: httpx.Request) -> httpx.Response:
+        assert request.url.path == "/users/H/history"
+        assert dict(request.url.params) == {"before": "17", "limit": "50"}
+        return httpx.Response(200, json=[{"id": 16, "amount": -2.0}])
+
+    result: Result = _run(handler, lambda api: api.get_nfc_history("H", before=17, limit=50))
+    assert is_success(result)
+    assert result.data == [{"id": 16, "amount": -2.0}]
+
+
+def test_unreachable_backend_is_transient() -> None:
+    def handler(request: httpx.Request) -> httpx.Response:
+        raise httpx.ConnectError("connection refused", request=request)
+
+    result: Result = _run(handler, lambda api: api.update_balance("A", 5.0))
+    assert is_err(result)
+    assert result.transient
+
+
+def test_busy_backend_is_transient_but_rejection_is_not() -> None:
+    def busy(request: httpx.Request) -> httpx.Response:
+        return httpx.Response(503, json={"detail": "Server busy, retry shortly"})
+
+    def rejected(request: httpx.Request) -> httpx.Response:
+        return httpx.Response(404, json={"detail": "User not found"})
+
+    busy_result: Result = _run(busy, lambda api: api.update_balance("A", 5.0))
+    rejected_result: Result = _run(rejected, lambda api: api.update_balance("A", 5.0))
+    assert is_err(busy_result)
+    assert busy_result.transient
+    assert is_err(rejected_result)
+    assert not rejected_result.transient
+
+
+def test_idempotency_key_is_sent() -> None:
+    def handler(request: httpx.Request) -> httpx.Response:
+        assert request.headers["Idempotency-Key"] == "key-1"
+        return httpx.Response(201, json={"nfc_id": "A", "is_adult": True, "balance": 2.0})
+
+    result: Result = _run(handler, lambda api: api.create_nfc("A", True, 2.0, idempotency_key="key-1"))
+    assert is_success(result)
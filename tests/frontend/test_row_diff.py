@@ -0,0 +1,59 @@
+"""Tests for the keyed row snapshot that table updates are diffed against."""
+
+from src.frontend.core.row_diff import KeyedRows
+
+
+def _rows(*items: tuple[str, float]) -> list[dict]:
+    return [{"nfc_id": nfc_id, "balance": balance} for nfc_id, balance in items]
+
+
+def test_first_diff_upserts_everything() -> None:
+    rows = KeyedRows("nfc_id")
+    patch = rows.diff(_rows(("A", 1.0), ("B", 2.0)))
+    assert patch.upserts == _rows(("A", 1.0), ("B", 2.0))
+    assert patch.order == ["A", "B"]
+    assert len(rows) == 2  # noqa: PLR2004
+
+
+def test_unchanged_rows_yield_an_empty_patch() -> None:
+    rows = KeyedRows("nfc_id")
+    rows.diff(_rows(("A", 1.0), ("B", 2.0)))
+    assert not rows.diff(_rows(("A", 1.0), ("B", 2.0)))
+
+
+def test_only_changed_rows_are_upserted() -> None:
+    rows = KeyedRows("nfc_id")
+    rows.diff(_rows(("A", 1.0), ("B", 2.0), ("C", 3.0)))
+    patch = rows.diff(_rows(("A", 1.0), ("B", 5.0), ("C", 3.0)))
+    assert patch.upserts == _rows(("B", 5.0))
+    assert patch.deleted == []
+    assert patch.order is None
+
+
+def test_deletion_keeps_order_but_insert_sends_it() -> None:
+    rows = KeyedRows("nfc_id")
+    rows.diff(_rows(("A", 1.0), ("B", 2.0), ("C", 3.0)))
+    deleted = rows.diff(_rows(("A", 1.0), ("C", 3.0)))
+    assert deleted.deleted == ["B"]
+    assert deleted.order is None
+    inserted = rows.diff(_rows(("A", 1.0), ("AB", 0.0), ("C", 3.0)))
+    assert inserted.upserts == _rows(("AB", 0.0))
+    assert inserted.order == ["A", "AB", "C"]
+
+
+def test_reorder_is_detected() -> None:
+    rows = KeyedRows("nfc_id")
+    rows.diff(_rows(("A", 1.0), ("B", 2.0)))
+    patch = rows.diff(_rows(("B", 2.0), ("A", 1.0)))
+    assert patch.upserts == []
+    assert patch.order == ["B", "A"]
+
+
+def test_rows_are_copies() -> None:
+    rows = KeyedRows("nfc_id")
+    source = _rows(("A", 1.0))
+    rows.diff(source)
+    source[0]["balance"] = 9.0
+    copy = rows.rows
+    copy[0]["balance"] = 7.0
+    assert rows["A"]["balance"] == 1.0
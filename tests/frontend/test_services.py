@@ -0,0 +1,31 @@
+"""Tests for the GUI service's account cache fed by mutations and the change feed."""
+
+import asyncio
+
+from src.frontend.core.change_bus import ChangeBatch
+from src.frontend.core.payment_api import is_success
+from src.frontend.models.nfc import Nfc, NfcChange
+from src.frontend.services import NFCService
+
+
+def test_feed_updates_the_cached_account_and_drops_stale_events() -> None:
+    batches: list[ChangeBatch] = []
+
+    async def scenario() -> Nfc | None:
+        service = NFCService()
+        service.add_listener(batches.append)
+        # A top-up made in this GUI, then the feed's echo of it and an older event.
+        service._updated(Nfc(nfc_id="A", is_adult=True, balance=10, rev=5))
+        await asyncio.sleep(0.2)
+        service._notify(NfcChange(nfc_id="A", rev=5, is_adult=True, balance=10))
+        service._notify(NfcChange(nfc_id="A", rev=4, is_adult=True, balance=7))
+        await asyncio.sleep(0.2)
+        # A booking at a cocktail machine: the cache takes its state, no refetch needed.
+        service._notify(NfcChange(nfc_id="A", rev=6, is_adult=True, balance=8))
+        await asyncio.sleep(0.2)
+        result = await service.get_nfc("A")
+        await service.aclose()
+        return result.data if is_success(result) else None
+
+    assert asyncio.run(scenario()) == Nfc(nfc_id="A", is_adult=True, balance=8, rev=6)
+    assert [[change.rev for change in batch or []] for batch in batches] == [[5], [6]]
@@ -0,0 +1,53 @@
+"""Tests for the simulated reader, driven through the real NFC scanner."""
+
+import asyncio
+import time
+
+from src.frontend.core.nfc import NFCScanner, Scan
+from src.frontend.core.sim_reader import SIMULATED_READER, SimulatedBackend
+
+APDU_SECONDS = 0.1
+
+
+def test_tapped_card_is_read_with_the_apdu_latency() -> None:
+    backend = SimulatedBackend(apdu_seconds=APDU_SECONDS)
+    scanner = NFCScanner(backend)
+
+    async def scenario() -> tuple[Scan | None, float]:
+        started = time.monotonic()
+        asyncio.get_running_loop().call_soon(backend.tap, "04A1B2C3")
+        scan = await scanner.scan(timeout=2)
+        return scan, time.monotonic() - started
+
+    scan, elapsed = asyncio.run(scenario())
+    assert scan == Scan("04A1B2C3", SIMULATED_READER)
+    assert APDU_SECONDS <= elapsed < 3 * APDU_SECONDS
+    scanner.close()
+
+
+def test_card_removed_during_the_read_is_skipped_for_the_next() -> None:
+    backend = SimulatedBackend(apdu_seconds=APDU_SECONDS)
+    scanner = NFCScanner(backend)
+
+    async def scenario() -> Scan | None:
+        loop = asyncio.get_running_loop()
+        loop.call_soon(backend.tap, "DEAD0001", None, APDU_SECONDS / 2)
+        loop.call_later(4 * APDU_SECONDS, backend.tap, "CAFE0002")
+        return await scanner.scan(timeout=2)
+
+    assert asyncio.run(scenario()) == Scan("CAFE0002", SIMULATED_READER)
+    scanner.close()
+
+
+def test_auto_tap_brings_a_card_to_each_waiting_scan() -> None:
+    uids = iter(["AAAA0001", "BBBB0002"])
+    backend = SimulatedBackend(apdu_seconds=0, hold_seconds=0.05, auto_tap_seconds=0.05, uids=lambda: next(uids))
+    scanner = NFCScanner(backend, on_wait=backend.auto_tap)
+
+    async def scenario() -> list[str | None]:
+        first = await scanner.one_shot(timeout=1)
+        await asyncio.sleep(0.1)  # the first card is taken off the reader
+        return [first, await scanner.one_shot(timeout=1)]
+
+    assert asyncio.run(scenario()) == ["AAAA0001", "BBBB0002"]
+    scanner.close()
@@ -0,0 +1,183 @@
+"""Tests for the backend client's retry and circuit-breaker transports, over an httpx MockTransport."""
+
+import asyncio
+from collections.abc import Awaitable, Callable
+
+import httpx
+import pytest
+
+from src.frontend.core.config import Config
+from src.frontend.core.payment_api import PaymentApi, Result, is_err, is_success
+from src.frontend.core.transport import BackendUnavailable, CircuitBreakerTransport, RetryTransport, build_client
+
+USER = {"nfc_id": "A", "is_adult": True, "balance": 1.0}
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+async def _no_sleep(_seconds: float) -> None:
+    return None
+
+
+def _flaky(failures: int, fail: Callable[[httpx.Request], httpx.Response]) -> tuple[list[str], httpx.MockTransport]:
+    """Transport failing the first `failures` requests with `fail`, then answering with USER."""
+    calls: list[str] = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        calls.append(request.method)
+        if len(calls) <= failures:
+            return fail(request)
+        return httpx.Response(200, json=USER)
+
+    return calls, httpx.MockTransport(handler)
+
+
+def _reset(request: httpx.Request) -> httpx.Response:
+    raise httpx.ConnectError("connection reset", request=request)
+
+
+def _busy(request: httpx.Request) -> httpx.Response:
+    return httpx.Response(503, json={"detail": "Server busy, retry shortly"})
+
+
+def _call[T](transport: httpx.AsyncBaseTransport, call: Callable[[PaymentApi], Awaitable[T]]) -> T:
+    async def scenario() -> T:
+        async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+            return await call(PaymentApi(client))
+
+    return asyncio.run(scenario())
+
+
+@pytest.mark.parametrize("fail", [_reset, _busy])
+def test_get_is_retried_until_it_succeeds(fail: Callable[[httpx.Request], httpx.Response]) -> None:
+    calls, mock = _flaky(2, fail)
+    result: Result = _call(RetryTransport(mock, retries=2, sleep=_no_sleep), lambda api: api.get_nfc("A"))
+    assert is_success(result)
+    assert len(calls) == 3  # noqa: PLR2004
+
+
+def test_get_gives_up_after_retries() -> None:
+    calls, mock = _flaky(10, _reset)
+    result: Result = _call(RetryTransport(mock, retries=2, sleep=_no_sleep), lambda api: api.get_nfc("A"))
+    assert is_err(result)
+    assert result.transient
+    assert len(calls) == 3  # noqa: PLR2004
+
+
+def test_mutations_are_not_retried() -> None:
+    calls, mock = _flaky(1, _reset)
+    result: Result = _call(RetryTransport(mock, retries=2, sleep=_no_sleep), lambda api: api.update_balance("A", 1))
+    assert is_err(result)
+    assert calls == ["POST"]
+
+
+def test_backoff_is_jittered_and_capped() -> None:
+    transport = RetryTransport(httpx.MockTransport(_busy), backoff_seconds=0.5, max_backoff_seconds=1.0)
+    delays = [transport._backoff(attempt) for attempt in range(8) for _ in range(20)]
+    assert all(0 <= delay <= 1.0 for delay in delays)
+    assert len(set(delays)) > 1
+
+
+def test_breaker_opens_fails_fast_and_recovers() -> None:
+    clock = FakeClock()
+    calls, mock = _flaky(3, _reset)
+    breaker = CircuitBreakerTransport(mock, failure_threshold=3, reset_seconds=10, clock=clock)
+
+    async def scenario() -> None:
+        async with httpx.AsyncClient(transport=breaker, base_url="http://test") as client:
+            for _ in range(3):
+                with pytest.raises(httpx.ConnectError):
+                    await client.get("/users/A")
+            assert breaker.is_open
+            with pytest.raises(BackendUnavailable):
+                await client.get("/users/A")
+            assert len(calls) == 3  # noqa: PLR2004  (not sent while open)
+
+            clock.now = 11
+            assert (await client.get("/users/A")).status_code == 200  # noqa: PLR2004  (trial request)
+            assert not breaker.is_open
+
+    asyncio.run(scenario())
+
+
+def test_failed_trial_reopens_the_circuit() -> None:
+    clock = FakeClock()
+    calls, mock = _flaky(10, _busy)
+    breaker = CircuitBreakerTransport(mock, failure_threshold=2, reset_seconds=10, clock=clock)
+
+    async def scenario() -> None:
+        async with httpx.AsyncClient(transport=breaker, base_url="http://test") as client:
+            await client.get("/users/A")
+            await client.get("/users/A")
+            clock.now = 11
+            await client.get("/users/A")  # trial, still busy
+            assert breaker.is_open
+            with pytest.raises(BackendUnavailable):
+                await client.get("/users/A")
+
+    asyncio.run(scenario())
+    assert len(calls) == 3  # noqa: PLR2004
+
+
+def test_open_circuit_is_a_transient_error_and_not_retried() -> None:
+    clock = FakeClock()
+    calls, mock = _flaky(10, _reset)
+    breaker = CircuitBreakerTransport(mock, failure_threshold=1, reset_seconds=10, clock=clock)
+    transport = RetryTransport(breaker, retries=3, sleep=_no_sleep)
+
+    result: Result = _call(transport, lambda api: api.get_nfc("A"))
+    assert is_err(result)
+    assert result.transient
+    assert len(calls) == 1
+
+
+@pytest.mark.parametrize(("compression", "offers_gzip"), [(True, True), (False, False)])
+def test_client_asks_for_compressed_responses_unless_turned_off(compression: bool, offers_gzip: bool) -> None:
+    client = build_client(Config(http_compression=compression))
+    accept_encoding = client.headers["Accept-Encoding"]
+    assert ("gzip" in accept_encoding) is offers_gzip
+    asyncio.run(client.aclose())
+
+
+def _shedding(request: httpx.Request) -> httpx.Response:
+    return httpx.Response(503, headers={"Retry-After": "1"}, json={"detail": "Server busy, retry shortly"})
+
+
+def test_get_waits_the_retry_after_delay() -> None:
+    delays: list[float] = []
+
+    async def sleep(seconds: float) -> None:
+        delays.append(seconds)
+
+    _, mock = _flaky(2, _shedding)
+    result: Result = _call(RetryTransport(mock, retries=2, sleep=sleep), lambda api: api.get_nfc("A"))
+    assert is_success(result)
+    assert delays == [1.0, 1.0]
+
+
+def test_retry_after_beyond_the_limit_is_not_waited_for() -> None:
+    calls, mock = _flaky(1, _shedding)
+    transport = RetryTransport(mock, retries=2, max_retry_after_seconds=0.5, sleep=_no_sleep)
+    result: Result = _call(transport, lambda api: api.get_nfc("A"))
+    assert is_err(result)
+    assert len(calls) == 1
+
+
+def test_load_shedding_does_not_open_the_circuit() -> None:
+    calls, mock = _flaky(10, _shedding)
+    breaker = CircuitBreakerTransport(mock, failure_threshold=2, reset_seconds=10, clock=FakeClock())
+
+    async def scenario() -> None:
+        async with httpx.AsyncClient(transport=breaker, base_url="http://test") as client:
+            for _ in range(3):
+                assert (await client.get("/users/A")).status_code == 503  # noqa: PLR2004
+
+    asyncio.run(scenario())
+    assert not breaker.is_open
+    assert len(calls) == 3  # noqa: PLR2004
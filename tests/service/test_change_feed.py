@@ -0,0 +1,115 @@
+"""Tests for the change feed fed by the user service."""
+
+import asyncio
+import contextlib
+from decimal import Decimal
+from pathlib import Path
+
+from sqlmodel import Session, SQLModel, create_engine
+
+from src.backend.core.errors import UnderageBooking
+from src.backend.models.schemas import ChangeEvent
+from src.backend.models.user import User, UserCreate
+from src.backend.service.change_feed import ChangeFeed, change_feed
+from src.backend.service.user_service import PaymentLogOptions, UserService
+
+
+def _collect(action: object, count: int = 1) -> list[ChangeEvent]:
+    """Subscribe, run the (sync) service action and gather the published events."""
+
+    async def scenario() -> list[ChangeEvent]:
+        async with change_feed.subscribe() as queue:
+            action()  # type: ignore[operator]
+            return [await asyncio.wait_for(queue.get(), timeout=1) for _ in range(count)]
+
+    return asyncio.run(scenario())
+
+
+def test_top_up_publishes_new_balance(user_service: UserService, sample_user: User) -> None:
+    events = _collect(lambda: user_service.update_balance(sample_user.nfc_id, Decimal("5")))
+    event = events[0]
+    assert event.nfc_id == sample_user.nfc_id
+    assert event.balance == Decimal("55.00")
+    assert event.deleted is False
+    assert event.log is not None
+    assert event.log.description == PaymentLogOptions.TOP_UP
+    assert event.log.created_at is not None
+    assert event.rev == event.log.id
+
+
+def test_create_and_delete_publish_in_order(user_service: UserService) -> None:
+    def action() -> None:
+        user_service.create_user(UserCreate(nfc_id="FEED1", is_adult=False))
+        user_service.delete_user("FEED1")
+
+    created, deleted = _collect(action, count=2)
+    assert created.is_adult is False
+    assert deleted.deleted is True
+    assert deleted.rev > created.rev  # type: ignore[operator]
+    assert deleted.balance is None
+
+
+def test_failed_booking_publishes_nothing(user_service: UserService, sample_minor: User) -> None:
+    async def scenario() -> bool:
+        async with change_feed.subscribe() as queue:
+            with contextlib.suppress(UnderageBooking):
+                user_service.book_cocktail(sample_minor.nfc_id, Decimal("1"), is_alcoholic=True, name="Beer")
+            await asyncio.sleep(0)
+            return queue.empty()
+
+    assert asyncio.run(scenario())
+
+
+def test_lagging_subscriber_is_cut_off() -> None:
+    feed = ChangeFeed(queue_size=2)
+
+    async def scenario() -> tuple[list[ChangeEvent | None], int]:
+        async with feed.subscribe() as queue:
+            for nfc_id in ("A", "B", "C", "D"):
+                feed.publish(ChangeEvent(nfc_id=nfc_id))
+            await asyncio.sleep(0)
+            return [queue.get_nowait() for _ in range(queue.qsize())], feed.subscriber_count
+
+    # Nothing is half-delivered: the queue only says the subscriber must resync.
+    assert asyncio.run(scenario()) == ([None], 0)
+    assert feed.subscriber_count == 0
+
+
+def test_follow_ledger_publishes_changes_from_any_process(tmp_path: Path) -> None:
+    engine = create_engine(f"sqlite:///{tmp_path / 'ledger.sqlite'}", connect_args={"check_same_thread": False})
+    SQLModel.metadata.create_all(engine)
+    feed = ChangeFeed()
+
+    async def scenario() -> list[ChangeEvent]:
+        follower = asyncio.create_task(feed.follow_ledger(engine, interval=0.01))
+        async with feed.subscribe() as queue:
+            await asyncio.sleep(0.05)
+            # Another worker's commit: it never announces on this process' feed.
+            with Session(engine) as db:
+                service = UserService(db)
+                service.create_user(UserCreate(nfc_id="OTHER", is_adult=True, balance=Decimal("3")))
+            created = await asyncio.wait_for(queue.get(), timeout=1)
+            with Session(engine) as db:
+                UserService(db).delete_user("OTHER")
+            deleted = await asyncio.wait_for(queue.get(), timeout=1)
+        follower.cancel()
+        return [created, deleted]
+
+    created, deleted = asyncio.run(scenario())
+    engine.dispose()
+    assert (created.nfc_id, created.balance, created.is_adult) == ("OTHER", Decimal("3"), True)
+    assert deleted.deleted is True
+    assert deleted.rev > created.rev  # type: ignore[operator]
+
+
+def test_following_ledger_ignores_announcements() -> None:
+    feed = ChangeFeed()
+    feed._following_ledger = True
+
+    async def scenario() -> bool:
+        async with feed.subscribe() as queue:
+            feed.announce(ChangeEvent(nfc_id="A"))
+            await asyncio.sleep(0)
+            return queue.empty()
+
+    assert asyncio.run(scenario())
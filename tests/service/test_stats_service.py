@@ -0,0 +1,101 @@
+"""Tests for the sales rollups maintained by the user service."""
+
+from datetime import UTC, datetime, timedelta
+from decimal import Decimal
+
+import pytest
+
+from src.backend.core.errors import InsufficientBalance
+from src.backend.models.user import User, UserCreate
+from src.backend.service.stats_service import StatsService
+from src.backend.service.user_service import UserService
+
+
+@pytest.fixture
+def stats_service(user_service: UserService) -> StatsService:
+    return user_service.stats
+
+
+def _totals(user_service: UserService, nfc_id: str) -> tuple[Decimal, Decimal, int, bool]:
+    user = user_service.get_user_by_nfc(nfc_id)
+    assert user is not None
+    user_service.db.refresh(user)
+    return user.total_topped_up, user.total_spent, user.booking_count, user.last_booking_at is not None
+
+
+def _book(user_service: UserService, nfc_id: str, name: str, price: str) -> None:
+    user_service.book_cocktail(nfc_id, Decimal(price), is_alcoholic=False, name=name)
+
+
+class TestIncrementalRollups:
+    """Tests for rollups kept current by bookings and top-ups."""
+
+    def test_bookings_roll_up_per_cocktail(
+        self, user_service: UserService, stats_service: StatsService, sample_user: User
+    ) -> None:
+        """Test best sellers come first with their counts and revenue."""
+        _book(user_service, sample_user.nfc_id, "Mojito", "5.50")
+        _book(user_service, sample_user.nfc_id, "Mojito", "5.50")
+        _book(user_service, sample_user.nfc_id, "Cola", "2.00")
+
+        stats = stats_service.get_cocktail_stats()
+
+        assert [(s.cocktail, s.bookings, s.revenue) for s in stats] == [
+            ("Mojito", 2, Decimal("11.00")),
+            ("Cola", 1, Decimal("2.00")),
+        ]
+        hourly = stats_service.get_hourly_stats()
+        assert len(hourly) == 1
+        assert hourly[0].bookings == 3  # noqa: PLR2004
+        assert hourly[0].revenue == Decimal("13.00")
+
+    def test_range_excludes_other_hours(
+        self, user_service: UserService, stats_service: StatsService, sample_user: User
+    ) -> None:
+        """Test the hour range filters the buckets."""
+        _book(user_service, sample_user.nfc_id, "Mojito", "5.00")
+        future = datetime.now(UTC) + timedelta(hours=2)
+
+        assert stats_service.get_cocktail_stats(since=future) == []
+        assert len(stats_service.get_hourly_stats(until=future)) == 1
+
+    def test_failed_booking_is_not_counted(
+        self, user_service: UserService, stats_service: StatsService, sample_user: User
+    ) -> None:
+        """Test a rejected booking leaves the rollups untouched."""
+        with pytest.raises(InsufficientBalance):
+            _book(user_service, sample_user.nfc_id, "Champagne", "999.00")
+        user_service.db.rollback()
+
+        assert stats_service.get_cocktail_stats() == []
+
+
+class TestRebuild:
+    """Tests for recomputing the rollups from the ledger."""
+
+    def test_rebuild_matches_incremental(self, user_service: UserService, stats_service: StatsService) -> None:
+        """Test a rebuild reproduces what the incremental updates produced."""
+        user_service.create_user(UserCreate(nfc_id="R1", balance=Decimal("30")))
+        user_service.create_user(UserCreate(nfc_id="R2", balance=Decimal("30")))
+        _book(user_service, "R1", "Mojito", "5.50")
+        _book(user_service, "R2", "Mojito", "5.50")
+        _book(user_service, "R2", "Cola", "2.00")
+        user_service.update_balance("R1", Decimal("10"))
+        before = (stats_service.get_cocktail_stats(), _totals(user_service, "R1"), _totals(user_service, "R2"))
+
+        result = stats_service.rebuild()
+
+        assert result.cocktail_hours == 2  # noqa: PLR2004
+        assert result.accounts == 2  # noqa: PLR2004
+        after = (stats_service.get_cocktail_stats(), _totals(user_service, "R1"), _totals(user_service, "R2"))
+        assert after == before
+
+    def test_rebuild_ignores_previous_incarnation(self, user_service: UserService, stats_service: StatsService) -> None:
+        """Test a re-registered card's totals only count entries after its deletion."""
+        user_service.create_user(UserCreate(nfc_id="AGAIN", balance=Decimal("50")))
+        user_service.delete_user("AGAIN")
+        user_service.create_user(UserCreate(nfc_id="AGAIN", balance=Decimal("5")))
+
+        stats_service.rebuild()
+
+        assert _totals(user_service, "AGAIN")[0] == Decimal("5.00")
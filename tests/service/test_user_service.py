@@ -11,6 +11,7 @@ from src.backend.core.errors import (
     UnderageBooking,
     UserNotFound,
 )
+from src.backend.models.schemas import UserSort
 from src.backend.models.user import User, UserCreate, UserUpdate
 from src.backend.service.user_service import PaymentLogOptions, UserService
 
@@ -43,6 +44,53 @@ class TestGetUser:
         assert len(users) == 1
 
 
+class TestGetUserPage:
+    """Tests for the paged, searchable account list."""
+
+    @pytest.fixture
+    def accounts(self, user_service: UserService) -> None:
+        for nfc_id, balance in [("AB1", "5"), ("AB2", "20"), ("AC1", "10"), ("B1", "20")]:
+            user_service.create_user(UserCreate(nfc_id=nfc_id, is_adult=True, balance=Decimal(balance)))
+
+    @pytest.mark.usefixtures("accounts")
+    def test_prefix_search_counts_all_matches(self, user_service: UserService) -> None:
+        """Test that a prefix matches only NFC IDs starting with it, and total counts every page."""
+        page = user_service.get_user_page("AB", limit=1)
+        assert page.total == 2  # noqa: PLR2004
+        assert [u.nfc_id for u in page.users] == ["AB1"]
+
+    @pytest.mark.usefixtures("accounts")
+    def test_prefix_search_ignores_case_and_whitespace(self, user_service: UserService) -> None:
+        """Test that a lower-case or padded prefix finds the upper-case hex UIDs."""
+        page = user_service.get_user_page(" ab ")
+        assert [u.nfc_id for u in page.users] == ["AB1", "AB2"]
+
+    def test_lower_case_id_is_stored_canonical_and_found(self, user_service: UserService) -> None:
+        """Test that an NFC ID sent in lower case is stored upper-cased, so a search finds it."""
+        user_service.create_user(UserCreate(nfc_id=" 04ab12 ", is_adult=True, balance=Decimal("1")))
+        assert [u.nfc_id for u in user_service.get_user_page("04a").users] == ["04AB12"]
+
+    @pytest.mark.usefixtures("accounts")
+    def test_offset_pages_through_results(self, user_service: UserService) -> None:
+        """Test that offset and limit select consecutive pages."""
+        page = user_service.get_user_page("A", offset=2, limit=2)
+        assert page.total == 3  # noqa: PLR2004
+        assert [u.nfc_id for u in page.users] == ["AC1"]
+
+    @pytest.mark.usefixtures("accounts")
+    def test_sort_by_balance_breaks_ties_by_nfc_id(self, user_service: UserService) -> None:
+        """Test sorting by balance, descending, with NFC ID as the tie-break."""
+        page = user_service.get_user_page(sort=UserSort.BALANCE, descending=True)
+        assert [u.nfc_id for u in page.users] == ["AB2", "B1", "AC1", "AB1"]
+
+    @pytest.mark.usefixtures("accounts")
+    def test_prefix_without_matches(self, user_service: UserService) -> None:
+        """Test that a prefix matching nothing returns an empty page."""
+        page = user_service.get_user_page("Z")
+        assert page.total == 0
+        assert page.users == []
+
+
 class TestCreateUser:
     """Tests for creating users."""
 
@@ -256,6 +304,95 @@ class TestBookCocktail:
         first_log.created_at
 
 
+class TestAccountTotals:
+    """Tests for the lifetime totals kept on the user row."""
+
+    def test_totals_follow_top_ups_and_bookings(self, user_service: UserService) -> None:
+        """Test initial balance and top-ups count as topped up, bookings as spent."""
+        user_service.create_user(UserCreate(nfc_id="TOT", balance=Decimal("10")))
+        user_service.update_balance("TOT", Decimal("5"))
+        user = user_service.book_cocktail("TOT", Decimal("4"), is_alcoholic=False, name="Mojito")
+
+        assert user.total_topped_up == Decimal("15")
+        assert user.total_spent == Decimal("4")
+        assert user.booking_count == 1
+        assert user.last_booking_at is not None
+
+    def test_rejected_booking_leaves_totals(self, user_service: UserService, sample_user: User) -> None:
+        """Test a booking that fails the balance check counts nothing."""
+        with pytest.raises(InsufficientBalance):
+            user_service.book_cocktail(sample_user.nfc_id, Decimal("999"), is_alcoholic=False, name="Champagne")
+
+        user = user_service.get_user_by_nfc(sample_user.nfc_id)
+        assert user is not None
+        assert user.booking_count == 0
+        assert user.total_spent == 0
+
+
+class TestGetChanges:
+    """Tests for delta sync by revision."""
+
+    def test_changes_since_zero_lists_all(self, user_service: UserService) -> None:
+        """Test a full sync returns every account and the head revision."""
+        user_service.create_user(UserCreate(nfc_id="REV1"))
+        user_service.create_user(UserCreate(nfc_id="REV2"))
+
+        changes = user_service.get_changes(since=0)
+
+        assert [u.nfc_id for u in changes.users] == ["REV1", "REV2"]
+        assert changes.deleted == []
+        assert changes.rev == changes.users[-1].rev
+
+    def test_changes_only_after_revision(self, user_service: UserService) -> None:
+        """Test only accounts changed after the revision are returned."""
+        user_service.create_user(UserCreate(nfc_id="OLD"))
+        user_service.create_user(UserCreate(nfc_id="NEW"))
+        rev = user_service.get_changes().rev
+
+        user_service.update_balance("NEW", Decimal("5"))
+        changes = user_service.get_changes(since=rev)
+
+        assert [u.nfc_id for u in changes.users] == ["NEW"]
+        assert changes.rev > rev
+        assert user_service.get_changes(since=changes.rev).users == []
+
+    def test_deleted_user_leaves_tombstone(self, user_service: UserService) -> None:
+        """Test a deletion shows up as a tombstone until the card is registered again."""
+        user_service.create_user(UserCreate(nfc_id="GONE"))
+        rev = user_service.get_changes().rev
+
+        user_service.delete_user("GONE")
+        changes = user_service.get_changes(since=rev)
+        assert changes.users == []
+        assert changes.deleted == ["GONE"]
+
+        user_service.create_user(UserCreate(nfc_id="GONE"))
+        changes = user_service.get_changes(since=rev)
+        assert [u.nfc_id for u in changes.users] == ["GONE"]
+        assert changes.deleted == []
+
+
+class TestIdempotency:
+    """Tests for requests retried with the same idempotency key."""
+
+    def test_retried_top_up_is_applied_once(self, user_service: UserService, sample_user: User) -> None:
+        """Test a top-up replayed with its key returns the account without adding again."""
+        user_service.update_balance(sample_user.nfc_id, Decimal("5"), idempotency_key="key-1")
+        user = user_service.update_balance(sample_user.nfc_id, Decimal("5"), idempotency_key="key-1")
+
+        assert user.balance == Decimal("55.00")
+        assert len(user_service.get_payment_logs(sample_user.nfc_id)) == 1
+
+    def test_retried_creation_is_not_a_duplicate(self, user_service: UserService) -> None:
+        """Test a creation replayed with its key returns the card instead of failing."""
+        user_service.create_user(UserCreate(nfc_id="IDEM", balance=Decimal("3")), idempotency_key="key-2")
+        user = user_service.create_user(UserCreate(nfc_id="IDEM", balance=Decimal("3")), idempotency_key="key-2")
+
+        assert user.balance == Decimal("3")
+        with pytest.raises(DuplicateNfc):
+            user_service.create_user(UserCreate(nfc_id="IDEM"), idempotency_key="key-3")
+
+
 class TestPaymentLogs:
     """Tests for payment log retrieval."""
 
@@ -275,6 +412,16 @@ class TestPaymentLogs:
         for log in logs:
             assert log.created_at is not None
 
+    def test_get_payment_logs_in_cursor_chunks(self, user_service: UserService, sample_user: User) -> None:
+        """Test paging the history newest first, with the last id seen as cursor."""
+        for n in range(5):
+            user_service.log_payment_event(sample_user.nfc_id, Decimal(n), Decimal(n), f"Entry {n}")
+
+        first = user_service.get_payment_logs(sample_user.nfc_id, limit=3)
+        rest = user_service.get_payment_logs(sample_user.nfc_id, before=first[-1].id, limit=3)
+        assert [log.description for log in first + rest] == [f"Entry {n}" for n in reversed(range(5))]
+        assert user_service.get_payment_logs(sample_user.nfc_id, before=rest[-1].id) == []
+
     def test_get_all_payment_logs(self, user_service: UserService, sample_user: User, sample_minor: User) -> None:
         """Test retrieving all payment logs."""
         # Create some payment logs for both users
@@ -0,0 +1,103 @@
+"""Tests for the single-writer actor running account mutations."""
+
+import asyncio
+import sqlite3
+import threading
+from collections.abc import Generator
+from decimal import Decimal
+from pathlib import Path
+from typing import Any
+
+import pytest
+from sqlalchemy.pool import StaticPool
+from sqlmodel import Session, SQLModel, create_engine
+
+from src.backend.core.config import config
+from src.backend.core.errors import InsufficientBalance
+from src.backend.db.database import create_write_engine
+from src.backend.models.user import User, UserCreate
+from src.backend.service.user_service import UserService
+from src.backend.service.write_actor import WriteActor
+
+
+@pytest.fixture
+def engine() -> Generator[Any]:
+    engine = create_engine("sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+    SQLModel.metadata.create_all(engine)
+    yield engine
+    engine.dispose()
+
+
+@pytest.fixture
+def writer(engine: Any) -> Generator[WriteActor]:
+    actor = WriteActor(engine)
+    yield actor
+    actor.stop()
+
+
+def test_commands_run_in_order_on_one_thread(writer: WriteActor) -> None:
+    threads: set[str] = set()
+
+    def top_up(service: UserService) -> User:
+        threads.add(threading.current_thread().name)
+        return service.update_balance("A", Decimal("1"))
+
+    async def scenario() -> list[User]:
+        await writer.submit(lambda service: service.create_user(UserCreate(nfc_id="A", is_adult=True)))
+        return await asyncio.gather(*(writer.submit(top_up) for _ in range(5)))
+
+    users = asyncio.run(scenario())
+    assert [user.balance for user in users] == [Decimal(n) for n in range(1, 6)]
+    assert threads == {"write-actor"}
+    assert writer.stats.processed == 6  # noqa: PLR2004
+
+
+def test_domain_error_reaches_caller_and_is_rolled_back(writer: WriteActor, engine: Any) -> None:
+    writer.enqueue(lambda service: service.create_user(UserCreate(nfc_id="A", is_adult=True))).result()
+    with pytest.raises(InsufficientBalance):
+        writer.enqueue(lambda service: service.book_cocktail("A", Decimal("5"), False, "Mojito")).result()
+
+    assert writer.stats.failed == 1
+    with Session(engine) as db:
+        assert db.get(User, "A").balance == Decimal("0")  # type: ignore[union-attr]
+
+
+def test_results_are_detached_and_loaded(writer: WriteActor) -> None:
+    user = writer.enqueue(lambda service: service.create_user(UserCreate(nfc_id="A", is_adult=True))).result()
+    assert user.nfc_id == "A"
+    assert user.rev > 0
+
+
+@pytest.mark.parametrize(
+    "command",
+    [
+        pytest.param(
+            lambda service: service.create_user(UserCreate(nfc_id="A", is_adult=True), idempotency_key="k1"),
+            id="idempotent-replay",
+        ),
+        pytest.param(
+            lambda service: service.book_cocktail(config.master_keys[0], Decimal("5"), True, "Mojito"),
+            id="master-key-booking",
+        ),
+    ],
+)
+def test_commands_that_commit_nothing_release_the_write_lock(tmp_path: Path, command: Any) -> None:
+    path = tmp_path / "payment.db"
+    engine = create_write_engine(path)
+    SQLModel.metadata.create_all(engine)
+    writer = WriteActor(engine)
+    try:
+        writer.enqueue(lambda service: service.create_user(UserCreate(nfc_id="A", is_adult=True), idempotency_key="k1"))
+        writer.enqueue(lambda service: service.create_user(UserCreate(nfc_id=config.master_keys[0], is_adult=True)))
+        writer.enqueue(command).result()
+
+        # Another worker's writer must get the lock at once, not wait for the actor's next command.
+        other = sqlite3.connect(path, timeout=0, isolation_level=None)
+        try:
+            other.execute("BEGIN IMMEDIATE")
+            other.execute("ROLLBACK")
+        finally:
+            other.close()
+    finally:
+        writer.stop()
+        engine.dispose()
@@ -0,0 +1,35 @@
+"""Tests for parsing the interpreter's import-time report."""
+
+from src.shared.import_time import parse_importtime
+
+REPORT = """\
+import time: self [us] | cumulative | imported package
+import time:       120 |        120 | _io
+import time:        30 |         30 |     json.scanner
+import time:        50 |         50 |     json.decoder
+import time:       200 |        280 |   json
+import time:        10 |         10 |   typing
+import time:       400 |        690 | app
+Traceback lines and other stderr output are skipped
+"""
+
+
+def test_parse_builds_the_import_tree() -> None:
+    io, app = parse_importtime(REPORT)
+    assert (io.module, io.children) == ("_io", [])
+    assert (app.module, app.self_us, app.cumulative_us) == ("app", 400, 690)
+    json, typing = app.children
+    assert [child.module for child in json.children] == ["json.scanner", "json.decoder"]
+    assert (typing.module, typing.children) == ("typing", [])
+
+
+def test_walk_lists_costliest_imports_first_with_their_depth() -> None:
+    _, app = parse_importtime(REPORT)
+    walked = [(depth, node.module) for depth, node in app.walk()]
+    assert walked == [
+        (0, "app"),
+        (1, "json"),
+        (2, "json.decoder"),
+        (2, "json.scanner"),
+        (1, "typing"),
+    ]